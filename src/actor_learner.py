@@ -0,0 +1,259 @@
+import logging
+import queue
+import time
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from typing import Callable, Dict, Optional
+from .agents.inference import checked_policy
+from .agents.nfsp_agent import NFSPAgent, build_networks
+from .agents.snapshot_pool import SnapshotPool
+from .environments.vector_leduc import VectorLeducPoker
+from .metrics import MetricsLogger
+from .schedule import UpdateSchedule
+from .seeding import generator, int_seed
+from .telemetry import telemetry
+
+def run_actor(config: Dict, index: int, shared_rl, shared_sl, version, lock, transitions, stop,
+              pool: Optional[SnapshotPool] = None):
+    """Self-play worker: plays batched Leduc hands and streams transitions to the learner.
+
+    With a `pool`, each new hand is played against a pool snapshot with the
+    pool's probability; only the agent's decisions in those hands are sent.
+    """
+    torch.set_num_threads(1)
+    # Each actor draws from its own streams of the run seed
+    seed = config["training"]["seed"]
+    rng = generator(seed, "actors", index, 0)
+    torch_generator = torch.Generator().manual_seed(int_seed(seed, "actors", index, 1))
+    parallel = config["parallel"]
+    epsilon = config["training"]["epsilon"]
+    eta = config["training"]["eta"]
+
+    rl_network, sl_network = build_networks(config)
+    env = VectorLeducPoker(parallel["games_per_actor"], max_raises=config["game"]["max_raises"],
+                           seed=int_seed(seed, "actors", index, 2))
+    states, info = env.reset()
+    # With an observation table, actors play on and ship compact info-set ids
+    use_ids = env.info_sets is not None
+    if use_ids:
+        observation_table = torch.tensor(env.info_sets.observations)
+        states = info["info_set"]
+    best_response = rng.random(env.num_envs) < eta
+    # Per game: opponent snapshot (-1: self-play), its seat, and the agent's last decision awaiting its outcome
+    opponents = np.full(env.num_envs, -1)
+    opponent_seats = np.ones(env.num_envs, dtype=np.int64)
+    pending_states = np.zeros_like(states)
+    pending_actions = np.zeros(env.num_envs, dtype=np.int64)
+    has_pending = np.zeros(env.num_envs, dtype=bool)
+    local_version = -1
+    policy = None
+
+    while not stop.is_set():
+        # Pick up the learner's latest weights
+        if version.value != local_version:
+            with lock:
+                rl_network.load_state_dict(shared_rl.state_dict())
+                sl_network.load_state_dict(shared_sl.state_dict())
+                local_version = version.value
+            # Act through an inference-only snapshot of the synced weights
+            if policy is None:
+                policy = checked_policy(rl_network, sl_network, config["inference"],
+                                        observation_table if use_ids else None)
+            else:
+                policy.refresh(rl_network, sl_network)
+
+        chunk = []
+        episodes = 0
+        for _ in range(parallel["chunk_steps"]):
+            observations = observation_table[torch.from_numpy(states)] if use_ids else states
+            actions = policy(observations, best_response, torch_generator)
+
+            # Epsilon-greedy exploration
+            explore = rng.random(env.num_envs) < epsilon
+            if pool is not None:
+                # Snapshots act for their seat, one batched forward pass per snapshot
+                opponent_turn = (opponents >= 0) & (env.current_player == opponent_seats)
+                explore &= ~opponent_turn
+                for slot in np.unique(opponents[opponent_turn]):
+                    games = opponent_turn & (opponents == slot)
+                    rows = observation_table[torch.from_numpy(states[games])] if use_ids else states[games]
+                    actions[games] = pool.act(slot, rows, torch_generator)
+            actions[explore] = rng.integers(env.single_action_space.n, size=explore.sum())
+
+            next_states, rewards, dones, _, info = env.step(actions)
+            if use_ids:
+                next_states = info["info_set"]
+                final_states = info["final_info_set"]
+            else:
+                final_states = info["final_obs"]
+
+            if pool is None:
+                chunk.append((states, actions, rewards, final_states, dones))
+            else:
+                versus = opponents >= 0
+                chunk.append(tuple(column[~versus] for column in (states, actions, rewards, final_states, dones)))
+
+                # Against a snapshot, the agent's decision completes once it is to act again or the hand ends
+                acted = versus & (info["player"] != opponent_seats)
+                pending_states[acted] = states[acted]
+                pending_actions[acted] = actions[acted]
+                has_pending |= acted
+                complete = has_pending & (dones | (env.current_player != opponent_seats))
+                # Folds are scored for the folding player, showdowns for player 0
+                player_0 = np.where((actions == 0) & (info["player"] == 1), -rewards, rewards)
+                own_rewards = np.where(opponent_seats == 1, player_0, -player_0)
+                chunk.append((pending_states[complete], pending_actions[complete], own_rewards[complete],
+                              final_states[complete], dones[complete]))
+                has_pending &= ~complete
+
+                # Finished games draw their next opponent
+                finished = np.flatnonzero(dones)
+                opponents[finished] = -1
+                if len(finished) and len(pool):
+                    drawn = finished[rng.random(len(finished)) < pool.probability]
+                    opponents[drawn] = pool.sample(rng, len(drawn))
+                    opponent_seats[drawn] = rng.integers(2, size=len(drawn))
+
+            # Anticipatory dynamics: finished games draw a new policy mode
+            best_response[dones] = rng.random(dones.sum()) < eta
+            episodes += int(dones.sum())
+            states = next_states
+
+        batch = tuple(np.concatenate(column) for column in zip(*chunk))
+        while not stop.is_set():
+            try:
+                transitions.put((batch, episodes), timeout=0.1)
+                break
+            except queue.Full:
+                continue
+
+    # Don't block process exit on chunks the learner will never read
+    transitions.cancel_join_thread()
+
+def next_chunk(transitions, actors, poll_seconds: float = 1.0):
+    """Next transition message from the actors; raises instead of waiting on actors that have died"""
+    while True:
+        try:
+            return transitions.get(timeout=poll_seconds)
+        except queue.Empty:
+            failed = [actor for actor in actors if actor.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(f"Actor process {failed[0].name} exited with code {failed[0].exitcode}")
+            if not any(actor.is_alive() for actor in actors):
+                raise RuntimeError("Every actor process has exited")
+
+def train_parallel(agent: NFSPAgent, config: Dict,
+                   on_episode: Optional[Callable[[int], None]] = None,
+                   metrics: Optional[MetricsLogger] = None,
+                   pool: Optional[SnapshotPool] = None) -> Dict[str, float]:
+    """Train `agent` as the learner of an actor/learner pipeline.
+
+    Actor processes run self-play with periodically synced copies of the
+    agent's networks; this process owns the replay buffers and optimizers
+    and takes gradient steps as its `UpdateSchedule` dictates.
+    Training continues from `agent.start_episode` after a resume and stops
+    at exactly `training.num_episodes`.
+    `on_episode` is called with the episode count every 100 episodes and
+    learner losses are added to `metrics` if given. Actors read opponent
+    snapshots from `pool`, which `on_episode` may fill, in place. Raises
+    `RuntimeError` if an actor process dies.
+    """
+    logger = logging.getLogger(__name__)
+    parallel = config["parallel"]
+    num_episodes = config["training"]["num_episodes"]
+    batch_size = config["training"]["batch_size"]
+
+    # Weights are broadcast through shared-memory copies of both networks
+    ctx = mp.get_context("spawn")
+    shared_rl, shared_sl = build_networks(config)
+    shared_rl.load_state_dict(agent.rl_network.state_dict())
+    shared_sl.load_state_dict(agent.sl_network.state_dict())
+    shared_rl.share_memory()
+    shared_sl.share_memory()
+    version = ctx.Value("i", 0)
+    lock = ctx.Lock()
+    transitions = ctx.Queue(maxsize=parallel["queue_depth"])
+    stop = ctx.Event()
+
+    actors = [
+        ctx.Process(
+            target=run_actor,
+            args=(config, index, shared_rl, shared_sl, version, lock, transitions, stop, pool),
+            daemon=True
+        )
+        for index in range(parallel["num_actors"])
+    ]
+    for actor in actors:
+        actor.start()
+
+    schedule = UpdateSchedule(config)
+    episodes = agent.start_episode
+    last_report = schedule.start
+    try:
+        while episodes < num_episodes:
+            with telemetry.phase("learner.wait"):
+                batch, chunk_episodes = next_chunk(transitions, actors)
+            states, actions, rewards, next_states, dones = batch
+            if episodes + chunk_episodes > num_episodes:
+                # Trim the last chunk at the hand that completes the run; later transitions are dropped
+                ends = np.flatnonzero(dones)
+                if len(ends) >= num_episodes - episodes:
+                    cut = ends[num_episodes - episodes - 1] + 1
+                    states, actions, rewards, next_states, dones = (column[:cut] for column in batch)
+                chunk_episodes = num_episodes - episodes
+            with telemetry.phase("buffer.add_batch"):
+                agent.rl_buffer.add_batch(states, actions, rewards, next_states, dones)
+                agent.sl_buffer.add_batch(states, actions)
+
+            if on_episode is not None:
+                for episode in range(episodes // 100 + 1, (episodes + chunk_episodes) // 100 + 1):
+                    on_episode(episode * 100)
+            episodes += chunk_episodes
+
+            # Gradient steps follow the configured replay ratio, not the arrival of chunks
+            num_updates = schedule.record_env_steps(len(actions), len(agent.rl_buffer) >= batch_size)
+            if num_updates:
+                synced = schedule.grad_steps // parallel["weight_sync_interval"]
+                with telemetry.phase("learn"):
+                    losses = agent.learn(num_updates)
+                schedule.record_grad_steps(num_updates)
+                if metrics is not None:
+                    metrics.add(**losses)
+
+                if schedule.grad_steps // parallel["weight_sync_interval"] > synced:
+                    with lock:
+                        shared_rl.load_state_dict(agent.rl_network.state_dict())
+                        shared_sl.load_state_dict(agent.sl_network.state_dict())
+                        version.value += 1
+
+            now = time.perf_counter()
+            if now - last_report >= parallel["report_interval"]:
+                env_rate, grad_rate = schedule.rates()
+                logger.info(
+                    f"Episodes {episodes}/{num_episodes}: "
+                    f"{(episodes - agent.start_episode) / (now - schedule.start):.0f} episodes/s, "
+                    f"{env_rate:.0f} env steps/s, {grad_rate:.0f} grad steps/s, "
+                    f"replay ratio {schedule.measured_replay_ratio:.2f}/{schedule.target_replay_ratio:.2f}"
+                )
+                last_report = now
+    finally:
+        stop.set()
+        for actor in actors:
+            actor.join(timeout=5)
+            if actor.is_alive():
+                actor.terminate()
+
+    elapsed = time.perf_counter() - schedule.start
+    return {
+        "num_actors": len(actors),
+        "episodes": episodes,
+        "steps": schedule.env_steps,
+        "updates": schedule.grad_steps,
+        "seconds": elapsed,
+        "episodes_per_s": (episodes - agent.start_episode) / elapsed,
+        "steps_per_s": schedule.env_steps / elapsed,
+        "updates_per_s": schedule.grad_steps / elapsed,
+        "replay_ratio": schedule.measured_replay_ratio,
+        "target_replay_ratio": schedule.target_replay_ratio
+    }
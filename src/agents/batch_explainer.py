@@ -0,0 +1,231 @@
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from .explainer import SYSTEM_PROMPT
+
+ACTIONS = ("fold", "call", "raise 2", "raise 4", "raise 6")
+RANKS = "JQK"  # card % 3, weakest first
+_ITEM_PATTERN = re.compile(r"^\s*\**Item (\d+)\**:\s*", re.MULTILINE)
+
+BATCH_INSTRUCTIONS = """Explain the strategy of a Leduc Hold'em agent in each numbered item below.
+Each item gives the agent's average-strategy action probabilities and the situations (own card, community card, pot) where it plays them.
+Answer every item in order, starting each answer on a new line with "Item <number>:", and cover in at most three sentences which actions dominate and why, the game-theoretic reasoning, and how an opponent could exploit it.
+"""
+
+@dataclass
+class AnalysisItem:
+    """One distinct action distribution and the info-sets that share it"""
+    probabilities: np.ndarray
+    info_sets: List[int]
+    situations: List[str]
+
+@dataclass
+class BatchStats:
+    info_sets: int = 0
+    cached: int = 0  # info-sets answered from the disk cache
+    distinct: int = 0  # distributions left after deduplication
+    requests: int = 0
+    retries: int = 0
+    failed_requests: int = 0
+    missing: int = 0  # items a response did not answer
+    prompt_tokens: int = 0  # estimated
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text), tokenizer-free"""
+    return math.ceil(len(text) / 4)
+
+def describe_info_sets(observations: np.ndarray, starting_stack: int = 100) -> List[str]:
+    """"own card, board, pot" for rows of the observation table"""
+    cards = observations[:, :6].argmax(1)
+    boards = np.where(observations[:, 13] > 0, observations[:, 6:12].argmax(1), -1)
+    pots = np.rint(observations[:, 12] * starting_stack * 2).astype(int)
+    return [
+        f"{RANKS[card % 3]}, {'no board' if board < 0 else 'board ' + RANKS[board % 3]}, pot {pot}"
+        for card, board, pot in zip(cards, boards, pots)
+    ]
+
+def dedupe(probabilities: np.ndarray, tolerance: float) -> np.ndarray:
+    """Group index per row: rows within `tolerance` (max abs difference) of a group's first row join it"""
+    groups = np.empty(len(probabilities), dtype=np.int64)
+    leaders = np.empty((0, probabilities.shape[1]))
+    for row, probs in enumerate(probabilities):
+        close = np.flatnonzero(np.abs(leaders - probs).max(axis=1) <= tolerance)
+        if len(close):
+            groups[row] = close[0]
+        else:
+            groups[row] = len(leaders)
+            leaders = np.vstack([leaders, probs])
+    return groups
+
+def render_item(number: int, item: AnalysisItem, max_situations: int = 6) -> str:
+    probs = ", ".join(f"{name} {p:.2f}" for name, p in zip(ACTIONS, item.probabilities))
+    situations = "; ".join(item.situations[:max_situations])
+    if len(item.situations) > max_situations:
+        situations += f"; and {len(item.situations) - max_situations} more"
+    return f"Item {number}: {probs} | situations: {situations}\n"
+
+def pack(items: Sequence[AnalysisItem], token_budget: int, answer_tokens: int) -> List[List[AnalysisItem]]:
+    """Split `items` into prompts of at most `token_budget` tokens, prompt plus expected answers.
+
+    An item that does not fit an empty prompt still gets a prompt of its own.
+    """
+    header = estimate_tokens(SYSTEM_PROMPT + BATCH_INSTRUCTIONS)
+    batches, batch, used = [], [], header
+    for item in items:
+        cost = estimate_tokens(render_item(len(batch) + 1, item)) + answer_tokens
+        if batch and used + cost > token_budget:
+            batches.append(batch)
+            batch, used = [], header
+        batch.append(item)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+def render_batch_prompt(batch: Sequence[AnalysisItem]) -> str:
+    return BATCH_INSTRUCTIONS + "\n" + "".join(render_item(number, item) for number, item in enumerate(batch, 1))
+
+def parse_batch_response(text: str, num_items: int) -> Dict[int, str]:
+    """Answers by 1-based item number; unnumbered or out-of-range text is dropped"""
+    parts = _ITEM_PATTERN.split(text)
+    answers = {}
+    for number, answer in zip(parts[1::2], parts[2::2]):
+        if 1 <= int(number) <= num_items and answer.strip():
+            answers.setdefault(int(number), answer.strip())
+    return answers
+
+class ExplanationCache:
+    """Explanations of one checkpoint by info-set id, appended to a JSONL file as batches finish"""
+
+    def __init__(self, directory: str, checkpoint_key: str):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{checkpoint_key}.jsonl")
+        self.explanations: Dict[int, str] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by a crash
+                    self.explanations[record["info_set"]] = record["explanation"]
+
+    def __contains__(self, info_set: int) -> bool:
+        return info_set in self.explanations
+
+    def __getitem__(self, info_set: int) -> str:
+        return self.explanations[info_set]
+
+    def add(self, explanations: Dict[int, str]):
+        with open(self.path, "a") as f:
+            for info_set, explanation in explanations.items():
+                f.write(json.dumps({"info_set": int(info_set), "explanation": explanation}) + "\n")
+        self.explanations.update(explanations)
+
+class BatchExplainer:
+    """Offline strategy analysis: many info-sets per request, several requests in flight.
+
+    Info-sets already in the cache are skipped and the rest are grouped by
+    near-identical action distributions (`tolerance`). Each group becomes one
+    prompt item, and items are packed into prompts up to `token_budget`
+    tokens. At most `concurrency` requests run at once. A failed or
+    timed-out request is retried up to `retries` times, after `backoff`
+    seconds doubled per attempt with jitter. Every answered group is written
+    to the cache for all of its info-sets as soon as its batch returns.
+    """
+
+    def __init__(self, backend, token_budget: int = 4000, answer_tokens: int = 80, concurrency: int = 8,
+                 retries: int = 3, backoff: float = 1.0, timeout: float = 60.0, tolerance: float = 0.05):
+        self.backend = backend
+        self.token_budget = token_budget
+        self.answer_tokens = answer_tokens
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_config(cls, backend, llm_config: Dict) -> "BatchExplainer":
+        return cls(
+            backend,
+            token_budget=llm_config["batch_token_budget"],
+            answer_tokens=llm_config["batch_answer_tokens"],
+            concurrency=llm_config["batch_concurrency"],
+            retries=llm_config["batch_retries"],
+            backoff=llm_config["batch_backoff"],
+            timeout=llm_config["batch_timeout"],
+            tolerance=llm_config["probability_quantization"]
+        )
+
+    def plan(self, table: np.ndarray, info_sets: Sequence[int], descriptions: Sequence[str]) -> List[AnalysisItem]:
+        """One item per group of near-identical distributions among `info_sets`"""
+        info_sets = np.asarray(info_sets, dtype=np.int64)
+        groups = dedupe(table[info_sets], self.tolerance)
+        items = []
+        for group in range(groups.max() + 1 if len(groups) else 0):
+            members = info_sets[groups == group]
+            items.append(AnalysisItem(
+                probabilities=table[members[0]],
+                info_sets=members.tolist(),
+                situations=[descriptions[info_set] for info_set in members]
+            ))
+        return items
+
+    async def analyse(self, table: np.ndarray, descriptions: Sequence[str], cache: ExplanationCache,
+                      info_sets: Optional[Sequence[int]] = None) -> Tuple[Dict[int, str], BatchStats]:
+        """Explanations for `info_sets` (default: every row of `table`), from the cache or the backend"""
+        start = time.perf_counter()
+        info_sets = range(len(table)) if info_sets is None else info_sets
+        stats = BatchStats(info_sets=len(info_sets))
+        todo = [info_set for info_set in info_sets if info_set not in cache]
+        stats.cached = stats.info_sets - len(todo)
+
+        items = self.plan(table, todo, descriptions)
+        stats.distinct = len(items)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(batch: List[AnalysisItem]):
+            prompt = render_batch_prompt(batch)
+            stats.prompt_tokens += estimate_tokens(SYSTEM_PROMPT + prompt)
+            async with semaphore:
+                text = await self._request(prompt, stats)
+            if text is None:
+                return
+            answers = parse_batch_response(text, len(batch))
+            stats.missing += len(batch) - len(answers)
+            cache.add({
+                info_set: answers[number]
+                for number, item in enumerate(batch, 1) if number in answers
+                for info_set in item.info_sets
+            })
+
+        await asyncio.gather(*(run(batch) for batch in pack(items, self.token_budget, self.answer_tokens)))
+        stats.seconds = time.perf_counter() - start
+        return {info_set: cache[info_set] for info_set in info_sets if info_set in cache}, stats
+
+    async def _request(self, prompt: str, stats: BatchStats) -> Optional[str]:
+        """Backend answer to `prompt` with retries; None once they are used up"""
+        for attempt in range(self.retries + 1):
+            if attempt:
+                stats.retries += 1
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+            stats.requests += 1
+            started = time.perf_counter()
+            try:
+                text = await asyncio.wait_for(self.backend.generate(SYSTEM_PROMPT, prompt), self.timeout)
+            except Exception:
+                continue
+            stats.latencies.append(time.perf_counter() - started)
+            return text
+        stats.failed_requests += 1
+        return None
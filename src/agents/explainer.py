@@ -0,0 +1,167 @@
+import asyncio
+import os
+import re
+import threading
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Hashable, List, Optional, Tuple
+
+SYSTEM_PROMPT = "You are an expert in game theory and poker strategy analysis."
+_ITEM_LINE = re.compile(r"^Item (\d+): (.*)$", re.MULTILINE)
+
+def round_probabilities(action_probs, decimals: int = 4) -> List[float]:
+    """Probabilities as Python floats, so float32 rows print as 0.2274 rather than 0.227400004863739"""
+    return [round(float(p), decimals) for p in np.asarray(action_probs).reshape(-1)]
+
+def render_prompt(action_probs) -> str:
+    return f"""
+        Given the current game state and action probabilities:
+        Action probabilities: {list(action_probs)}
+
+        Please explain the strategy being employed by the agent, considering:
+        1. Which actions are most likely and why
+        2. How this relates to game-theoretic principles
+        3. Potential counter-strategies the opponent might employ
+        """
+
+class LangChainBackend:
+    """Explanations from a LangChain chat model such as ChatOpenAI"""
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    async def generate(self, system: str, prompt: str) -> str:
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        messages = [SystemMessage(content=system), HumanMessage(content=prompt)]
+        response = await self.llm.agenerate([messages])
+        return response.generations[0][0].text
+
+class StubBackend:
+    """Offline stand-in for a chat model: a canned answer after a fixed delay.
+
+    Batch prompts get one "Item <n>:" answer per item, as a real model is asked to give.
+    """
+
+    def __init__(self, latency: float = 0.5):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate(self, system: str, prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        items = _ITEM_LINE.findall(prompt)
+        if items:
+            return "\n".join(f"Item {n}: [stub explanation #{self.calls}] {line}" for n, line in items)
+        return f"[stub explanation #{self.calls}] {prompt.strip().splitlines()[1].strip()}"
+
+def make_backend(llm_config: Dict, client_retries: Optional[int] = None):
+    """Build the backend named by `llm_config["backend"]`, importing its client on demand.
+
+    `client_retries` overrides the client's own retry count, for callers that
+    retry themselves.
+    """
+    if llm_config["backend"] == "stub":
+        return StubBackend(llm_config["stub_latency"])
+    if llm_config["backend"] == "openai":
+        from langchain_community.chat_models import ChatOpenAI
+
+        options = {}
+        if llm_config["api_base"]:
+            # Local OpenAI-compatible servers usually ignore the key
+            options["openai_api_base"] = llm_config["api_base"]
+            options["openai_api_key"] = os.environ.get("OPENAI_API_KEY", "unused")
+        if client_retries is not None:
+            options["max_retries"] = client_retries
+        return LangChainBackend(ChatOpenAI(
+            model=llm_config["model"],
+            temperature=llm_config["temperature"],
+            **options
+        ))
+    raise ValueError(f"Unknown LLM backend: {llm_config['backend']}")
+
+class StrategyExplainer:
+    """Runs strategy explanations on a background event loop with an LRU result cache.
+
+    Requests are keyed by the info-set and the action probabilities rounded
+    to `quantization`, so a policy that has barely moved reuses the cached
+    answer. Identical in-flight requests share one call, and once
+    `max_pending` calls are outstanding new requests are dropped rather
+    than queued.
+    """
+
+    def __init__(self, backend, cache_size: int = 256, quantization: float = 0.05, max_pending: int = 8):
+        self.backend = backend
+        self.cache_size = cache_size
+        self.quantization = quantization
+        self.max_pending = max_pending
+
+        self._cache: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._pending: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.dropped = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def cache_key(self, info_set: Hashable, action_probs: np.ndarray) -> Tuple:
+        quantized = np.rint(np.asarray(action_probs) / self.quantization).astype(int)
+        return info_set, tuple(quantized.tolist())
+
+    def submit(self, info_set: Hashable, action_probs: np.ndarray, force: bool = False) -> Optional[Future]:
+        """Request an explanation without blocking; None if the queue is full and not `force`"""
+        key = self.cache_key(info_set, action_probs)
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(self._cache[key])
+                return future
+            if key in self._pending:
+                self.hits += 1
+                return self._pending[key]
+            if len(self._pending) >= self.max_pending and not force:
+                self.dropped += 1
+                return None
+
+            self.misses += 1
+            prompt = render_prompt(round_probabilities(action_probs))
+            future = asyncio.run_coroutine_threadsafe(self.backend.generate(SYSTEM_PROMPT, prompt), self._loop)
+            self._pending[key] = future
+
+        future.add_done_callback(lambda done: self._store(key, done))
+        return future
+
+    def _store(self, key: Tuple, future: Future):
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._cache[key] = future.result()
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "dropped": self.dropped,
+            "pending": len(self._pending),
+            "cached": len(self._cache)
+        }
+
+    def close(self):
+        """Cancel outstanding requests and stop the background loop"""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.cancel()
+        # Let the loop process the cancellations before stopping it
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self._loop).result(timeout=1)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1)
@@ -0,0 +1,113 @@
+import copy
+import logging
+import warnings
+import numpy as np
+import torch
+import torch.nn as nn
+from typing import Dict, Optional
+from .nfsp_agent import select_actions
+
+MODES = ("eager", "script", "compile")
+DTYPES = ("float32", "bfloat16", "int8")
+
+class _Bfloat16(nn.Module):
+    """Runs `network` in bfloat16 behind a float32 interface"""
+
+    def __init__(self, network: nn.Module):
+        super().__init__()
+        self.network = network.to(torch.bfloat16)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.network(x.to(torch.bfloat16)).float()
+
+def export_network(network: nn.Module, mode: str = "script", dtype: str = "float32") -> nn.Module:
+    """Inference-only copy of `network`: eval mode, no autograd, optionally reduced precision and compiled.
+
+    "script" freezes a TorchScript graph, folding the weights into constants
+    and applying the inference graph rewrites; "compile" uses
+    `torch.compile`, which needs a C++ toolchain and compiles on first call.
+    "int8" applies dynamic quantization to the Linear layers.
+    """
+    if mode not in MODES or dtype not in DTYPES:
+        raise ValueError(f"Unknown inference mode {mode!r} or dtype {dtype!r}")
+
+    module = copy.deepcopy(network).eval().requires_grad_(False)
+    if dtype == "bfloat16":
+        module = _Bfloat16(module)
+    elif dtype == "int8":
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # torch.ao.quantization deprecation notices
+            module = torch.ao.quantization.quantize_dynamic(module, {nn.Linear}, dtype=torch.qint8)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # TorchScript deprecation notices
+        if mode == "script":
+            scripted = torch.jit.script(module)
+            if dtype == "int8":
+                # Quantized ops have no inference rewrites; freezing still inlines the weights
+                return torch.jit.freeze(scripted)
+            return torch.jit.optimize_for_inference(scripted)
+    if mode == "compile":
+        return torch.compile(module)
+    return module
+
+class FrozenPolicy:
+    """Inference-optimized snapshot of the best-response and average-policy networks.
+
+    Actors call it like `select_actions` and `refresh` it after every
+    weight sync; the training modules themselves are never touched.
+    """
+
+    def __init__(self, rl_network: nn.Module, sl_network: nn.Module, mode: str = "script",
+                 dtype: str = "float32"):
+        self.mode = mode
+        self.dtype = dtype
+        self.refresh(rl_network, sl_network)
+
+    @classmethod
+    def from_config(cls, rl_network: nn.Module, sl_network: nn.Module, inference_config: Dict) -> "FrozenPolicy":
+        return cls(rl_network, sl_network, inference_config["mode"], inference_config["dtype"])
+
+    def refresh(self, rl_network: nn.Module, sl_network: nn.Module):
+        """Re-export both networks from their current weights"""
+        self.rl_network = export_network(rl_network, self.mode, self.dtype)
+        self.sl_network = export_network(sl_network, self.mode, self.dtype)
+
+    def __call__(self, states, best_response: np.ndarray, generator: Optional[torch.Generator] = None) -> np.ndarray:
+        return select_actions(self.rl_network, self.sl_network, states, best_response, generator)
+
+    def check_accuracy(self, rl_network: nn.Module, sl_network: nn.Module,
+                       states: torch.Tensor) -> Dict[str, float]:
+        """Compare the snapshot with eval-mode eager networks on `states`.
+
+        Reports the largest Q-value and action-probability errors and how often
+        the greedy action and the most likely average-policy action agree.
+        """
+        eager_rl = copy.deepcopy(rl_network).eval()
+        eager_sl = copy.deepcopy(sl_network).eval()
+        with torch.no_grad():
+            q_values, frozen_q = eager_rl(states), self.rl_network(states)
+            probs = torch.softmax(eager_sl(states), dim=1)
+            frozen_probs = torch.softmax(self.sl_network(states), dim=1)
+        return {
+            "q_max_error": (q_values - frozen_q).abs().max().item(),
+            "prob_max_error": (probs - frozen_probs).abs().max().item(),
+            "greedy_agreement": (q_values.argmax(1) == frozen_q.argmax(1)).float().mean().item(),
+            "policy_agreement": (probs.argmax(1) == frozen_probs.argmax(1)).float().mean().item()
+        }
+
+def checked_policy(rl_network: nn.Module, sl_network: nn.Module, inference_config: Dict,
+                   states: Optional[torch.Tensor] = None) -> FrozenPolicy:
+    """`FrozenPolicy` from config, falling back to float32 if reduced precision exceeds the tolerance on `states`"""
+    policy = FrozenPolicy.from_config(rl_network, sl_network, inference_config)
+    if states is None or policy.dtype == "float32":
+        return policy
+
+    accuracy = policy.check_accuracy(rl_network, sl_network, states)
+    if accuracy["prob_max_error"] > inference_config["tolerance"]:
+        logging.getLogger(__name__).warning(
+            f"{policy.dtype} inference is off by up to {accuracy['prob_max_error']:.4f} in action "
+            f"probability (tolerance {inference_config['tolerance']}); using float32"
+        )
+        return FrozenPolicy(rl_network, sl_network, policy.mode, "float32")
+    return policy
@@ -1,28 +1,15 @@
+import copy
 import torch
 import torch.nn as nn
 import numpy as np
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
-from langchain_community.chat_models import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
-
-@dataclass
-class ReplayBuffer:
-    capacity: int
-    data: List = None
-    
-    def __post_init__(self):
-        self.data = []
-        self.count = 0
-    
-    def add(self, experience):
-        if len(self.data) < self.capacity:
-            self.data.append(experience)
-        else:
-            idx = np.random.randint(self.count + 1)
-            if idx < self.capacity:
-                self.data[idx] = experience
-        self.count += 1
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future
+from .policy_cache import PolicyCache
+from .replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
+from ..checkpoint import CheckpointManager
+from ..environments.leduc_tree import build_info_sets
+from ..seeding import generator, int_seed
+from ..telemetry import telemetry
 
 class QNetwork(nn.Module):
     def __init__(self, input_size: int, hidden_sizes: List[int], output_size: int):
@@ -64,25 +51,93 @@ class PolicyNetwork(nn.Module):
     def forward(self, x):
         return self.network(x)
 
+def build_networks(config: Dict) -> Tuple[QNetwork, PolicyNetwork]:
+    """Create the best-response and average-policy networks described by `config`"""
+    input_dim = 14  # state dimension
+    hidden_dim = config["model"]["hidden_dim"]
+    output_dim = 5  # action space size
+    
+    return (
+        QNetwork(input_dim, [hidden_dim], output_dim),
+        PolicyNetwork(input_dim, [hidden_dim], output_dim)
+    )
+
+def select_actions(rl_network: nn.Module, sl_network: nn.Module, states: np.ndarray,
+                   best_response: np.ndarray, generator: Optional[torch.Generator] = None) -> np.ndarray:
+    """Pick one action per state with a single forward pass per network; `generator` drives the sampling"""
+    states = torch.as_tensor(states, dtype=torch.float32)
+    best_response = torch.as_tensor(best_response, dtype=torch.bool)
+    
+    actions = torch.empty(len(states), dtype=torch.long)
+    
+    # Acting never uses dropout; exported networks have no training mode to switch
+    training = [network for network in (rl_network, sl_network) if getattr(network, "training", False)]
+    for network in training:
+        network.eval()
+    with torch.no_grad():
+        if best_response.any():
+            # Use best response (RL) strategy
+            q_values = rl_network(states[best_response])
+            actions[best_response] = torch.argmax(q_values, dim=1)
+        average = ~best_response
+        if average.any():
+            # Use average (SL) strategy
+            probs = torch.softmax(sl_network(states[average]), dim=1)
+            actions[average] = torch.multinomial(probs, 1, generator=generator).squeeze(1)
+    for network in training:
+        network.train()
+    
+    return actions.numpy()
+
 class NFSPAgent:
     def __init__(self, config: Dict):
         self.config = config
-        self.rl_buffer = ReplayBuffer(config["training"]["rl_buffer_size"])
-        self.sl_buffer = ReplayBuffer(config["training"]["sl_buffer_size"])
+        self.eta = config["training"]["eta"]
+        
+        # Independent random streams of the run seed: policy sampling, each buffer, weight init
+        seed = config["training"]["seed"]
+        self.rng = generator(seed, "agent", 0)
+        self.torch_generator = torch.Generator().manual_seed(int_seed(seed, "agent", 1))
         
-        # Initialize LLM for strategy explanation
-        self.llm = ChatOpenAI(
-            model=config["llm"]["model"],
-            temperature=config["llm"]["temperature"]
+        # With a raise cap the buffers store info-set ids instead of observation vectors
+        max_raises = config["game"]["max_raises"]
+        self.info_sets = build_info_sets(max_raises) if max_raises is not None else None
+        observation_table = None if self.info_sets is None else self.info_sets.observations
+        self.observation_table = None if observation_table is None else torch.tensor(observation_table)
+        self.prioritized = config["training"]["prioritized_replay"]
+        if self.prioritized:
+            # Proportional prioritized replay for the best-response memory
+            self.rl_buffer = PrioritizedReplayBuffer(
+                config["training"]["rl_buffer_size"],
+                observation_table=observation_table,
+                path=config["training"]["rl_buffer_path"],
+                rng=generator(seed, "agent", 2),
+                alpha=config["training"]["priority_alpha"],
+                beta=config["training"]["priority_beta"],
+                epsilon=config["training"]["priority_epsilon"]
+            )
+        else:
+            self.rl_buffer = ReplayBuffer(
+                config["training"]["rl_buffer_size"],
+                observation_table=observation_table,
+                path=config["training"]["rl_buffer_path"],
+                rng=generator(seed, "agent", 2)
+            )
+        self.sl_buffer = ReplayBuffer(
+            config["training"]["sl_buffer_size"],
+            transitions=False,
+            observation_table=observation_table,
+            path=config["training"]["sl_buffer_path"],
+            rng=generator(seed, "agent", 3)
         )
         
-        # Initialize networks
-        input_dim = 14  # state dimension
-        hidden_dim = config["model"]["hidden_dim"]
-        output_dim = 5  # action space size
+        # LLM strategy explanations are optional and loaded lazily
+        self.explainer = self._make_explainer(config["llm"]) if config["llm"]["enabled"] else None
         
-        self.rl_network = QNetwork(input_dim, [hidden_dim], output_dim)
-        self.sl_network = PolicyNetwork(input_dim, [hidden_dim], output_dim)
+        # Initialize networks from their own seed, leaving the global torch RNG alone
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(int_seed(seed, "agent", 4))
+            self.rl_network, self.sl_network = build_networks(config)
         
         # Optimizers
         self.rl_optimizer = torch.optim.Adam(
@@ -95,6 +150,26 @@ class NFSPAgent:
             lr=config["training"]["sl_learning_rate"]
         )
         
+        # Target network for the bootstrapped Q targets
+        self.gamma = config["training"]["gamma"]
+        self.target_update_interval = config["training"]["target_update_interval"]
+        self.target_tau = config["training"]["target_tau"]
+        self.target_network = copy.deepcopy(self.rl_network).requires_grad_(False)
+        self.rl_updates = 0
+        
+        # Tabulated average strategy over all info-sets, invalidated by SL updates
+        self.policy_cache = None
+        if self.info_sets is not None:
+            self.policy_cache = PolicyCache(
+                self.sl_network,
+                self.observation_table,
+                config["evaluation"]["policy_cache_refresh"]
+            )
+        
+        # Loss modules are stateless, so build them once
+        self.rl_loss_fn = nn.MSELoss()
+        self.sl_loss_fn = nn.CrossEntropyLoss()
+        
         # Load models if they exist
         self._load_models()
     
@@ -106,83 +181,180 @@ class NFSPAgent:
         # This should be implemented based on the specific game
         return 10  # placeholder
     
-    async def get_action(self, state, is_training: bool = True) -> Tuple[int, float]:
-        """Get action using anticipatory dynamics"""
-        if is_training and np.random.random() < 0.5:
-            # Use best response (RL) strategy
-            with torch.no_grad():
-                q_values = self.rl_network(torch.FloatTensor(state))
-                action = torch.argmax(q_values).item()
-        else:
-            # Use average (SL) strategy
-            with torch.no_grad():
-                probs = torch.softmax(self.sl_network(torch.FloatTensor(state)), dim=0)
-                action = torch.multinomial(probs, 1).item()
-        
-        return action
+    def sample_policy_modes(self, num_games: int) -> np.ndarray:
+        """Draw per game whether to follow the best response (True) or the average policy"""
+        return self.rng.random(num_games) < self.eta
     
-    async def update(self, batch_rl, batch_sl):
-        """Update both networks"""
-        # Update RL network (best response)
-        states, actions, rewards, next_states, dones = zip(*batch_rl)
-        
-        states = torch.FloatTensor(states)
-        actions = torch.LongTensor(actions)
-        rewards = torch.FloatTensor(rewards)
-        next_states = torch.FloatTensor(next_states)
-        dones = torch.FloatTensor(dones)
+    def act(self, states: np.ndarray, best_response: Optional[np.ndarray] = None,
+            is_training: bool = True) -> np.ndarray:
+        """Select one action per game with a single forward pass per network"""
+        if best_response is None:
+            if is_training:
+                best_response = self.sample_policy_modes(len(states))
+            else:
+                best_response = np.zeros(len(states), dtype=bool)
         
-        # Q-learning update
-        current_q = self.rl_network(states).gather(1, actions.unsqueeze(1))
-        with torch.no_grad():
-            next_q = self.rl_network(next_states).max(1)[0]
-            target_q = rewards + (1 - dones) * 0.99 * next_q
+        return select_actions(self.rl_network, self.sl_network, states, best_response, self.torch_generator)
+    
+    def act_info_sets(self, info_sets: np.ndarray, best_response: Optional[np.ndarray] = None,
+                      is_training: bool = True) -> np.ndarray:
+        """`act` on info-set ids, gathering their observations from the shared table"""
+        states = self.observation_table.index_select(0, torch.as_tensor(info_sets, dtype=torch.long))
+        return self.act(states, best_response, is_training)
+    
+    async def get_action(self, state, is_training: bool = True,
+                         best_response: Optional[bool] = None) -> int:
+        """Get action using anticipatory dynamics"""
+        with telemetry.phase("agent.get_action"):
+            modes = None if best_response is None else np.array([best_response])
+            return int(self.act(np.asarray(state)[None], modes, is_training)[0])
+    
+    def update(self, batch_rl, batch_sl):
+        """Update both networks from tensor batches produced by `ReplayBuffer.sample`"""
+        # Update RL network (best response); prioritized batches also carry IS weights and slots
+        states, actions, rewards, next_states, dones = batch_rl[:5]
         
-        rl_loss = nn.MSELoss()(current_q.squeeze(), target_q)
+        # Q-learning update: one pass over current and next states gives Q(s, a)
+        # and the greedy next actions, which the target network evaluates
+        with telemetry.phase("update.rl_forward"):
+            q_values = self.rl_network(torch.cat([states, next_states]))
+            current_q = q_values[:len(states)].gather(1, actions.unsqueeze(1)).squeeze(1)
+            with torch.no_grad():
+                next_q_online = q_values[len(states):]
+                if self.target_update_interval or self.target_tau:
+                    next_actions = next_q_online.argmax(1, keepdim=True)
+                    next_q = self.target_network(next_states).gather(1, next_actions).squeeze(1)
+                else:
+                    next_q = next_q_online.max(1)[0]
+                target_q = rewards + (1 - dones) * self.gamma * next_q
+            
+            if self.prioritized:
+                weights, indices = batch_rl[5:]
+                td_errors = current_q - target_q
+                rl_loss = (weights * td_errors.pow(2)).mean()
+                self.rl_buffer.update_priorities(indices.numpy(), td_errors.detach().numpy())
+            else:
+                rl_loss = self.rl_loss_fn(current_q, target_q)
         
-        self.rl_optimizer.zero_grad()
-        rl_loss.backward()
-        self.rl_optimizer.step()
+        with telemetry.phase("update.rl_backward"):
+            self.rl_optimizer.zero_grad()
+            rl_loss.backward()
+            self.rl_optimizer.step()
+            self._update_target_network()
         
         # Update SL network (average strategy)
-        states, actions = zip(*batch_sl)
-        states = torch.FloatTensor(states)
-        actions = torch.LongTensor(actions)
+        states, actions = batch_sl
         
-        action_probs = self.sl_network(states)
-        sl_loss = nn.CrossEntropyLoss()(action_probs, actions)
+        with telemetry.phase("update.sl_forward"):
+            action_probs = self.sl_network(states)
+            sl_loss = self.sl_loss_fn(action_probs, actions)
         
-        self.sl_optimizer.zero_grad()
-        sl_loss.backward()
-        self.sl_optimizer.step()
+        with telemetry.phase("update.sl_backward"):
+            self.sl_optimizer.zero_grad()
+            sl_loss.backward()
+            self.sl_optimizer.step()
+        if self.policy_cache is not None:
+            self.policy_cache.invalidate()
         
         return {
             "rl_loss": rl_loss.item(),
             "sl_loss": sl_loss.item()
         }
     
-    async def explain_strategy(self, state) -> str:
-        """Use LLM to explain current strategy"""
-        action_probs = torch.softmax(self.sl_network(torch.FloatTensor(state)), dim=0)
+    def _update_target_network(self):
+        """Polyak-average or periodically copy the RL network into the target network"""
+        self.rl_updates += 1
+        if self.target_tau:
+            with torch.no_grad():
+                for target, online in zip(self.target_network.parameters(), self.rl_network.parameters()):
+                    target.lerp_(online, self.target_tau)
+        elif self.target_update_interval and self.rl_updates % self.target_update_interval == 0:
+            self.target_network.load_state_dict(self.rl_network.state_dict())
+    
+    def learn(self, num_updates: int) -> Dict[str, float]:
+        """Take `num_updates` gradient steps from one pre-sampled contiguous mega-batch"""
+        batch_size = self.config["training"]["batch_size"]
+        if self.prioritized:
+            # Anneal the importance-sampling correction towards full compensation
+            beta = self.config["training"]["priority_beta"]
+            progress = self.rl_updates / self.config["training"]["priority_beta_steps"]
+            self.rl_buffer.beta = min(1.0, beta + (1.0 - beta) * progress)
+        with telemetry.phase("buffer.sample"):
+            batch_rl = self.rl_buffer.sample(num_updates * batch_size)
+            batch_sl = self.sl_buffer.sample(num_updates * batch_size)
         
-        prompt = f"""
-        Given the current game state and action probabilities:
-        Action probabilities: {action_probs.tolist()}
+        losses = []
+        for start in range(0, num_updates * batch_size, batch_size):
+            rows = slice(start, start + batch_size)
+            losses.append(self.update(
+                tuple(column[rows] for column in batch_rl),
+                tuple(column[rows] for column in batch_sl)
+            ))
         
-        Please explain the strategy being employed by the agent, considering:
-        1. Which actions are most likely and why
-        2. How this relates to game-theoretic principles
-        3. Potential counter-strategies the opponent might employ
-        """
+        return {key: float(np.mean([loss[key] for loss in losses])) for key in losses[0]}
+    
+    def _make_explainer(self, llm_config: Dict):
+        # Imported here so headless training never loads the LLM stack
+        from .explainer import StrategyExplainer, make_backend
         
-        messages = [
-            SystemMessage(content="You are an expert in game theory and poker strategy analysis."),
-            HumanMessage(content=prompt)
-        ]
+        return StrategyExplainer(
+            make_backend(llm_config),
+            cache_size=llm_config["cache_size"],
+            quantization=llm_config["probability_quantization"],
+            max_pending=llm_config["max_pending"]
+        )
+    
+    def action_probabilities(self, state) -> np.ndarray:
+        """Average-strategy action probabilities at `state`"""
+        if self.policy_cache is not None:
+            return self.policy_cache.probabilities(self.info_sets.observation_ids(state))
+        with torch.no_grad():
+            return torch.softmax(self.sl_network(torch.as_tensor(state, dtype=torch.float32)), dim=-1).numpy()
+    
+    def request_explanation(self, state, force: bool = False) -> Optional[Future]:
+        """Queue a background explanation of the current strategy at `state`; None if disabled or full"""
+        if self.explainer is None:
+            return None
+        state = np.asarray(state, dtype=np.float32)
+        key = int(self.info_sets.observation_ids(state)) if self.info_sets is not None else state.tobytes()
+        return self.explainer.submit(key, self.action_probabilities(state), force)
+    
+    async def explain_strategy(self, state) -> str:
+        """Use LLM to explain current strategy"""
+        if self.explainer is None:
+            raise RuntimeError("LLM explanations are disabled; set llm.enabled in config.yaml")
+        import asyncio
         
-        response = await self.llm.agenerate([messages])
-        return response.generations[0][0].text
+        return await asyncio.wrap_future(self.request_explanation(state, force=True))
 
+    def state_dict(self) -> Dict:
+        """Network, target network and optimizer state, detached from the live tensors"""
+        return copy.deepcopy({
+            "rl_network": self.rl_network.state_dict(),
+            "sl_network": self.sl_network.state_dict(),
+            "target_network": self.target_network.state_dict(),
+            "rl_optimizer": self.rl_optimizer.state_dict(),
+            "sl_optimizer": self.sl_optimizer.state_dict(),
+            "rl_updates": self.rl_updates
+        })
+    
+    def load_state_dict(self, state: Dict):
+        self.rl_network.load_state_dict(state["rl_network"])
+        self.sl_network.load_state_dict(state["sl_network"])
+        self.target_network.load_state_dict(state["target_network"])
+        self.rl_optimizer.load_state_dict(state["rl_optimizer"])
+        self.sl_optimizer.load_state_dict(state["sl_optimizer"])
+        self.rl_updates = state["rl_updates"]
+        if self.policy_cache is not None:
+            self.policy_cache.invalidate()
+    
     def _load_models(self):
-        # Load models if they exist
-        pass
+        # Resume from the latest checkpoint if one exists
+        self.start_episode = 0
+        checkpoint_config = self.config["checkpoint"]
+        if not checkpoint_config["resume"]:
+            return
+        
+        path = CheckpointManager.find_latest(checkpoint_config["directory"])
+        if path is not None:
+            self.start_episode = CheckpointManager.load(self, path)
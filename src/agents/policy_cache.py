@@ -0,0 +1,64 @@
+import numpy as np
+import torch
+import torch.nn as nn
+from typing import Dict, Optional
+
+class PolicyCache:
+    """Average-strategy action probabilities for every info-set, tabulated in one batched pass.
+
+    The owner calls `invalidate` after each optimizer step of `network`. The
+    table is recomputed lazily on the next lookup once it is
+    `refresh_interval` versions behind, so an interval of 1 always serves
+    the current network and larger intervals trade staleness for fewer passes.
+    """
+
+    def __init__(self, network: nn.Module, observations: torch.Tensor, refresh_interval: int = 1):
+        self.network = network
+        self.observations = observations
+        self.refresh_interval = refresh_interval
+
+        self.version = 0
+        self._table: Optional[np.ndarray] = None
+        self._table_version = 0
+        self.hits = self.misses = 0
+
+    def invalidate(self):
+        """Record that the network's weights changed"""
+        self.version += 1
+
+    @property
+    def stale(self) -> bool:
+        return self._table is None or self.version - self._table_version >= self.refresh_interval
+
+    def table(self) -> np.ndarray:
+        """[num_info_sets, num_actions] probabilities, refreshed first if stale"""
+        if self.stale:
+            self.misses += 1
+            self._refresh()
+        else:
+            self.hits += 1
+        return self._table
+
+    def probabilities(self, info_sets) -> np.ndarray:
+        """Action probabilities at the given info-set ids"""
+        return self.table()[info_sets]
+
+    def _refresh(self):
+        was_training = self.network.training
+        self.network.eval()
+        with torch.no_grad():
+            table = torch.softmax(self.network(self.observations), dim=1).numpy()
+        self.network.train(was_training)
+
+        table.setflags(write=False)
+        self._table = table
+        self._table_version = self.version
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "version": self.version,
+            "table_version": self._table_version
+        }
@@ -0,0 +1,223 @@
+import os
+import numpy as np
+import torch
+from typing import Dict, Optional, Tuple
+from .sum_tree import SumTree
+from ..telemetry import telemetry
+
+class ReplayBuffer:
+    """Reservoir-sampled replay memory stored in preallocated columnar arrays.
+
+    Given an `observation_table`, states are stored as integer row ids into
+    it and gathered back into observation vectors when sampling.
+
+    Given a `path`, experiences are instead stored as fixed-size records in
+    a memory-mapped file there, so the buffer lives in the page cache rather
+    than in process memory; the columns are views into those records.
+
+    Reservoir replacement and sampling draw from `rng`.
+    """
+
+    def __init__(self, capacity: int, state_dim: int = 14, transitions: bool = True,
+                 observation_table: Optional[np.ndarray] = None, path: Optional[str] = None,
+                 rng: Optional[np.random.Generator] = None):
+        self.capacity = capacity
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.state_dim = state_dim
+        self.transitions = transitions
+        self.observation_table = None if observation_table is None else torch.tensor(observation_table)
+        self.path = path
+
+        if observation_table is None:
+            state_field = (np.float32, (state_dim,))
+        else:
+            state_field = (np.int32, ())
+        fields = [("states", *state_field), ("actions", np.int8, ())]
+        if transitions:
+            fields += [("rewards", np.float32, ()), ("next_states", *state_field), ("dones", np.int8, ())]
+
+        if path is None:
+            # Columns are allocated once; np.zeros pages are only touched on first write
+            self._records = None
+            for name, dtype, shape in fields:
+                setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._records = np.memmap(path, dtype=np.dtype(fields), mode="w+", shape=(capacity,))
+            for name, _, _ in fields:
+                setattr(self, name, self._records[name])
+
+        self.size = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, experience):
+        """Add one (state, action) or (state, action, reward, next_state, done) tuple.
+
+        A write per column makes this slower than appending to a list; the
+        columns pay off through `add_batch` and cheap sampling. The serial
+        loop still adds per step, since its hands are too short to batch.
+        """
+        with telemetry.phase("buffer.add"):
+            if self.size < self.capacity:
+                idx = self.size
+                self.size += 1
+            else:
+                idx = self.rng.integers(self.count + 1)
+                if idx >= self.capacity:
+                    self.count += 1
+                    return
+            self._write(idx, *experience)
+            self.count += 1
+
+    def add_batch(self, states, actions, rewards=None, next_states=None, dones=None):
+        """Add many experiences at once with the same reservoir semantics as `add`"""
+        n = len(actions)
+        fill = min(n, self.capacity - self.size)
+        slots = np.arange(self.size, self.size + fill)
+        rows = np.arange(fill)
+
+        if fill < n:
+            # Item k is the (count + k)-th ever seen and replaces a random slot
+            # with probability capacity / (count + k + 1)
+            seen = self.count + np.arange(fill, n)
+            drawn = self.rng.integers(seen + 1)
+            keep = drawn < self.capacity
+            # Later writes to the same slot win, as they would with sequential adds
+            late_slots, first = np.unique(drawn[keep][::-1], return_index=True)
+            late_rows = np.arange(fill, n)[keep][::-1][first]
+            slots = np.concatenate([slots, late_slots])
+            rows = np.concatenate([rows, late_rows])
+
+        self.size += fill
+        self.count += n
+        if self.transitions:
+            self._write(slots, states[rows], actions[rows], rewards[rows], next_states[rows], dones[rows])
+        else:
+            self._write(slots, states[rows], actions[rows])
+
+    def sample(self, batch_size: int, indices: Optional[np.ndarray] = None) -> Tuple[torch.Tensor, ...]:
+        """Sample a uniform batch and return it as ready-made tensors"""
+        if indices is None:
+            indices = self.rng.integers(self.size, size=batch_size)
+
+        rows = self._gather(indices)
+        states = self._states_tensor(rows["states"])
+        actions = torch.from_numpy(rows["actions"]).long()
+        if not self.transitions:
+            return states, actions
+
+        rewards = torch.from_numpy(rows["rewards"])
+        next_states = self._states_tensor(rows["next_states"])
+        dones = torch.from_numpy(rows["dones"]).float()
+        return states, actions, rewards, next_states, dones
+
+    def _gather(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        if self._records is None:
+            return {name: column[indices] for name, column in self.columns.items()}
+
+        # Read the file in slot order so page faults stay sequential, then
+        # restore the sampled order so batches remain uniformly shuffled
+        order = np.argsort(indices)
+        records = np.empty(len(indices), dtype=self._records.dtype)
+        records[order] = self._records[indices[order]]
+        return {name: np.ascontiguousarray(records[name]) for name in self.columns}
+
+    def _states_tensor(self, states: np.ndarray) -> torch.Tensor:
+        if self.observation_table is None:
+            return torch.from_numpy(states)
+        return self.observation_table.index_select(0, torch.from_numpy(states).long())
+
+    def _write(self, idx, state, action, reward=None, next_state=None, done=None):
+        self.states[idx] = state
+        self.actions[idx] = action
+        if self.transitions:
+            self.rewards[idx] = reward
+            self.next_states[idx] = next_state
+            self.dones[idx] = done
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The backing arrays by name"""
+        names = ["states", "actions"]
+        if self.transitions:
+            names += ["rewards", "next_states", "dones"]
+        return {name: getattr(self, name) for name in names}
+
+    def state_dict(self) -> Dict:
+        """Copies of the filled rows and the reservoir counters"""
+        state = {name: column[:self.size].copy() for name, column in self.columns.items()}
+        state.update(size=self.size, count=self.count)
+        return state
+
+    def load_state_dict(self, state: Dict):
+        """Restore from `state_dict` output; columns may be read-only memory maps"""
+        self.size = min(state["size"], self.capacity)
+        self.count = state["count"]
+        for name, column in self.columns.items():
+            column[:self.size] = state[name][:self.size]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes reserved by the backing arrays"""
+        total = self.states.nbytes + self.actions.nbytes
+        if self.transitions:
+            total += self.rewards.nbytes + self.next_states.nbytes + self.dones.nbytes
+        return total
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """`ReplayBuffer` that samples transitions in proportion to their TD error.
+
+    Slot `i` is drawn with probability p_i^alpha / sum_k p_k^alpha from a
+    sum-tree. New experiences get the largest priority seen so far, so they
+    are replayed at least once before their error is known. `sample`
+    appends importance-sampling weights (w_i = (N P(i))^-beta, scaled so
+    the batch maximum is 1) and the slot indices to the batch; the learner
+    passes the indices back to `update_priorities` with the new TD errors.
+    """
+
+    def __init__(self, capacity: int, state_dim: int = 14, transitions: bool = True,
+                 observation_table: Optional[np.ndarray] = None, path: Optional[str] = None,
+                 rng: Optional[np.random.Generator] = None, alpha: float = 0.6, beta: float = 0.4,
+                 epsilon: float = 1e-6):
+        super().__init__(capacity, state_dim, transitions, observation_table, path, rng)
+        self.alpha = alpha
+        self.beta = beta  # annealed towards 1 by the learner
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def sample(self, batch_size: int, indices: Optional[np.ndarray] = None) -> Tuple[torch.Tensor, ...]:
+        """Sample a prioritized batch: the usual tensors, then IS weights and slot indices.
+
+        Weights are normalized by their maximum over the whole call. `NFSPAgent.learn`
+        samples all of its gradient steps at once, so a sub-batch's largest weight can be below 1.
+        """
+        if indices is None:
+            # Rounding at the end of the tree can land on an empty slot
+            indices = np.minimum(self.tree.sample(batch_size, self.rng), self.size - 1)
+
+        probabilities = self.tree[indices] / self.tree.total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        return super().sample(batch_size, indices) + (
+            torch.from_numpy(weights.astype(np.float32)),
+            torch.from_numpy(indices)
+        )
+
+    def update_priorities(self, indices, td_errors):
+        """Re-prioritize sampled slots from the absolute TD errors of their last update"""
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def _write(self, idx, *experience):
+        super()._write(idx, *experience)
+        self.tree.update(idx, self.max_priority ** self.alpha)
+
+    def load_state_dict(self, state: Dict):
+        """Restore the experiences; every restored slot starts at the maximum priority"""
+        super().load_state_dict(state)
+        self.tree.update(np.arange(self.size), self.max_priority ** self.alpha)
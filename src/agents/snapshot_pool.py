@@ -0,0 +1,128 @@
+import copy
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.nn as nn
+from torch.func import functional_call
+from typing import Dict, Optional
+
+SAMPLING = ("uniform", "recent")
+
+class SnapshotPool:
+    """Frozen copies of a network kept in shared memory, for opponent sampling in self-play.
+
+    All snapshots live in one [capacity, num_weights] shared tensor, so actor
+    processes that receive the pool at spawn read the same pages as the
+    learner that writes them. Playing a snapshot binds views of its row to a
+    template module (`torch.func.functional_call`); swapping opponents copies
+    no weights. When the pool is full a new snapshot replaces the least
+    recently sampled or played one.
+
+    Actors read rows without taking the lock, so each slot has a sequence
+    counter that `add` makes odd while it writes (a seqlock): `act` retries
+    a forward pass that overlapped a write instead of using torn weights.
+    `act` also marks its slot as used, so a snapshot that live games keep
+    playing is not the one evicted; only when every slot is in play can a
+    hand switch to the new snapshot between two of its decisions.
+    """
+
+    def __init__(self, network: nn.Module, capacity: int, probability: float = 0.5,
+                 sampling: str = "uniform"):
+        if sampling not in SAMPLING:
+            raise ValueError(f"Unknown snapshot sampling {sampling!r}")
+        self.capacity = capacity
+        self.probability = probability  # share of hands played against a snapshot
+        self.sampling = sampling
+        self.template = copy.deepcopy(network).eval().requires_grad_(False)
+
+        # Layout of the flattened state dict
+        state = self.template.state_dict()
+        self.shapes = {name: tensor.shape for name, tensor in state.items()}
+        self.sizes = [tensor.numel() for tensor in state.values()]
+
+        self.weights = torch.zeros(capacity, sum(self.sizes)).share_memory_()
+        self.episodes = torch.full((capacity,), -1, dtype=torch.int64).share_memory_()  # -1: empty slot
+        self.last_used = torch.zeros(capacity, dtype=torch.int64).share_memory_()
+        self.sequence = torch.zeros(capacity, dtype=torch.int64).share_memory_()  # odd while a slot is written
+        self.clock = torch.zeros(1, dtype=torch.int64).share_memory_()
+        self.lock = mp.get_context("spawn").Lock()
+        self._views: Optional[Dict[int, Dict[str, torch.Tensor]]] = None
+
+    @classmethod
+    def from_config(cls, pool_config: Dict, network: nn.Module) -> "SnapshotPool":
+        return cls(
+            network,
+            pool_config["capacity"],
+            probability=pool_config["probability"],
+            sampling=pool_config["sampling"]
+        )
+
+    def __getstate__(self) -> Dict:
+        # Views are rebuilt per process from the shared storage
+        state = self.__dict__.copy()
+        state["_views"] = None
+        return state
+
+    def __len__(self) -> int:
+        return int((self.episodes >= 0).sum())
+
+    @property
+    def snapshot_nbytes(self) -> int:
+        """Shared memory taken by one snapshot"""
+        return self.weights.shape[1] * self.weights.element_size()
+
+    def add(self, network: nn.Module, episode: int) -> int:
+        """Snapshot `network`'s current weights into a free or the least recently sampled slot"""
+        flat = torch.cat([tensor.detach().reshape(-1) for tensor in network.state_dict().values()])
+        with self.lock:
+            empty = torch.nonzero(self.episodes < 0)
+            slot = int(empty[0]) if len(empty) else int(torch.argmin(self.last_used))
+            self.sequence[slot] += 1
+            self.weights[slot] = flat
+            self.episodes[slot] = episode
+            self.sequence[slot] += 1
+            # A fresh snapshot counts as just used, so it is not the next evicted
+            self.last_used[slot] = self.clock
+            self.clock += 1
+        return slot
+
+    def sample(self, rng: np.random.Generator, size: int = 1) -> np.ndarray:
+        """`size` occupied slots, uniformly or weighted by recency rank (newest weighs `len(pool)`)"""
+        with self.lock:
+            episodes = self.episodes.numpy()
+            slots = np.flatnonzero(episodes >= 0)
+            if not len(slots):
+                raise ValueError("The snapshot pool is empty")
+            if self.sampling == "recent":
+                ranks = np.argsort(np.argsort(episodes[slots])) + 1
+                chosen = rng.choice(slots, size=size, p=ranks / ranks.sum())
+            else:
+                chosen = slots[rng.integers(len(slots), size=size)]
+            self.last_used[torch.from_numpy(chosen)] = self.clock
+            self.clock += 1
+        return chosen
+
+    def parameters(self, slot: int) -> Dict[str, torch.Tensor]:
+        """State dict of `slot` as views into the shared weights"""
+        if self._views is None:
+            self._views = {}
+            for index in range(self.capacity):
+                rows = torch.split(self.weights[index], self.sizes)
+                self._views[index] = {name: row.view(shape) for (name, shape), row in zip(self.shapes.items(), rows)}
+        return self._views[slot]
+
+    def act(self, slot: int, states, generator: Optional[torch.Generator] = None) -> np.ndarray:
+        """Actions sampled from the average policy of snapshot `slot`"""
+        states = torch.as_tensor(states, dtype=torch.float32)
+        # Unlocked and approximate: only keeps the slot from looking least recently used
+        self.last_used[slot] = self.clock
+        with torch.no_grad():
+            while True:
+                sequence = int(self.sequence[slot])
+                if sequence % 2:
+                    continue  # `add` is writing this slot
+                probs = torch.softmax(functional_call(self.template, self.parameters(slot), (states,)), dim=1)
+                if int(self.sequence[slot]) == sequence:
+                    break
+            # Sampled once per call, so retries leave the generator stream unchanged
+            return torch.multinomial(probs, 1, generator=generator).squeeze(1).numpy()
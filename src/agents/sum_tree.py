@@ -0,0 +1,55 @@
+import numpy as np
+
+class SumTree:
+    """Binary tree of priority sums in one flat array, for proportional sampling.
+
+    Node `i` has children `2i` and `2i + 1`; the root is node 1 and leaf `k`
+    is node `leaves + k`, where `leaves` is `capacity` rounded up to a power
+    of two. Updates and samples are batched: each walks the tree one level
+    at a time for the whole batch, so both cost O(batch * log capacity)
+    vectorized operations.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.leaves = 1 << max(capacity - 1, 1).bit_length()
+        self.depth = self.leaves.bit_length() - 1
+        self.nodes = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.nodes[1])
+
+    def __getitem__(self, indices) -> np.ndarray:
+        return self.nodes[self.leaves + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        """Set the priorities of leaves `indices` and recompute the sums above them"""
+        nodes = self.leaves + np.asarray(indices, dtype=np.int64).reshape(-1)
+        # With repeated indices the last priority wins
+        self.nodes[nodes] = np.broadcast_to(priorities, nodes.shape)
+        for _ in range(self.depth):
+            # Siblings share a parent; recomputing it twice writes the same sum
+            nodes = nodes >> 1
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf index holding each prefix-sum position in `values`, each in [0, total)"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            right = values >= self.nodes[left]
+            values -= np.where(right, self.nodes[left], 0.0)
+            nodes = left + right
+        # Rounding can step past the last non-empty leaf
+        return np.minimum(nodes - self.leaves, self.capacity - 1)
+
+    def sample(self, batch_size: int, rng: np.random.Generator) -> np.ndarray:
+        """Leaf indices drawn with probability proportional to their priority, in random order.
+
+        One index is drawn from each of `batch_size` equal slices of the total
+        priority mass; shuffling keeps any slice of the batch representative.
+        """
+        bounds = np.linspace(0.0, self.total, batch_size + 1)
+        return self.find(rng.permutation(rng.uniform(bounds[:-1], bounds[1:])))
@@ -0,0 +1,57 @@
+import argparse
+import json
+import platform
+import sys
+import logging
+import numpy as np
+import torch
+import yaml
+from .suite import compare, run_suite
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency benchmarks for env, agent and learner")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="JSON results to compare against; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative slowdown vs the baseline")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and shorter runs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+
+    metrics = run_suite(config, quick=args.quick, seed=args.seed)
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "torch": torch.__version__,
+            "machine": platform.machine(),
+            "threads": torch.get_num_threads()
+        },
+        "quick": args.quick,
+        "metrics": metrics
+    }
+
+    for name, metric in metrics.items():
+        print(f"{name:<40} {metric['value']:>14,.3f} {metric['unit']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["metrics"]
+        rows = compare(metrics, baseline, args.tolerance)
+        print(f"\n{'metric':<40} {'baseline':>14} {'current':>14} {'change':>8}")
+        for name, before, after, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<40} {before:>14,.3f} {after:>14,.3f} {change:>+8.1%}{flag}")
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
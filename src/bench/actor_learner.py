@@ -0,0 +1,36 @@
+import argparse
+import logging
+import os
+import yaml
+from typing import Dict, List
+from ..actor_learner import train_parallel
+from .suite import bench_agent
+
+def run(config: Dict, actor_counts: List[int], num_episodes: int) -> List[Dict[str, float]]:
+    """Train a fresh agent for `num_episodes` with each actor count and collect throughput"""
+    results = []
+    for num_actors in actor_counts:
+        agent = bench_agent(config, training={"num_episodes": num_episodes}, parallel={"num_actors": num_actors})
+        results.append(train_parallel(agent, agent.config))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Actor/learner throughput scaling with core count")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--episodes", type=int, default=20000)
+    parser.add_argument("--actors", type=int, nargs="+",
+                        default=[n for n in (1, 2, 4, 8, 16) if n < (os.cpu_count() or 1)] or [1])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+
+    # A learner that falls behind shows up as a replay ratio under its target
+    print(f"{'actors':>6} {'episodes/s':>12} {'steps/s':>12} {'updates/s':>10} {'replay ratio':>12} {'target':>7}")
+    for stats in run(config, args.actors, args.episodes):
+        print(f"{stats['num_actors']:>6} {stats['episodes_per_s']:>12.0f} {stats['steps_per_s']:>12.0f} "
+              f"{stats['updates_per_s']:>10.0f} {stats['replay_ratio']:>12.2f} {stats['target_replay_ratio']:>7.2f}")
+
+if __name__ == "__main__":
+    main()
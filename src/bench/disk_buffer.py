@@ -0,0 +1,85 @@
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+import numpy as np
+from typing import Dict, Optional
+from ..agents.replay_buffer import ReplayBuffer
+from ..environments.leduc_tree import build_info_sets
+
+def memory_usage() -> Dict[str, float]:
+    """Resident memory of this process in MiB, split into anonymous and file-backed pages (Linux)"""
+    usage = {}
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                usage[key] = int(value.split()[0]) / 1024
+    return usage
+
+def measure(capacity: int, path: Optional[str], vectors: bool, batch_size: int,
+            num_samples: int, chunk: int = 100000) -> Dict:
+    """Fill an SL buffer past capacity, then time sampling; runs in a fresh process"""
+    table = build_info_sets().observations
+    before = memory_usage()
+
+    if vectors:
+        buffer = ReplayBuffer(capacity, transitions=False, path=path)
+    else:
+        buffer = ReplayBuffer(capacity, transitions=False, observation_table=table, path=path)
+
+    # Fill to capacity and keep going so reservoir replacement is exercised
+    start = time.perf_counter()
+    for _ in range(0, capacity * 3 // 2, chunk):
+        ids = np.random.randint(len(table), size=chunk)
+        buffer.add_batch(table[ids] if vectors else ids, np.random.randint(5, size=chunk))
+    fill_seconds = time.perf_counter() - start
+    filled = memory_usage()
+
+    latencies = []
+    for _ in range(num_samples):
+        start = time.perf_counter()
+        buffer.sample(batch_size)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    sampled = memory_usage()
+
+    return {
+        "adds_per_s": capacity * 3 // 2 / fill_seconds,
+        "sample_mean_ms": float(latencies.mean()),
+        "sample_p99_ms": float(np.percentile(latencies, 99)),
+        "rss_anon_mb": sampled["RssAnon"] - before["RssAnon"],
+        "rss_file_mb": sampled["RssFile"] - before["RssFile"],
+        "rss_mb": sampled["VmRSS"] - before["VmRSS"],
+        "rss_after_fill_mb": filled["VmRSS"] - before["VmRSS"]
+    }
+
+def run(capacity: int, vectors: bool, batch_size: int, num_samples: int,
+        directory: Optional[str] = None) -> Dict[str, Dict]:
+    ctx = mp.get_context("spawn")
+    results = {}
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for name, path in (("memory", None), ("disk", os.path.join(tmp, "sl.mmap"))):
+            # A fresh process per variant keeps the RSS numbers independent
+            with ctx.Pool(1) as pool:
+                results[name] = pool.apply(measure, (capacity, path, vectors, batch_size, num_samples))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory vs memory-mapped reservoir buffer: RSS and sample latency")
+    parser.add_argument("--capacity", type=int, default=2000000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--num-samples", type=int, default=2000)
+    parser.add_argument("--vectors", action="store_true", help="store observation vectors instead of info-set ids")
+    parser.add_argument("--dir", help="directory for the buffer file (default: system temp)")
+    args = parser.parse_args()
+
+    results = run(args.capacity, args.vectors, args.batch_size, args.num_samples, args.dir)
+    for name, stats in results.items():
+        print(name + ": " + ", ".join(f"{key}={value:,.2f}" for key, value in stats.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import time
+import yaml
+from typing import Dict
+from ..environments.leduc_poker import LeducPoker
+from ..schedule import UpdateSchedule
+from ..train import train_episode
+from .suite import bench_agent
+
+async def run_training(config: Dict, episodes: int, explain_every: int, blocking: bool) -> Dict[str, float]:
+    """Train for `episodes` with an explanation every `explain_every` episodes"""
+    agent = bench_agent(config, llm={"enabled": True})
+    env = LeducPoker(max_raises=config["game"]["max_raises"])
+    schedule = UpdateSchedule(config)
+
+    start = time.perf_counter()
+    waited = 0.0
+    for episode in range(episodes):
+        await train_episode(agent, env, schedule, config["training"]["epsilon"])
+        if episode % explain_every == 0:
+            state, _ = env.reset()
+            requested = time.perf_counter()
+            if blocking:
+                await agent.explain_strategy(state)
+            else:
+                agent.request_explanation(state)
+            waited += time.perf_counter() - requested
+
+    stats = {
+        "seconds": time.perf_counter() - start,
+        "waited_on_llm": waited,
+        **agent.explainer.stats
+    }
+    agent.explainer.close()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Training-loop latency impact of LLM strategy explanations")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--episodes", type=int, default=2000)
+    parser.add_argument("--explain-every", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    config["llm"]["backend"] = "stub"
+    config["llm"]["stub_latency"] = args.latency
+    config["training"]["sl_buffer_size"] = config["training"]["rl_buffer_size"]
+
+    for blocking in (True, False):
+        stats = asyncio.run(run_training(config, args.episodes, args.explain_every, blocking))
+        mode = "blocking" if blocking else "background"
+        print(f"{mode:>10}: " + ", ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                                         for key, value in stats.items()))
+
+if __name__ == "__main__":
+    main()
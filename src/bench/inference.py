@@ -0,0 +1,79 @@
+import argparse
+import time
+import numpy as np
+import torch
+import yaml
+from typing import Callable, Dict, List, Tuple
+from ..agents.inference import DTYPES, MODES, FrozenPolicy
+from ..agents.nfsp_agent import build_networks
+from ..environments.leduc_tree import build_info_sets
+
+def time_call(fn: Callable[[], object], calls: int) -> float:
+    """Mean microseconds per call after a short warm-up"""
+    for _ in range(20):
+        fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+def forward_latency(rl_network, sl_network, batch_sizes: List[int], calls: int) -> Dict[int, float]:
+    """Microseconds for one forward pass of both networks per batch size"""
+    latencies = {}
+    with torch.no_grad():
+        for batch_size in batch_sizes:
+            states = torch.rand(batch_size, 14)
+            latencies[batch_size] = time_call(lambda: (rl_network(states), sl_network(states)), calls)
+    return latencies
+
+def run(config: Dict, variants: List[Tuple[str, str]], batch_sizes: List[int], calls: int) -> List[Dict]:
+    torch.manual_seed(0)
+    rl_network, sl_network = build_networks(config)
+    states = torch.tensor(build_info_sets(config["game"]["max_raises"]).observations)
+
+    # What actors ran before: training-mode modules, dropout included
+    results = [{
+        "variant": "eager/train-mode",
+        "export_ms": 0.0,
+        "latency_us": forward_latency(rl_network, sl_network, batch_sizes, calls),
+        "accuracy": None
+    }]
+    for mode, dtype in variants:
+        start = time.perf_counter()
+        policy = FrozenPolicy(rl_network, sl_network, mode, dtype)
+        # torch.compile defers compilation to the first call
+        policy(states[:1], np.zeros(1, dtype=bool))
+        results.append({
+            "variant": f"{mode}/{dtype}",
+            "export_ms": (time.perf_counter() - start) * 1000,
+            "latency_us": forward_latency(policy.rl_network, policy.sl_network, batch_sizes, calls),
+            "accuracy": policy.check_accuracy(rl_network, sl_network, states)
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Actor inference latency and accuracy per export mode and precision")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    parser.add_argument("--modes", nargs="+", default=["eager", "script"], choices=MODES)
+    parser.add_argument("--dtypes", nargs="+", default=list(DTYPES), choices=DTYPES)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    torch.set_num_threads(1)  # as in actor processes
+
+    variants = [(mode, dtype) for mode in args.modes for dtype in args.dtypes]
+    results = run(config, variants, args.batch_sizes, args.calls)
+
+    header = " ".join(f"{f'b={size} us':>10}" for size in args.batch_sizes)
+    print(f"{'variant':<18} {'export ms':>9} {header} {'prob err':>9} {'agree':>6}")
+    for row in results:
+        latencies = " ".join(f"{row['latency_us'][size]:>10.1f}" for size in args.batch_sizes)
+        accuracy = row["accuracy"]
+        error = f"{accuracy['prob_max_error']:>9.2e} {accuracy['policy_agreement']:>6.1%}" if accuracy else f"{'-':>9} {'-':>6}"
+        print(f"{row['variant']:<18} {row['export_ms']:>9.1f} {latencies} {error}")
+
+if __name__ == "__main__":
+    main()
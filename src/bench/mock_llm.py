@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import copy
+import json
+import random
+import re
+import tempfile
+import threading
+import time
+import numpy as np
+import yaml
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from ..agents.batch_explainer import BatchExplainer, ExplanationCache, describe_info_sets, estimate_tokens
+from ..agents.explainer import SYSTEM_PROMPT, make_backend, render_prompt, round_probabilities
+from ..environments.leduc_tree import build_info_sets
+from ..evaluation.head_to_head import policy_table
+
+_ITEM_PATTERN = re.compile(r"^Item (\d+):", re.MULTILINE)
+
+class MockLLMServer:
+    """OpenAI-compatible chat completions endpoint on localhost, for offline throughput tests.
+
+    Each request sleeps `latency` seconds plus `token_latency` per estimated
+    prompt token, then answers every "Item <n>:" line of the prompt (or the
+    prompt as a whole). A `failure_rate` share of requests get a 503
+    instead, to exercise client retries. Requests are served on concurrent
+    threads, like a hosted API.
+    """
+
+    def __init__(self, latency: float = 0.5, token_latency: float = 0.0, failure_rate: float = 0.0,
+                 port: int = 0, seed: int = 0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = self.failures = self.in_flight = self.max_in_flight = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status, response = server.complete(body)
+                data = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def complete(self, body: Dict):
+        """(status, JSON body) for one chat completion request"""
+        prompt = "\n".join(message["content"] for message in body["messages"])
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = self.random.random() < self.failure_rate
+        try:
+            prompt_tokens = estimate_tokens(prompt)
+            time.sleep(self.latency + self.token_latency * prompt_tokens)
+            if fail:
+                with self.lock:
+                    self.failures += 1
+                return 503, {"error": {"message": "mock overload", "type": "server_error"}}
+
+            items = _ITEM_PATTERN.findall(prompt)
+            if items:
+                content = "\n".join(f"Item {n}: Mock analysis of item {n}." for n in items)
+            else:
+                content = "Mock analysis of the strategy."
+            completion_tokens = estimate_tokens(content)
+            return 200, {
+                "id": f"mock-{self.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            }
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def start(self) -> "MockLLMServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+async def sequential(backend, table: np.ndarray, num_states: int) -> Tuple[float, int]:
+    """Seconds and failed requests for one request per info-set, awaited in turn as `explain_strategy` callers do"""
+    start = time.perf_counter()
+    failed = 0
+    for info_set in range(num_states):
+        try:
+            await backend.generate(SYSTEM_PROMPT, render_prompt(round_probabilities(table[info_set])))
+        except Exception:
+            failed += 1
+    return time.perf_counter() - start, failed
+
+def run(config: Dict, server: MockLLMServer, sequential_states: int, concurrency: int, token_budget: int,
+        policy: Optional[str] = None) -> Dict:
+    """Sequential per-state requests vs a cold and a warm batch analysis of every info-set of `policy`.
+
+    Without a `policy` the table is drawn at random, so nearly every
+    distribution is distinct: the worst case for deduplication.
+    """
+    llm_config = copy.deepcopy(config["llm"])
+    llm_config.update(backend="openai", api_base=server.url, model="mock",
+                      batch_concurrency=concurrency, batch_token_budget=token_budget, batch_backoff=0.1)
+    backend = make_backend(llm_config, client_retries=0)
+
+    info_sets = build_info_sets(config["game"]["max_raises"])
+    if policy is None:
+        table = np.random.default_rng(0).dirichlet(np.full(5, 0.5), size=info_sets.num_info_sets)
+    else:
+        table = policy_table(policy, config)
+    descriptions = describe_info_sets(info_sets.observations, info_sets.starting_stack)
+
+    seconds, failed = asyncio.run(sequential(backend, table, sequential_states))
+    results = {"sequential": {
+        "info_sets": sequential_states - failed,
+        "requests": sequential_states,
+        "failed": failed,
+        "seconds": seconds
+    }}
+
+    explainer = BatchExplainer.from_config(backend, llm_config)
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("batch", "batch (cached)"):
+            cache = ExplanationCache(directory, "mock")
+            server.max_in_flight = 0
+            explanations, stats = asyncio.run(explainer.analyse(table, descriptions, cache))
+            results[name] = {
+                "info_sets": len(explanations),
+                "distinct": stats.distinct,
+                "requests": stats.requests,
+                "retries": stats.retries,
+                "failed": stats.failed_requests,
+                "missing": stats.missing,
+                "max_in_flight": server.max_in_flight,
+                "seconds": stats.seconds
+            }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a mock OpenAI-compatible LLM, or benchmark batch strategy analysis against it"
+    )
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--serve", action="store_true", help="only run the server (set llm.api_base to its URL)")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per request")
+    parser.add_argument("--token-latency", type=float, default=0.0002, help="extra seconds per prompt token")
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--sequential-states", type=int, default=20, help="info-sets explained one request at a time")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--token-budget", type=int, default=4000)
+    parser.add_argument("--policy", help="checkpoint, .npy table or baseline to analyse; default: a random table")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+
+    server = MockLLMServer(args.latency, args.token_latency, args.failure_rate, args.port)
+    if args.serve:
+        print(f"Mock LLM serving at {server.url}")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    with server:
+        results = run(config, server, args.sequential_states, args.concurrency, args.token_budget, args.policy)
+
+    print(f"{'mode':<16} {'info-sets':>9} {'requests':>8} {'seconds':>8} {'info-sets/s':>11}  details")
+    for mode, row in results.items():
+        details = ", ".join(f"{key}={value}" for key, value in row.items()
+                            if key not in ("info_sets", "requests", "seconds"))
+        rate = row["info_sets"] / row["seconds"] if row["seconds"] else float("inf")
+        print(f"{mode:<16} {row['info_sets']:>9} {row['requests']:>8} {row['seconds']:>8.2f} {rate:>11.1f}  {details}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import time
+import numpy as np
+import torch
+import yaml
+from typing import Dict, List, Tuple
+from ..environments.leduc_poker import LeducPoker
+from ..evaluation.exploitability import ExploitabilityEvaluator
+from ..schedule import UpdateSchedule
+from ..seeding import int_seed
+from ..train import train_episode
+from .suite import bench_agent
+
+def train_for(config: Dict, seconds: float, eval_every: float, seed: int,
+              prioritized: bool) -> List[Tuple[float, int, float]]:
+    """Train serially for `seconds` of wall-clock time; (seconds, episodes, exploitability) per checkpoint.
+
+    Evaluation time is excluded from the clock.
+    """
+    torch.manual_seed(int_seed(seed, "learner"))
+    agent = bench_agent(config, training={"seed": seed, "prioritized_replay": prioritized})
+    config = agent.config
+    env = LeducPoker(max_raises=config["game"]["max_raises"])
+    env.reset(seed=int_seed(seed, "env"))
+    schedule = UpdateSchedule(config)
+    evaluator = ExploitabilityEvaluator(config["game"]["max_raises"])
+    epsilon = config["training"]["epsilon"]
+
+    async def play(until: float) -> int:
+        episodes = 0
+        while time.perf_counter() < until:
+            await train_episode(agent, env, schedule, epsilon)
+            episodes += 1
+        return episodes
+
+    curve = []
+    elapsed, episodes = 0.0, 0
+    while elapsed < seconds:
+        start = time.perf_counter()
+        episodes += asyncio.run(play(start + min(eval_every, seconds - elapsed)))
+        elapsed += time.perf_counter() - start
+        exploitability = evaluator.evaluate(evaluator.info_set_policy(agent.policy_cache.table())).exploitability
+        curve.append((elapsed, episodes, exploitability))
+    return curve
+
+def run(config: Dict, seconds: float, eval_every: float, seeds: List[int]) -> Dict[str, List]:
+    """Exploitability curves per sampling mode, one per seed"""
+    curves = {}
+    for name, prioritized in (("uniform", False), ("prioritized", True)):
+        curves[name] = [train_for(config, seconds, eval_every, seed, prioritized) for seed in seeds]
+    return curves
+
+def main():
+    parser = argparse.ArgumentParser(description="Exploitability per wall-clock second: uniform vs prioritized RL replay")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--seconds", type=float, default=120.0, help="training time per run")
+    parser.add_argument("--eval-every", type=float, default=10.0, help="seconds between exploitability measurements")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--buffer-size", type=int, default=200000, help="RL and SL buffer capacity")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    config["training"]["rl_buffer_size"] = args.buffer_size
+    config["training"]["sl_buffer_size"] = args.buffer_size
+
+    curves = run(config, args.seconds, args.eval_every, args.seeds)
+
+    # Runs with different seeds are aligned by measurement, which falls at the same clock time
+    print(f"{'seconds':>8} " + " ".join(f"{name + ' episodes':>20} {name + ' expl.':>18}" for name in curves))
+    for row in range(min(len(curve) for runs in curves.values() for curve in runs)):
+        cells = []
+        for runs in curves.values():
+            points = [curve[row] for curve in runs]
+            cells.append(f"{np.mean([p[1] for p in points]):>20,.0f} {np.mean([p[2] for p in points]):>18.4f}")
+        seconds = np.mean([curve[row][0] for runs in curves.values() for curve in runs])
+        print(f"{seconds:>8.1f} " + " ".join(cells))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import random
+import time
+import tracemalloc
+import numpy as np
+import torch
+from typing import Dict, List
+from ..agents.replay_buffer import ReplayBuffer
+from ..environments.leduc_tree import build_info_sets
+
+class ListReplayBuffer:
+    """The original list-of-tuples buffer, kept as a benchmark baseline"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.data: List = []
+        self.count = 0
+
+    def add(self, experience):
+        if len(self.data) < self.capacity:
+            self.data.append(experience)
+        else:
+            idx = np.random.randint(self.count + 1)
+            if idx < self.capacity:
+                self.data[idx] = experience
+        self.count += 1
+
+    def sample(self, batch_size: int):
+        states, actions, rewards, next_states, dones = zip(*random.sample(self.data, batch_size))
+        return (
+            torch.FloatTensor(np.array(states)),
+            torch.LongTensor(actions),
+            torch.FloatTensor(rewards),
+            torch.FloatTensor(np.array(next_states)),
+            torch.FloatTensor(dones)
+        )
+
+def _experiences(n: int, state_dim: int):
+    states = np.random.random((n, state_dim))
+    actions = np.random.randint(5, size=n)
+    rewards = np.random.random(n)
+    dones = np.random.random(n) < 0.3
+    return [
+        (states[i], int(actions[i]), float(rewards[i]), states[(i + 1) % n], bool(dones[i]))
+        for i in range(n)
+    ]
+
+def buffer_memory(make_buffer, n: int, state_dim: int) -> float:
+    """Traced MiB held by a new buffer after adding `n` freshly allocated experiences"""
+    tracemalloc.start()
+    buffer = make_buffer()
+    for i in range(n):
+        # Fresh arrays per step, as the environment produces them
+        state = np.random.random(state_dim)
+        buffer.add((state, i % 5, 0.5, np.random.random(state_dim), False))
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory / 2**20
+
+def bench_buffer(buffer, experiences, batch_size: int, num_samples: int) -> Dict[str, float]:
+    """Measure add throughput and sample-to-tensor throughput of one buffer"""
+    start = time.perf_counter()
+    for experience in experiences:
+        buffer.add(experience)
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(num_samples):
+        buffer.sample(batch_size)
+    sample_time = time.perf_counter() - start
+
+    return {
+        "adds_per_s": len(experiences) / add_time,
+        "samples_per_s": num_samples / sample_time
+    }
+
+def run(capacity: int = 200000, state_dim: int = 14, batch_size: int = 128,
+        num_samples: int = 1000) -> Dict[str, Dict[str, float]]:
+    experiences = _experiences(capacity, state_dim)
+    results = {
+        "list": bench_buffer(ListReplayBuffer(capacity), experiences, batch_size, num_samples),
+        "columnar": bench_buffer(ReplayBuffer(capacity, state_dim), experiences, batch_size, num_samples)
+    }
+    results["list"]["memory_mb"] = buffer_memory(
+        lambda: ListReplayBuffer(capacity), capacity, state_dim
+    )
+    results["columnar"]["memory_mb"] = buffer_memory(
+        lambda: ReplayBuffer(capacity, state_dim), capacity, state_dim
+    )
+
+    # Batched insertion is only available on the columnar buffer
+    buffer = ReplayBuffer(capacity, state_dim)
+    columns = [np.array(column) for column in zip(*experiences)]
+    start = time.perf_counter()
+    buffer.add_batch(*columns)
+    results["columnar"]["batch_adds_per_s"] = capacity / (time.perf_counter() - start)
+
+    # Info-set ids instead of observation vectors, gathered from the table on sampling
+    table = build_info_sets().observations
+    buffer = ReplayBuffer(capacity, state_dim, observation_table=table)
+    ids = np.random.randint(len(table), size=capacity)
+    buffer.add_batch(ids, columns[1], columns[2], np.roll(ids, -1), columns[4])
+    start = time.perf_counter()
+    for _ in range(num_samples):
+        buffer.sample(batch_size)
+    results["info_set_ids"] = {
+        "samples_per_s": num_samples / (time.perf_counter() - start),
+        "memory_mb": buffer.nbytes / 2**20
+    }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay buffer memory/throughput benchmark")
+    parser.add_argument("--capacity", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--num-samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = run(args.capacity, batch_size=args.batch_size, num_samples=args.num_samples)
+    for name, stats in results.items():
+        print(name + ": " + ", ".join(f"{key}={value:,.2f}" for key, value in stats.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import copy
+import numpy as np
+import torch
+import yaml
+from typing import Dict, List
+from ..agents.nfsp_agent import build_networks
+from ..agents.snapshot_pool import SnapshotPool
+from .inference import time_call
+
+def run(config: Dict, hidden_sizes: List[int], capacity: int, batch_size: int, calls: int) -> List[Dict]:
+    """Memory per snapshot, snapshot and swap latency, and acting cost per hidden size"""
+    rng = np.random.default_rng(0)
+    results = []
+    for hidden_dim in hidden_sizes:
+        config = copy.deepcopy(config)
+        config["model"]["hidden_dim"] = hidden_dim
+        _, network = build_networks(config)
+        pool = SnapshotPool(network, capacity)
+        for episode in range(capacity):
+            pool.add(network, episode)
+        states = torch.rand(batch_size, 14)
+        slot = int(pool.sample(rng)[0])
+
+        # A copying pool would load each drawn opponent into a module of its own
+        opponent = copy.deepcopy(network).eval()
+        state_dict = {name: tensor.clone() for name, tensor in pool.parameters(slot).items()}
+
+        results.append({
+            "hidden_dim": hidden_dim,
+            "snapshot_kb": pool.snapshot_nbytes / 1024,
+            "pool_kb": pool.weights.nbytes / 1024,
+            "add_us": time_call(lambda: pool.add(network, 0), calls),
+            "swap_us": time_call(lambda: pool.parameters(int(pool.sample(rng)[0])), calls),
+            "copy_swap_us": time_call(lambda: opponent.load_state_dict(state_dict), calls),
+            "act_us": time_call(lambda: pool.act(slot, states), calls)
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Opponent snapshot pool: memory per snapshot and swap latency")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--hidden-sizes", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--capacity", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=64, help="states per opponent forward pass")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    torch.set_num_threads(1)  # as in actor processes
+
+    results = run(config, args.hidden_sizes, args.capacity, args.batch_size, args.calls)
+    print(f"{'hidden':>6} {'snapshot KB':>11} {'pool KB':>9} {'add us':>8} {'swap us':>8} "
+          f"{'copy swap us':>12} {f'act b={args.batch_size} us':>13}")
+    for row in results:
+        print(f"{row['hidden_dim']:>6} {row['snapshot_kb']:>11.1f} {row['pool_kb']:>9.1f} {row['add_us']:>8.1f} "
+              f"{row['swap_us']:>8.1f} {row['copy_swap_us']:>12.1f} {row['act_us']:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import subprocess
+import sys
+from typing import Dict
+
+# Packages headless training and evaluation should never load
+OPTIONAL_PACKAGES = ("langchain", "langchain_core", "langchain_community", "openai", "streamlit", "plotly", "pandas")
+
+def import_profile(module: str) -> Dict:
+    """Import `module` in a fresh interpreter under `-X importtime` and summarize the report"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | imported package",
+    # with nested imports indented under the package that triggered them
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(cumulative_us)))
+
+    top_level = [(name, cumulative) for name, depth, cumulative in rows if depth == 0]
+    direct = [(name, cumulative) for name, depth, cumulative in rows if depth == 1]
+    loaded = {name.split(".")[0] for name, _, _ in rows}
+    return {
+        "module": module,
+        "total_ms": sum(cumulative for _, cumulative in top_level) / 1000,
+        # Direct imports of the profiled module, slowest first
+        "slowest": sorted(((name, cumulative / 1000) for name, cumulative in direct), key=lambda row: -row[1]),
+        "optional_loaded": sorted(loaded.intersection(OPTIONAL_PACKAGES))
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup import-time report (python -X importtime)")
+    parser.add_argument("modules", nargs="*", default=["src.train", "src.agents.nfsp_agent"])
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        profile = import_profile(module)
+        print(f"{profile['module']}: {profile['total_ms']:.0f} ms, "
+              f"optional packages loaded: {', '.join(profile['optional_loaded']) or 'none'}")
+        for name, ms in profile["slowest"][:args.top]:
+            print(f"  {ms:8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import asyncio
+import copy
+import time
+import numpy as np
+import torch
+from typing import Callable, Dict, List, Tuple
+from ..agents.nfsp_agent import NFSPAgent
+from ..environments.hand_evaluator import load_evaluator
+from ..environments.leduc_poker import LeducPoker
+from ..environments.limit_holdem import LimitHoldem
+from ..environments.vector_holdem import VectorLimitHoldem
+from ..environments.vector_leduc import VectorLeducPoker
+from ..schedule import UpdateSchedule
+from ..train import train_episode
+
+# Each metric is {"value": float, "unit": str, "higher_is_better": bool}
+Metrics = Dict[str, Dict]
+
+def _metric(value: float, unit: str, higher_is_better: bool) -> Dict:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+def calls_per_second(fn: Callable[[], object], min_seconds: float) -> float:
+    """Call `fn` repeatedly for at least `min_seconds` (after a short warm-up) and return calls/s"""
+    for _ in range(3):
+        fn()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls / elapsed
+
+def bench_agent(config: Dict, **overrides: Dict) -> NFSPAgent:
+    """A fresh agent on a copy of `config` with LLM explanations and checkpoint resume off.
+
+    Each keyword names a config section and the values to override in it,
+    e.g. `model={"hidden_dim": 64}`; the agent's `config` is the copy.
+    """
+    config = copy.deepcopy(config)
+    config["llm"]["enabled"] = False
+    config["checkpoint"]["resume"] = False
+    for section, values in overrides.items():
+        config[section].update(values)
+    return NFSPAgent(config)
+
+def _buffers(size: int) -> Dict:
+    return {"rl_buffer_size": size, "sl_buffer_size": size}
+
+def bench_env(config: Dict, min_seconds: float) -> Metrics:
+    """LeducPoker reset and step throughput under uniformly random actions"""
+    env = LeducPoker(max_raises=config["game"]["max_raises"])
+    actions = np.random.randint(5, size=4096).tolist()
+    position = [0]
+
+    def step():
+        position[0] = (position[0] + 1) % len(actions)
+        if env.step(actions[position[0]])[2]:
+            env.reset()
+
+    return {
+        "env.reset": _metric(calls_per_second(env.reset, min_seconds), "ops/s", True),
+        "env.step": _metric(calls_per_second(step, min_seconds), "ops/s", True)
+    }
+
+def bench_hand_evaluator(batch_sizes: List[int], min_seconds: float) -> Metrics:
+    """Hold'em showdown evaluations/s, one hand at a time and batched over seven-card hands"""
+    evaluator = load_evaluator()
+    cards = np.random.random((max(batch_sizes), 52)).argsort(axis=1)[:, :7]
+    hand = cards[0].tolist()
+
+    rate = calls_per_second(lambda: evaluator.evaluate(hand), min_seconds)
+    metrics = {"hand_eval.single": _metric(rate, "evals/s", True)}
+    for batch_size in batch_sizes:
+        batch = cards[:batch_size]
+        rate = calls_per_second(lambda: evaluator.evaluate_batch(batch), min_seconds)
+        metrics[f"hand_eval.batch_{batch_size}"] = _metric(rate * batch_size, "evals/s", True)
+    return metrics
+
+def bench_vector_envs(config: Dict, num_envs: int, min_seconds: float) -> Metrics:
+    """Game steps/s of the scalar Hold'em env and of both vectorized envs under random non-fold actions"""
+    holdem = LimitHoldem()
+    actions = np.random.randint(1, 5, size=4096).tolist()
+    position = [0]
+
+    def step():
+        position[0] = (position[0] + 1) % len(actions)
+        if holdem.step(actions[position[0]])[2]:
+            holdem.reset()
+
+    metrics = {"holdem.env.step": _metric(calls_per_second(step, min_seconds), "ops/s", True)}
+    batch = np.random.randint(1, 5, size=num_envs)
+    for name, env in (("holdem", VectorLimitHoldem(num_envs)),
+                      ("leduc", VectorLeducPoker(num_envs, max_raises=config["game"]["max_raises"]))):
+        rate = calls_per_second(lambda: env.step(batch), min_seconds)
+        metrics[f"{name}.vector_env.step"] = _metric(rate * num_envs, "steps/s", True)
+    return metrics
+
+def bench_act(config: Dict, batch_sizes: List[int], min_seconds: float) -> Metrics:
+    """Action selection latency for batches of states, and of the single-state `get_action`"""
+    agent = bench_agent(config, training=_buffers(1))
+    observations = agent.info_sets.observations
+    metrics = {}
+    for batch_size in batch_sizes:
+        states = observations[np.random.randint(len(observations), size=batch_size)].copy()
+        rate = calls_per_second(lambda: agent.act(states), min_seconds)
+        metrics[f"agent.act.batch_{batch_size}"] = _metric(1000 / rate, "ms", False)
+
+    state = observations[0].copy()
+    rate = calls_per_second(lambda: asyncio.run(agent.get_action(state)), min_seconds)
+    metrics["agent.get_action"] = _metric(1000 / rate, "ms", False)
+    return metrics
+
+def bench_update(config: Dict, batch_sizes: List[int], hidden_sizes: List[int], steps: int) -> Metrics:
+    """Milliseconds per `NFSPAgent.update` gradient step"""
+    # Imported here: update.py builds its agents with `bench_agent`
+    from .update import time_update
+
+    metrics = {}
+    for hidden_dim in hidden_sizes:
+        agent = bench_agent(config, model={"hidden_dim": hidden_dim}, training=_buffers(1))
+        for batch_size in batch_sizes:
+            ms = time_update(NFSPAgent.update, agent, batch_size, steps)
+            metrics[f"agent.update.hidden_{hidden_dim}.batch_{batch_size}"] = _metric(ms, "ms", False)
+    return metrics
+
+def bench_buffer(config: Dict, capacity: int, min_seconds: float) -> Metrics:
+    """Replay buffer add, batched add and sample throughput, as the agent configures it"""
+    agent = bench_agent(config, training=_buffers(capacity))
+    buffer = agent.rl_buffer
+    num_info_sets = agent.info_sets.num_info_sets
+    batch_size = config["training"]["batch_size"]
+
+    states = np.random.randint(num_info_sets, size=capacity)
+    actions = np.random.randint(5, size=capacity)
+    rewards = np.random.randn(capacity).astype(np.float32)
+    dones = np.random.random(capacity) < 0.3
+    experiences = list(zip(states.tolist(), actions.tolist(), rewards.tolist(), states.tolist(), dones.tolist()))
+
+    start = time.perf_counter()
+    for experience in experiences:
+        buffer.add(experience)
+    adds_per_s = capacity / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    buffer.add_batch(states, actions, rewards, states, dones)
+    batch_adds_per_s = capacity / (time.perf_counter() - start)
+
+    return {
+        "buffer.add": _metric(adds_per_s, "items/s", True),
+        "buffer.add_batch": _metric(batch_adds_per_s, "items/s", True),
+        "buffer.sample": _metric(calls_per_second(lambda: buffer.sample(batch_size), min_seconds), "batches/s", True)
+    }
+
+def bench_train_episode(config: Dict, num_episodes: int) -> Metrics:
+    """End-to-end serial `train_episode` throughput, learner updates included"""
+    agent = bench_agent(config, training=_buffers(config["training"]["batch_size"] * 100))
+    env = LeducPoker(max_raises=config["game"]["max_raises"])
+    schedule = UpdateSchedule(config)
+    epsilon = config["training"]["epsilon"]
+
+    async def play():
+        for _ in range(num_episodes):
+            await train_episode(agent, env, schedule, epsilon)
+
+    start = time.perf_counter()
+    asyncio.run(play())
+    elapsed = time.perf_counter() - start
+    return {
+        "train.episodes": _metric(num_episodes / elapsed, "episodes/s", True),
+        "train.env_steps": _metric(schedule.env_steps / elapsed, "steps/s", True)
+    }
+
+def run_suite(config: Dict, quick: bool = False, seed: int = 0) -> Metrics:
+    """Run every benchmark; `quick` shrinks sizes and durations for smoke runs"""
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    config = copy.deepcopy(config)
+    config["training"]["seed"] = seed
+    min_seconds = 0.2 if quick else 1.0
+
+    metrics = {}
+    metrics.update(bench_env(config, min_seconds))
+    metrics.update(bench_hand_evaluator([1, 4096] if quick else [1, 64, 4096, 65536], min_seconds))
+    metrics.update(bench_vector_envs(config, 1024 if quick else 4096, min_seconds))
+    metrics.update(bench_act(config, [1, 64, 4096] if quick else [1, 16, 64, 256, 1024, 4096], min_seconds))
+    metrics.update(bench_update(
+        config,
+        [128] if quick else [32, 128, 512],
+        [config["model"]["hidden_dim"]] if quick else [64, 256, 1024],
+        20 if quick else 200
+    ))
+    metrics.update(bench_buffer(config, 20000 if quick else 200000, min_seconds))
+    metrics.update(bench_train_episode(config, 200 if quick else 2000))
+    return metrics
+
+def compare(metrics: Metrics, baseline: Metrics, tolerance: float) -> List[Tuple[str, float, float, float, bool]]:
+    """Rows of (name, baseline, current, relative change, regressed) for metrics present in both.
+
+    The relative change is signed so that positive is always an improvement;
+    a metric regresses when it is worse than the baseline by more than `tolerance`.
+    """
+    rows = []
+    for name, current in metrics.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["value"], current["value"]
+        change = (after - before) / before
+        if not current["higher_is_better"]:
+            change = -change
+        rows.append((name, before, after, change, change < -tolerance))
+    return rows
@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import torch
+import yaml
+from typing import Dict, List
+from ..environments.leduc_poker import LeducPoker
+from ..schedule import UpdateSchedule
+from ..seeding import int_seed
+from ..train import train_episode
+from .suite import bench_agent
+
+def digest(arrays) -> str:
+    """SHA-256 over the raw bytes of `arrays`, a fingerprint of exact equality"""
+    h = hashlib.sha256()
+    for array in arrays:
+        h.update(array.tobytes())
+    return h.hexdigest()
+
+def record(config: Dict, num_episodes: int, seed: int, every: int = 100) -> Dict:
+    """Train serially from `seed`; episode rewards and periodic fingerprints of the buffers and weights.
+
+    Two runs match only if every deal, action and gradient step matched.
+    """
+    torch.manual_seed(int_seed(seed, "learner"))
+    agent = bench_agent(config, training={"seed": seed})
+    config = agent.config
+    env = LeducPoker(max_raises=config["game"]["max_raises"])
+    env.reset(seed=int_seed(seed, "env"))
+    schedule = UpdateSchedule(config)
+    epsilon = config["training"]["epsilon"]
+
+    rewards, checkpoints = [], []
+
+    async def play():
+        for episode in range(1, num_episodes + 1):
+            rewards.append(float(await train_episode(agent, env, schedule, epsilon)))
+            if episode % every == 0 or episode == num_episodes:
+                checkpoints.append({
+                    "episode": episode,
+                    "buffers": digest(list(agent.rl_buffer.columns.values())
+                                      + list(agent.sl_buffer.columns.values())),
+                    "weights": digest([p.detach().numpy() for network in (agent.rl_network, agent.sl_network)
+                                       for p in network.state_dict().values()])
+                })
+
+    asyncio.run(play())
+    return {"seed": seed, "rewards": rewards, "checkpoints": checkpoints}
+
+def first_divergence(a: Dict, b: Dict) -> List[str]:
+    """Where two recorded trajectories first differ; empty when they are identical"""
+    differences = []
+    for episode, (x, y) in enumerate(zip(a["rewards"], b["rewards"]), 1):
+        if x != y:
+            differences.append(f"reward of episode {episode}: {x} vs {y}")
+            break
+    if len(a["rewards"]) != len(b["rewards"]):
+        differences.append(f"episodes: {len(a['rewards'])} vs {len(b['rewards'])}")
+    for x, y in zip(a["checkpoints"], b["checkpoints"]):
+        for key in ("buffers", "weights"):
+            if x[key] != y[key]:
+                differences.append(f"{key} at episode {x['episode']}")
+        if x != y:
+            break
+    return differences
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record a seeded serial training trajectory, or compare it with an earlier recording"
+    )
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--episodes", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the trajectory as JSON to this path")
+    parser.add_argument("--baseline", help="trajectory JSON to compare against; exits 1 if they differ")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+
+    trajectory = record(config, args.episodes, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(trajectory, f)
+
+    final = trajectory["checkpoints"][-1]
+    print(f"{len(trajectory['rewards'])} episodes, total reward {sum(trajectory['rewards']):.1f}, "
+          f"weights {final['weights'][:16]}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        differences = first_divergence(baseline, trajectory)
+        if differences:
+            print("Trajectories diverge: " + "; ".join(differences))
+            sys.exit(1)
+        print("Trajectories are identical")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import time
+import torch
+import torch.nn as nn
+import yaml
+from typing import Dict, List
+from ..agents.nfsp_agent import NFSPAgent
+from .suite import bench_agent
+
+def legacy_update(agent: NFSPAgent, batch_rl, batch_sl) -> Dict[str, float]:
+    """The previous update: separate passes over both state sets, fresh loss modules, no target network"""
+    states, actions, rewards, next_states, dones = batch_rl[:5]
+    current_q = agent.rl_network(states).gather(1, actions.unsqueeze(1))
+    with torch.no_grad():
+        next_q = agent.rl_network(next_states).max(1)[0]
+        target_q = rewards + (1 - dones) * 0.99 * next_q
+    rl_loss = nn.MSELoss()(current_q.squeeze(), target_q)
+    agent.rl_optimizer.zero_grad()
+    rl_loss.backward()
+    agent.rl_optimizer.step()
+
+    states, actions = batch_sl
+    sl_loss = nn.CrossEntropyLoss()(agent.sl_network(states), actions)
+    agent.sl_optimizer.zero_grad()
+    sl_loss.backward()
+    agent.sl_optimizer.step()
+    return {"rl_loss": rl_loss.item(), "sl_loss": sl_loss.item()}
+
+def random_batches(batch_size: int, prioritized: bool = False):
+    batch_rl = (
+        torch.rand(batch_size, 14),
+        torch.randint(5, (batch_size,)),
+        torch.randn(batch_size),
+        torch.rand(batch_size, 14),
+        (torch.rand(batch_size) < 0.3).float()
+    )
+    if prioritized:
+        # Unit IS weights; every priority update lands on slot 0, which any buffer has
+        batch_rl += (torch.ones(batch_size), torch.zeros(batch_size, dtype=torch.int64))
+    return batch_rl, (torch.rand(batch_size, 14), torch.randint(5, (batch_size,)))
+
+def time_update(update, agent: NFSPAgent, batch_size: int, steps: int) -> float:
+    """Mean milliseconds per gradient step"""
+    batch_rl, batch_sl = random_batches(batch_size, agent.prioritized)
+    for _ in range(10):
+        update(agent, batch_rl, batch_sl)
+    start = time.perf_counter()
+    for _ in range(steps):
+        update(agent, batch_rl, batch_sl)
+    return (time.perf_counter() - start) / steps * 1000
+
+def run(config: Dict, batch_sizes: List[int], hidden_sizes: List[int], steps: int) -> List[Dict]:
+    results = []
+    for hidden_dim in hidden_sizes:
+        agent = bench_agent(config, model={"hidden_dim": hidden_dim},
+                            training={"rl_buffer_size": 1, "sl_buffer_size": 1})
+        for batch_size in batch_sizes:
+            results.append({
+                "hidden_dim": hidden_dim,
+                "batch_size": batch_size,
+                "legacy_ms": time_update(legacy_update, agent, batch_size, steps),
+                "fused_ms": time_update(NFSPAgent.update, agent, batch_size, steps)
+            })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="NFSPAgent.update microbenchmark, before and after fusing")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 128, 512])
+    parser.add_argument("--hidden-sizes", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+
+    print(f"{'hidden':>6} {'batch':>6} {'legacy ms':>10} {'fused ms':>10}")
+    for row in run(config, args.batch_sizes, args.hidden_sizes, args.steps):
+        print(f"{row['hidden_dim']:>6} {row['batch_size']:>6} {row['legacy_ms']:>10.3f} {row['fused_ms']:>10.3f}")
+
+if __name__ == "__main__":
+    main()
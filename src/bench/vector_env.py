@@ -0,0 +1,64 @@
+import argparse
+import time
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import AutoresetMode
+from typing import Dict, List, Optional
+from .suite import calls_per_second
+from .. import environments  # registers the env ids
+
+BACKENDS = ("sync", "async", "native")
+ENV_IDS = {"leduc": "drlsp/LeducPoker-v0", "holdem": "drlsp/LimitHoldem-v0"}
+
+def make_env(game: str, backend: str, num_envs: int, shared_memory: bool = True,
+             context: Optional[str] = None, **kwargs) -> gym.vector.VectorEnv:
+    """`num_envs` copies of a registered game, all resetting finished hands in the same step"""
+    if backend == "native":
+        return gym.make_vec(ENV_IDS[game], num_envs, vectorization_mode="vector_entry_point", **kwargs)
+    vector_kwargs = {"autoreset_mode": AutoresetMode.SAME_STEP}
+    if backend == "async":
+        vector_kwargs.update(shared_memory=shared_memory, context=context)
+    return gym.make_vec(ENV_IDS[game], num_envs, vectorization_mode=backend, vector_kwargs=vector_kwargs, **kwargs)
+
+def run(game: str, backends: List[str], env_counts: List[int], min_seconds: float,
+        shared_memory: bool = True, context: Optional[str] = None) -> Dict[str, Dict[int, Dict[str, float]]]:
+    """Startup seconds and game steps/s per backend and number of envs, under random non-fold actions"""
+    rng = np.random.default_rng(0)
+    results = {}
+    for backend in backends:
+        results[backend] = {}
+        for num_envs in env_counts:
+            start = time.perf_counter()
+            env = make_env(game, backend, num_envs, shared_memory, context)
+            env.reset(seed=0)
+            startup = time.perf_counter() - start
+
+            actions = rng.integers(1, 5, size=num_envs)
+            rate = calls_per_second(lambda: env.step(actions), min_seconds)
+            env.close()
+            results[backend][num_envs] = {"startup_s": startup, "steps_per_s": rate * num_envs}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Vector env throughput: gymnasium sync and async backends vs the native batched env"
+    )
+    parser.add_argument("--game", choices=sorted(ENV_IDS), default="leduc")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--seconds", type=float, default=1.0, help="stepping time per measurement")
+    parser.add_argument("--no-shared-memory", action="store_true",
+                        help="async workers send observations through pipes instead of shared memory")
+    parser.add_argument("--context", help="multiprocessing start method of the async workers")
+    args = parser.parse_args()
+
+    results = run(args.game, args.backends, args.num_envs, args.seconds, not args.no_shared_memory, args.context)
+
+    header = " ".join(f"{f'n={n} steps/s':>16}" for n in args.num_envs)
+    print(f"{'backend':<8} {header} {'startup s':>10}")
+    for backend, rows in results.items():
+        rates = " ".join(f"{rows[n]['steps_per_s']:>16,.0f}" for n in args.num_envs)
+        print(f"{backend:<8} {rates} {max(row['startup_s'] for row in rows.values()):>10.2f}")
+
+if __name__ == "__main__":
+    main()
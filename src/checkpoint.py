@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import numpy as np
+import torch
+from typing import Dict, List, Optional, Tuple
+from .telemetry import telemetry
+
+_CHECKPOINT_PATTERN = re.compile(r"^episode_(\d+)$")
+
+class CheckpointManager:
+    """Writes agent checkpoints on a background thread and prunes old ones.
+
+    Each checkpoint is a directory `episode_<n>` holding `agent.pt` (networks,
+    target network, optimizers) and, optionally, one `.npy` file per replay
+    buffer column plus `buffers.json` with the reservoir counters. The state
+    is snapshotted on the caller's thread, written to a temporary directory
+    by the worker and renamed into place, so a crash never leaves a partial
+    checkpoint behind. After each write only the newest `keep_last`
+    checkpoints and those at multiples of `keep_every` episodes are kept.
+    """
+
+    def __init__(self, directory: str, keep_last: int = 3, keep_every: Optional[int] = None,
+                 save_buffers: bool = True):
+        self.directory = directory
+        self.keep_last = keep_last
+        self.keep_every = keep_every
+        self.save_buffers = save_buffers
+        os.makedirs(directory, exist_ok=True)
+
+        # At most one snapshot waits behind the one being written
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, checkpoint_config: Dict) -> "CheckpointManager":
+        return cls(
+            checkpoint_config["directory"],
+            keep_last=checkpoint_config["keep_last"],
+            keep_every=checkpoint_config["keep_every"],
+            save_buffers=checkpoint_config["save_buffers"]
+        )
+
+    def save(self, agent, episode: int):
+        """Snapshot `agent` now and write it in the background"""
+        with telemetry.phase("checkpoint"):
+            buffers = None
+            if self.save_buffers:
+                buffers = {"rl": agent.rl_buffer.state_dict(), "sl": agent.sl_buffer.state_dict()}
+            self._queue.put((episode, agent.state_dict(), buffers))
+
+    def wait(self):
+        """Block until every queued checkpoint is on disk"""
+        self._queue.join()
+
+    def close(self):
+        self.wait()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        logger = logging.getLogger(__name__)
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+                self._prune()
+            except Exception:
+                logger.exception("Writing checkpoint failed")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, episode: int, agent_state: Dict, buffers: Optional[Dict]):
+        path = os.path.join(self.directory, f"episode_{episode}")
+        tmp = path + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        torch.save(agent_state, os.path.join(tmp, "agent.pt"))
+        if buffers is not None:
+            counters = {}
+            for name, state in buffers.items():
+                counters[name] = {"size": state.pop("size"), "count": state.pop("count")}
+                for column, array in state.items():
+                    np.save(os.path.join(tmp, f"{name}_{column}.npy"), array)
+            with open(os.path.join(tmp, "buffers.json"), "w") as f:
+                json.dump(counters, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+
+    def _prune(self):
+        checkpoints = self.list_checkpoints(self.directory)
+        recent = {episode for episode, _ in checkpoints[-self.keep_last:]} if self.keep_last else set()
+        for episode, path in checkpoints:
+            if episode in recent or (self.keep_every and episode % self.keep_every == 0):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def list_checkpoints(directory: str) -> List[Tuple[int, str]]:
+        """(episode, path) of every complete checkpoint in `directory`, oldest first"""
+        if not os.path.isdir(directory):
+            return []
+        checkpoints = []
+        for name in os.listdir(directory):
+            match = _CHECKPOINT_PATTERN.match(name)
+            if match:
+                checkpoints.append((int(match.group(1)), os.path.join(directory, name)))
+        return sorted(checkpoints)
+
+    @classmethod
+    def find_latest(cls, directory: str) -> Optional[str]:
+        checkpoints = cls.list_checkpoints(directory)
+        return checkpoints[-1][1] if checkpoints else None
+
+    @staticmethod
+    def load(agent, path: str) -> int:
+        """Restore `agent` from checkpoint `path` and return its episode.
+
+        Buffer columns are memory-mapped and copied straight into the
+        agent's preallocated buffers, so no experience is replayed.
+        """
+        agent.load_state_dict(torch.load(os.path.join(path, "agent.pt"), map_location="cpu"))
+
+        counters_path = os.path.join(path, "buffers.json")
+        if os.path.exists(counters_path):
+            with open(counters_path, "r") as f:
+                counters = json.load(f)
+            for name, buffer in (("rl", agent.rl_buffer), ("sl", agent.sl_buffer)):
+                state = dict(counters[name])
+                for column in buffer.columns:
+                    state[column] = np.load(os.path.join(path, f"{name}_{column}.npy"), mmap_mode="r")
+                buffer.load_state_dict(state)
+
+        logging.getLogger(__name__).info(f"Resumed from {path}")
+        return int(_CHECKPOINT_PATTERN.match(os.path.basename(path)).group(1))
@@ -1,203 +1,203 @@
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
-import pandas as pd
 import numpy as np
-from typing import Dict, List
+import time
+import torch
 import yaml
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from src.agents.nfsp_agent import NFSPAgent
-from src.environments.leduc_poker import LeducPoker
+from src.agents.nfsp_agent import build_networks
+from src.agents.policy_cache import PolicyCache
+from src.checkpoint import CheckpointManager
+from src.environments.leduc_tree import build_info_sets
+from src.metrics import MetricsHistory, MetricsReader
+
+CARD_NAMES = ["J♠", "Q♠", "K♠", "J♥", "Q♥", "K♥"]
+ACTION_NAMES = ["Fold", "Call", "Raise 2", "Raise 4", "Raise 6"]
+
+@st.cache_resource
+def load_policy_table(path: str, config_text: str) -> np.ndarray:
+    """Average-strategy probabilities over every info-set for one checkpoint"""
+    config = yaml.safe_load(config_text)
+    _, sl_network = build_networks(config)
+    state = torch.load(os.path.join(path, "agent.pt"), map_location="cpu")
+    sl_network.load_state_dict(state["sl_network"])
+    info_sets = build_info_sets(config["game"]["max_raises"])
+    return PolicyCache(sl_network, torch.tensor(info_sets.observations)).table()
+
+@st.cache_resource
+def load_explainer(config_text: str):
+    from src.agents.explainer import StrategyExplainer, make_backend
+
+    llm_config = yaml.safe_load(config_text)["llm"]
+    return StrategyExplainer(
+        make_backend(llm_config),
+        cache_size=llm_config["cache_size"],
+        quantization=llm_config["probability_quantization"],
+        max_pending=llm_config["max_pending"]
+    )
 
 class NFSPDashboard:
+    """Read-only view of a training run.
+
+    Training runs separately (`python -m src.train`) and appends to the
+    metrics file; each refresh reads only the new records and the charts are
+    drawn from a history bounded by `dashboard.metrics_history`.
+    """
+
     def __init__(self):
         st.set_page_config(page_title="NFSP Agent Dashboard", layout="wide")
         self.load_config()
         self.initialize_state()
         self.render_dashboard()
-    
+
     def load_config(self):
         """Load configuration from config.yaml"""
         with open("config.yaml", "r") as f:
-            self.config = yaml.safe_load(f)
-    
+            self.config_text = f.read()
+        self.config = yaml.safe_load(self.config_text)
+
     def initialize_state(self):
         """Initialize session state variables"""
-        if "metrics" not in st.session_state:
-            st.session_state.metrics = {
-                "rl_loss": [],
-                "sl_loss": [],
-                "exploitability": [],
-                "win_rate": [],
-                "episode_rewards": []
-            }
-        
-        if "agent" not in st.session_state:
-            st.session_state.agent = NFSPAgent(self.config)
-            st.session_state.env = LeducPoker()
-    
+        dashboard = self.config["dashboard"]
+        if "reader" not in st.session_state:
+            st.session_state.reader = MetricsReader(dashboard["metrics_path"])
+            st.session_state.history = MetricsHistory(dashboard["metrics_history"])
+
+        if "info_sets" not in st.session_state:
+            st.session_state.info_sets = build_info_sets(self.config["game"]["max_raises"])
+
     def render_dashboard(self):
         """Render the main dashboard"""
         st.title("Neural Fictitious Self-Play (NFSP) Agent Dashboard")
-        
-        # Sidebar controls
+
         with st.sidebar:
-            st.header("Training Controls")
-            if st.button("Train Episode"):
-                self.train_episode()
-            
-            st.header("Parameters")
-            self.config["training"]["anticipatory_param"] = st.slider(
-                "Anticipatory Parameter",
-                0.0, 1.0,
-                self.config["training"]["anticipatory_param"]
-            )
-        
-        # Main dashboard area
+            st.header("Training Run")
+            st.write(f"Metrics file: `{self.config['dashboard']['metrics_path']}`")
+            st.write(f"Refresh every {self.config['dashboard']['update_interval']} s")
+
+        interval = self.config["dashboard"]["update_interval"]
+        if hasattr(st, "fragment"):
+            # Only the live section reruns on the timer
+            st.fragment(run_every=interval)(self.render_live)()
+        else:
+            self.render_live()
+
+        st.header("Strategy")
+        self.render_strategy_visualization()
+
+        if not hasattr(st, "fragment"):
+            time.sleep(interval)
+            st.rerun()
+
+    def render_live(self):
+        """Pull new metric records and redraw the charts"""
+        history = st.session_state.history
+        history.extend(st.session_state.reader.read())
+
+        latest = history.latest
+        if not latest:
+            st.info("Waiting for training metrics...")
+            return
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Episode", f"{latest['episode']:,}")
+        episodes, exploitability = history.series("exploitability")
+        col2.metric("Exploitability", f"{exploitability[-1]:.4f}" if exploitability else "-")
+        col3.metric("Episodes/s", f"{self.episode_rate(history):,.0f}")
+
         col1, col2 = st.columns(2)
-        
         with col1:
-            self.render_training_metrics()
-        
+            self.render_training_metrics(history)
         with col2:
-            self.render_strategy_visualization()
-        
-        # Game state and explanation
-        st.header("Current Game State")
-        self.render_game_state()
-    
-    def train_episode(self):
-        """Run one training episode"""
-        state, info = st.session_state.env.reset()
-        done = False
-        episode_reward = 0
-        
-        while not done:
-            action = st.session_state.agent.get_action(
-                st.session_state.env.get_state_tensor(state, state.current_player)
-            )
-            next_state, reward, done, info = st.session_state.env.step(state, action)
-            episode_reward += reward
-            
-            # Store experience
-            st.session_state.agent.rl_buffer.add(
-                (state, action, reward, next_state, done)
-            )
-            
-            if len(st.session_state.agent.rl_buffer.data) >= self.config["training"]["batch_size"]:
-                # Update networks
-                batch_rl = np.random.choice(
-                    st.session_state.agent.rl_buffer.data,
-                    self.config["training"]["batch_size"]
-                )
-                batch_sl = np.random.choice(
-                    st.session_state.agent.sl_buffer.data,
-                    self.config["training"]["batch_size"]
-                )
-                
-                losses = st.session_state.agent.update(batch_rl, batch_sl)
-                
-                # Update metrics
-                st.session_state.metrics["rl_loss"].append(losses["rl_loss"])
-                st.session_state.metrics["sl_loss"].append(losses["sl_loss"])
-            
-            state = next_state
-        
-        # Update episode metrics
-        st.session_state.metrics["episode_rewards"].append(episode_reward)
-        
-        # Calculate and update exploitability
-        exploitability = self.calculate_exploitability()
-        st.session_state.metrics["exploitability"].append(exploitability)
-    
-    def render_training_metrics(self):
-        """Render training metrics plots"""
-        st.subheader("Training Metrics")
-        
-        # Loss plots
+            fig_exploit = px.line(x=episodes, y=exploitability, title="Exploitability",
+                                  labels=dict(x="Episode", y="Chips per hand"))
+            st.plotly_chart(fig_exploit, use_container_width=True)
+
+            episodes, win_rate = history.series("win_rate")
+            if win_rate:
+                fig_win = px.line(x=episodes, y=win_rate, title="Win Rate vs Random",
+                                  labels=dict(x="Episode", y="Chips per hand"))
+                st.plotly_chart(fig_win, use_container_width=True)
+
+    def render_training_metrics(self, history: MetricsHistory):
+        """Render training loss and reward plots"""
         fig_loss = go.Figure()
-        fig_loss.add_trace(go.Scatter(
-            y=st.session_state.metrics["rl_loss"],
-            name="RL Loss",
-            line=dict(color="blue")
-        ))
-        fig_loss.add_trace(go.Scatter(
-            y=st.session_state.metrics["sl_loss"],
-            name="SL Loss",
-            line=dict(color="red")
-        ))
-        fig_loss.update_layout(title="Network Losses")
-        st.plotly_chart(fig_loss)
-        
-        # Exploitability plot
-        fig_exploit = px.line(
-            y=st.session_state.metrics["exploitability"],
-            title="Exploitability"
-        )
-        st.plotly_chart(fig_exploit)
-    
+        for key, name, color in (("rl_loss", "RL Loss", "blue"), ("sl_loss", "SL Loss", "red")):
+            episodes, values = history.series(key)
+            fig_loss.add_trace(go.Scatter(x=episodes, y=values, name=name, line=dict(color=color)))
+        fig_loss.update_layout(title="Network Losses", xaxis_title="Episode")
+        st.plotly_chart(fig_loss, use_container_width=True)
+
+        episodes, rewards = history.series("reward")
+        if rewards:
+            fig_reward = px.line(x=episodes, y=rewards, title="Mean Episode Reward",
+                                 labels=dict(x="Episode", y="Reward"))
+            st.plotly_chart(fig_reward, use_container_width=True)
+
+    @staticmethod
+    def episode_rate(history: MetricsHistory) -> float:
+        """Episodes per second between the last two points"""
+        episodes, times = history.series("time")
+        if len(times) < 2 or times[-1] <= times[-2]:
+            return 0.0
+        return (episodes[-1] - episodes[-2]) / (times[-1] - times[-2])
+
     def render_strategy_visualization(self):
-        """Render visualization of current strategy"""
-        st.subheader("Strategy Visualization")
-        
-        # Create sample game states
-        sample_states = self.generate_sample_states()
-        
-        # Get action probabilities for each state
-        action_probs = []
-        for state in sample_states:
-            probs = st.session_state.agent.sl_network(
-                torch.FloatTensor(
-                    st.session_state.env.get_state_tensor(state, state.current_player)
-                )
-            ).softmax(dim=0).detach().numpy()
-            action_probs.append(probs)
-        
-        # Create heatmap
-        fig = px.imshow(
-            action_probs,
-            labels=dict(x="Action", y="State"),
-            title="Action Probabilities Across States"
-        )
-        st.plotly_chart(fig)
-    
-    def render_game_state(self):
-        """Render current game state and strategy explanation"""
-        state, _ = st.session_state.env.reset()
-        
+        """Heatmap of the latest checkpoint's average strategy at the opening decision of a round"""
+        path = CheckpointManager.find_latest(self.config["checkpoint"]["directory"])
+        if path is None:
+            st.info("No checkpoints yet")
+            return
+        table = load_policy_table(path, self.config_text)
+
+        stage = st.radio("Round", ["Pre-flop", "Flop"], horizontal=True)
+        rows = self.opening_info_sets(stage == "Flop")
+        labels = [label for label, _ in rows]
+        ids = np.array([info_set for _, info_set in rows])
+
         col1, col2 = st.columns(2)
-        
         with col1:
-            st.subheader("Game State")
-            st.write(f"Stage: {'Pre-flop' if state.stage == 0 else 'Flop'}")
-            st.write(f"Pot: {state.pot}")
-            st.write(f"Current Player: {state.current_player}")
-            st.write(f"Bets: {state.bets}")
-        
+            fig = px.imshow(
+                table[ids],
+                x=ACTION_NAMES,
+                y=labels,
+                zmin=0, zmax=1,
+                labels=dict(x="Action", y="Hand", color="Probability"),
+                title=f"Average Strategy ({os.path.basename(path)})"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
         with col2:
             st.subheader("Strategy Explanation")
-            explanation = st.session_state.agent.explain_strategy(
-                st.session_state.env.get_state_tensor(state, state.current_player)
-            )
-            st.write(explanation)
-    
-    def calculate_exploitability(self) -> float:
-        """Calculate current strategy exploitability"""
-        # This is a simplified calculation
-        # In practice, you would need to compute best response value
-        # against current average strategy
-        return np.random.random() * np.exp(-len(st.session_state.metrics["episode_rewards"]) / 1000)
-    
-    def generate_sample_states(self) -> List[LeducState]:
-        """Generate sample game states for visualization"""
-        states = []
-        for _ in range(5):
-            state, _ = st.session_state.env.reset()
-            states.append(state)
-        return states
+            choice = st.selectbox("Hand", labels)
+            if not self.config["llm"]["enabled"]:
+                st.write("LLM explanations are disabled in config.yaml")
+            elif st.button("Explain"):
+                info_set = int(ids[labels.index(choice)])
+                future = load_explainer(self.config_text).submit(info_set, table[info_set], force=True)
+                with st.spinner("Asking the LLM..."):
+                    st.write(future.result(timeout=120))
+
+    def opening_info_sets(self, flop: bool):
+        """(label, info-set id) for every hand at the first decision of the pre-flop or flop round"""
+        info_sets = st.session_state.info_sets
+        if not flop:
+            pot = 3  # blinds
+            return [(CARD_NAMES[card], info_sets.ids(card, -1, pot)) for card in range(6)]
+
+        rows = []
+        for community in range(6):
+            # Smallest flop pot: both players checked through pre-flop
+            pots = np.flatnonzero(info_sets.lookup[community + 1, :, (community + 1) % 6] >= 0)
+            for card in range(6):
+                if card != community:
+                    rows.append((f"{CARD_NAMES[card]} | {CARD_NAMES[community]}",
+                                 info_sets.ids(card, community, pots[0])))
+        return rows
 
 if __name__ == "__main__":
     dashboard = NFSPDashboard()
@@ -1 +1,15 @@
+import gymnasium as gym
 
+# gym.make(id) builds the scalar env; gym.make_vec(id, num_envs) batches it with
+# vectorization_mode "sync" or "async" (one subprocess per env, observations in
+# shared memory), or "vector_entry_point" for the native struct-of-arrays env
+gym.register(
+    id="drlsp/LeducPoker-v0",
+    entry_point=f"{__name__}.leduc_poker:LeducPoker",
+    vector_entry_point=f"{__name__}.vector_leduc:VectorLeducPoker"
+)
+gym.register(
+    id="drlsp/LimitHoldem-v0",
+    entry_point=f"{__name__}.limit_holdem:LimitHoldem",
+    vector_entry_point=f"{__name__}.vector_holdem:VectorLimitHoldem"
+)
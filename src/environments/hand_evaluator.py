@@ -0,0 +1,164 @@
+import os
+import numpy as np
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement
+from typing import Optional, Sequence, Tuple
+
+# Cards are 0..51: rank = card // 4 (0 = deuce .. 12 = ace), suit = card % 4
+NUM_RANKS = 13
+PRIMES = np.array([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41], dtype=np.int64)
+DEFAULT_TABLE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "drlsp", "hand_ranks")
+
+# Hand categories, weakest first
+CATEGORIES = (
+    "high card", "pair", "two pair", "three of a kind", "straight",
+    "flush", "full house", "four of a kind", "straight flush"
+)
+
+@dataclass
+class HandEvaluator:
+    """Table-driven strength of the best five-card hand within 5 to 7 cards.
+
+    Strengths are dense integers 0..7461, higher is better, equal for hands
+    that tie. Without a flush a hand's strength depends only on its rank
+    multiset, which the product of one prime per rank identifies uniquely;
+    `products` holds every such product for 5, 6 and 7 cards, sorted, with
+    the strength of the best five-card hand in `values`. Seven cards hold
+    at most one flush and can then hold no full house or quads, so a flush
+    is scored from `flush`, indexed by the 13-bit rank mask of the suited
+    cards.
+    """
+    flush: np.ndarray  # [8192] best flush strength for rank masks with at least 5 bits
+    products: np.ndarray  # [num_multisets] sorted prime products of non-flush rank multisets
+    values: np.ndarray  # [num_multisets] strength of each product
+
+    def evaluate(self, cards: Sequence[int]) -> int:
+        """Strength of the best five-card hand among `cards`"""
+        product = 1
+        suit_masks = [0, 0, 0, 0]
+        suit_counts = [0, 0, 0, 0]
+        for card in cards:
+            rank, suit = card >> 2, card & 3
+            product *= int(PRIMES[rank])
+            suit_masks[suit] |= 1 << rank
+            suit_counts[suit] += 1
+
+        for suit in range(4):
+            if suit_counts[suit] >= 5:
+                return int(self.flush[suit_masks[suit]])
+        return int(self.values[np.searchsorted(self.products, product)])
+
+    def evaluate_batch(self, cards: np.ndarray) -> np.ndarray:
+        """Strengths of a [num_hands, 5..7] card array, one table lookup per hand"""
+        cards = np.asarray(cards, dtype=np.int64)
+        ranks, suits = cards >> 2, cards & 3
+        strengths = self.values[np.searchsorted(self.products, PRIMES[ranks].prod(axis=1))]
+
+        # Cards are distinct, so summing rank bits per suit builds the suit's rank mask
+        bits = np.left_shift(1, ranks)
+        for suit in range(4):
+            suited = suits == suit
+            flush = np.flatnonzero(suited.sum(axis=1) >= 5)
+            if len(flush):
+                masks = np.where(suited[flush], bits[flush], 0).sum(axis=1)
+                strengths[flush] = self.flush[masks]
+        return strengths
+
+    @staticmethod
+    def category(strength: int) -> str:
+        """Name of the hand category a strength belongs to"""
+        return CATEGORIES[int(np.searchsorted(_CATEGORY_STARTS, strength, side="right")) - 1]
+
+def _hand_key(ranks: Sequence[int], flush: bool) -> Tuple:
+    """Sort key of a five-card hand; comparing keys compares hands"""
+    counts = Counter(ranks)
+    groups = sorted(counts.items(), key=lambda item: (item[1], item[0]), reverse=True)
+    ordered = [rank for rank, _ in groups]
+    shape = [count for _, count in groups]
+
+    distinct = sorted(counts, reverse=True)
+    straight = None
+    if len(distinct) == 5:
+        if distinct[0] - distinct[4] == 4:
+            straight = distinct[0]
+        elif distinct == [12, 3, 2, 1, 0]:
+            straight = 3  # wheel: the ace plays low
+
+    if straight is not None and flush:
+        return (8, straight)
+    if shape == [4, 1]:
+        return (7, *ordered)
+    if shape == [3, 2]:
+        return (6, *ordered)
+    if flush:
+        return (5, *distinct)
+    if straight is not None:
+        return (4, straight)
+    if shape == [3, 1, 1]:
+        return (3, *ordered)
+    if shape == [2, 2, 1]:
+        return (2, *ordered)
+    if shape == [2, 1, 1, 1]:
+        return (1, *ordered)
+    return (0, *distinct)
+
+def _rank_multisets(num_cards: int):
+    """Rank multisets of `num_cards` cards from one deck (at most four of a rank)"""
+    for ranks in combinations_with_replacement(range(NUM_RANKS), num_cards):
+        if max(Counter(ranks).values()) <= 4:
+            yield ranks
+
+def _build_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Dense strengths over every distinct five-card hand
+    unsuited = {ranks: _hand_key(ranks, False) for ranks in _rank_multisets(5)}
+    suited = {ranks: _hand_key(ranks, True) for ranks in combinations(range(NUM_RANKS), 5)}
+    keys = sorted(set(unsuited.values()) | set(suited.values()))
+    strength = {key: value for value, key in enumerate(keys)}
+
+    five = {ranks: strength[key] for ranks, key in unsuited.items()}
+    products, values = [], []
+    for num_cards in (5, 6, 7):
+        for ranks in _rank_multisets(num_cards):
+            if num_cards == 5:
+                best = five[ranks]
+            else:
+                best = max(five[subset] for subset in set(combinations(ranks, 5)))
+            products.append(int(np.prod(PRIMES[list(ranks)])))
+            values.append(best)
+
+    flush = np.zeros(1 << NUM_RANKS, dtype=np.uint16)
+    for ranks, key in suited.items():
+        flush[sum(1 << rank for rank in ranks)] = strength[key]
+    # Masks with 6 or 7 suited ranks take their best five-rank subset
+    for num_cards in (6, 7):
+        for ranks in combinations(range(NUM_RANKS), num_cards):
+            mask = sum(1 << rank for rank in ranks)
+            flush[mask] = max(flush[sum(1 << rank for rank in subset)] for subset in combinations(ranks, 5))
+
+    order = np.argsort(products)
+    return (
+        flush,
+        np.array(products, dtype=np.int64)[order],
+        np.array(values, dtype=np.uint16)[order]
+    )
+
+_TABLES = ("flush", "products", "values")
+
+# First strength of each category, for `HandEvaluator.category`
+_CATEGORY_STARTS = np.array([0, 1277, 4137, 4995, 5853, 5863, 7140, 7296, 7452])
+
+@lru_cache(maxsize=None)
+def load_evaluator(directory: Optional[str] = None) -> HandEvaluator:
+    """Load the lookup tables memory-mapped from `directory`, building and saving them on first use"""
+    directory = directory or DEFAULT_TABLE_DIR
+    paths = [os.path.join(directory, f"{name}.npy") for name in _TABLES]
+    if not all(os.path.exists(path) for path in paths):
+        os.makedirs(directory, exist_ok=True)
+        for path, table in zip(paths, _build_tables()):
+            # Write then rename so concurrent loaders never see a partial table
+            tmp = f"{path}.{os.getpid()}.tmp.npy"
+            np.save(tmp, table)
+            os.replace(tmp, path)
+    return HandEvaluator(*(np.load(path, mmap_mode="r") for path in paths))
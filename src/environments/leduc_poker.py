@@ -2,7 +2,8 @@ import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional
+from typing import Any, List, Tuple, Dict, Optional
+from .leduc_tree import build_info_sets
 
 @dataclass
 class GameState:
@@ -13,18 +14,27 @@ class GameState:
     stage: int  # 0: pre-flop, 1: flop
     last_action: Optional[int]
     last_raise: int
+    raises: int = 0  # raises made in the current betting round
+
+def shuffled_decks(rng, num_games: int, num_cards: int) -> np.ndarray:
+    """Draw one shuffled deck per game; cards are dealt from the end of each row"""
+    return rng.random((num_games, num_cards)).argsort(axis=1)
 
 class LeducPoker(gym.Env):
-    def __init__(self):
+    def __init__(self, max_raises: Optional[int] = 2):
         super().__init__()
         
         # Game parameters
+        self.max_raises = max_raises  # raises per round; further raises count as calls
         self.num_players = 2
         self.num_cards = 6  # 2 sets of K, Q, J
         self.small_blind = 1
         self.big_blind = 2
         self.starting_stack = 100
         
+        # With a raise cap every observation is a row of a precomputed table
+        self.info_sets = build_info_sets(max_raises) if max_raises is not None else None
+        
         # Action space: fold (0), call (1), raise (2+)
         self.action_space = spaces.Discrete(5)  # fold, call, raise 2x, 3x, 4x
         
@@ -38,11 +48,11 @@ class LeducPoker(gym.Env):
         
         self.reset()
     
-    def reset(self):
-        """Reset the environment to initial state"""
+    def reset(self, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, Dict]:
+        """Reset the environment to initial state; `seed` reseeds `self.np_random` as in gymnasium"""
+        super().reset(seed=seed)
         # Initialize deck
-        self.deck = list(range(self.num_cards))
-        np.random.shuffle(self.deck)
+        self.deck = shuffled_decks(self.np_random, 1, self.num_cards)[0].tolist()
         
         # Deal cards to players
         self.state = GameState(
@@ -55,10 +65,10 @@ class LeducPoker(gym.Env):
             last_raise=self.big_blind
         )
         
-        return self._get_observation()
+        return self._get_observation(), self._get_info()
     
-    def step(self, action) -> Tuple[np.ndarray, float, bool, Dict]:
-        """Execute one step in the environment"""
+    def step(self, action) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        """Execute one step in the environment; hands always end by fold or showdown, so never truncate"""
         reward = 0
         done = False
         
@@ -78,16 +88,20 @@ class LeducPoker(gym.Env):
                     new_state.stage = 1
                     new_state.current_player = 0
                     new_state.last_action = None
+                    new_state.raises = 0
                 else:
                     # Showdown
                     reward = self._get_reward(new_state)
                     done = True
         
         self.state = new_state
-        return self._get_observation(), reward, done, {}
+        return self._get_observation(), reward, done, False, self._get_info()
     
     def _apply_action(self, state: GameState, action: int) -> GameState:
         """Apply action to current state"""
+        if action >= 2 and self.max_raises is not None and state.raises >= self.max_raises:
+            action = 1  # raise cap reached
+        
         new_state = GameState(
             current_player=(state.current_player + 1) % self.num_players,
             player_hands=state.player_hands.copy(),
@@ -95,7 +109,8 @@ class LeducPoker(gym.Env):
             pot=state.pot,
             stage=state.stage,
             last_action=action,
-            last_raise=state.last_raise
+            last_raise=state.last_raise,
+            raises=state.raises
         )
         
         if action == 1:  # call
@@ -104,6 +119,7 @@ class LeducPoker(gym.Env):
             raise_amount = (action - 1) * self.big_blind
             new_state.pot += raise_amount
             new_state.last_raise = raise_amount
+            new_state.raises += 1
         
         return new_state
     
@@ -139,9 +155,23 @@ class LeducPoker(gym.Env):
         # High card
         return max(player_card % 3, community_card % 3)
     
+    def info_set_id(self) -> int:
+        """Canonical integer id of the current player's observation (requires a raise cap)"""
+        community_card = -1 if self.state.community_card is None else self.state.community_card
+        card = self.state.player_hands[self.state.current_player]
+        return int(self.info_sets.lookup[community_card + 1, self.state.pot, card])
+    
+    def _get_info(self) -> Dict:
+        """Info dict of the current observation: its info-set id, when there is an observation table"""
+        return {} if self.info_sets is None else {"info_set": self.info_set_id()}
+    
     def _get_observation(self) -> np.ndarray:
         """Convert game state to observation vector"""
-        obs = np.zeros(14)
+        if self.info_sets is not None:
+            # Row of the shared observation table, copied: gymnasium callers may keep or modify it
+            return self.info_sets.observations[self.info_set_id()].copy()
+        
+        obs = np.zeros(14, dtype=np.float32)
         
         # Encode player hand
         obs[self.state.player_hands[self.state.current_player]] = 1
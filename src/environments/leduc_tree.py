@@ -0,0 +1,231 @@
+import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import permutations
+from typing import Optional
+
+CHANCE = -2
+TERMINAL = -1
+
+@dataclass
+class LeducGameTree:
+    """The public betting tree of `LeducPoker`, flattened into NumPy arrays.
+
+    Nodes are public states (betting history and community card). Private
+    cards are handled as a second axis over the 30 ordered deals, so any
+    per-node quantity is an array of shape [num_nodes, num_deals] or, for a
+    single player's view, [num_nodes, num_cards]. Parents are always stored
+    before their children.
+    """
+    player: np.ndarray  # acting player, CHANCE or TERMINAL
+    stage: np.ndarray
+    pot: np.ndarray
+    community_card: np.ndarray  # -1 before the flop
+    depth: np.ndarray
+    children: np.ndarray  # [num_nodes, 5] child per action at decision nodes, else -1
+    distinct: np.ndarray  # [num_nodes, 5] False for capped raises that duplicate the call child
+    outcomes: np.ndarray  # [num_nodes, num_cards] child per community card at chance nodes, else -1
+    deals: np.ndarray  # [num_deals, 2] private card of each player
+    chance_reach: np.ndarray  # [num_nodes, num_deals] probability of the deal and community card
+    utility: np.ndarray  # [num_nodes, num_deals] player 0 payoff at terminal nodes, else 0
+    starting_stack: int
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.player)
+
+    @property
+    def decision_nodes(self) -> np.ndarray:
+        return np.flatnonzero(self.player >= 0)
+
+    def observations(self, nodes: np.ndarray) -> np.ndarray:
+        """Observation vectors [len(nodes), num_cards, 14] seen by a player holding each card"""
+        num_cards = self.outcomes.shape[1]
+        obs = np.zeros((len(nodes), num_cards, 14), dtype=np.float32)
+        cards = np.arange(num_cards)
+        obs[:, cards, cards] = 1
+
+        community = self.community_card[nodes]
+        dealt = np.flatnonzero(community >= 0)
+        obs[dealt, :, 6 + community[dealt]] = 1
+
+        obs[..., 12] = (self.pot[nodes] / (self.starting_stack * 2))[:, None]
+        obs[..., 13] = self.stage[nodes][:, None]
+        return obs
+
+def _hand_rank(player_card: int, community_card: int) -> int:
+    # Pair
+    if player_card % 3 == community_card % 3:
+        return 10 + player_card % 3
+
+    # High card
+    return max(player_card % 3, community_card % 3)
+
+@lru_cache(maxsize=None)
+def build_tree(max_raises: Optional[int] = 2) -> LeducGameTree:
+    """Enumerate the Leduc game tree once from `LeducPoker`'s betting rules"""
+    if max_raises is None:
+        raise ValueError("The game tree is only finite with a raise cap")
+
+    num_cards, num_actions = 6, 5
+    small_blind, big_blind, starting_stack = 1, 2, 100
+
+    nodes = []  # (player, stage, pot, community_card, depth)
+    children, outcomes, terminals = [], [], []  # terminals: (node, folder or -1)
+
+    def add_node(player, stage, pot, community_card, depth):
+        nodes.append((player, stage, pot, community_card, depth))
+        children.append([-1] * num_actions)
+        outcomes.append([-1] * num_cards)
+        return len(nodes) - 1
+
+    # Breadth-first expansion; each entry is a decision node and its betting state
+    root = add_node(0, 0, small_blind + big_blind, -1, 0)
+    queue = [(root, (0, 0, small_blind + big_blind, big_blind, 0, -1, 0))]
+    while queue:
+        next_queue = []
+        for node, (player, stage, pot, last_raise, raises, community, depth) in queue:
+            for action in range(num_actions):
+                if action >= 2 and raises >= max_raises:
+                    children[node][action] = children[node][1]
+                    continue
+
+                if action == 0:
+                    child = add_node(TERMINAL, stage, pot, community, depth + 1)
+                    terminals.append((child, player))
+                    children[node][action] = child
+                    continue
+
+                next_pot, next_raise, next_raises = pot, last_raise, raises
+                if action == 1:  # call
+                    next_pot += last_raise
+                else:  # raise
+                    next_raise = (action - 1) * big_blind
+                    next_pot += next_raise
+                    next_raises += 1
+                next_player = 1 - player
+
+                if action == 1 and next_player == 0:
+                    if stage == 0:
+                        # Deal community card and move to next stage
+                        child = add_node(CHANCE, stage, next_pot, -1, depth + 1)
+                        for card in range(num_cards):
+                            flop = add_node(0, 1, next_pot, card, depth + 2)
+                            outcomes[child][card] = flop
+                            next_queue.append((flop, (0, 1, next_pot, next_raise, 0, card, depth + 2)))
+                    else:
+                        # Showdown
+                        child = add_node(TERMINAL, stage, next_pot, community, depth + 1)
+                        terminals.append((child, -1))
+                else:
+                    child = add_node(next_player, stage, next_pot, community, depth + 1)
+                    next_queue.append(
+                        (child, (next_player, stage, next_pot, next_raise, next_raises, community, depth + 1))
+                    )
+                children[node][action] = child
+        queue = next_queue
+
+    player, stage, pot, community_card, depth = (np.array(column) for column in zip(*nodes))
+    children = np.array(children)
+    outcomes = np.array(outcomes)
+    distinct = children >= 0
+    distinct[:, 2:] &= children[:, 2:] != children[:, 1:2]
+
+    # Chance probabilities: uniform deal, then a uniform community card from the rest
+    deals = np.array(list(permutations(range(num_cards), 2)))
+    chance_reach = np.zeros((len(nodes), len(deals)))
+    chance_reach[root] = 1 / len(deals)
+    for node in range(len(nodes)):  # parents are always added before their children
+        if player[node] >= 0:
+            chance_reach[children[node]] = chance_reach[node]
+        elif player[node] == CHANCE:
+            for card, flop in enumerate(outcomes[node]):
+                possible = (deals != card).all(axis=1)
+                chance_reach[flop] = chance_reach[node] * possible / (num_cards - 2)
+
+    # Fold payoffs follow LeducPoker.step: the folding player loses half the pot
+    utility = np.zeros((len(nodes), len(deals)))
+    terminal, folder = (np.array(column) for column in zip(*terminals))
+    fold = folder >= 0
+    utility[terminal[fold]] = (pot[terminal[fold]] / 2 * np.where(folder[fold] == 1, 1, -1))[:, None]
+
+    showdown = terminal[~fold]
+    rank = np.array([[_hand_rank(card, flop) for card in range(num_cards)] for flop in range(num_cards)])
+    community = community_card[showdown][:, None]
+    outcome = np.sign(rank[community, deals[:, 0]] - rank[community, deals[:, 1]])
+    utility[showdown] = outcome * pot[showdown][:, None] / 2
+
+    return LeducGameTree(
+        player=player,
+        stage=stage,
+        pot=pot,
+        community_card=community_card,
+        depth=depth,
+        children=children,
+        distinct=distinct,
+        outcomes=outcomes,
+        deals=deals,
+        chance_reach=chance_reach,
+        utility=utility,
+        starting_stack=starting_stack
+    )
+
+@dataclass
+class InfoSetIndex:
+    """Canonical integer ids for every observation a Leduc player can receive.
+
+    An observation is fully determined by the player's card, the community
+    card and the pot, so ids are looked up from those three integers and
+    index a read-only float32 table of the matching observation vectors.
+    """
+    lookup: np.ndarray  # [num_cards + 1, max_pot + 1, num_cards] id by (community + 1, pot, card), -1 if unreachable
+    observations: np.ndarray  # [num_info_sets, 14]
+    starting_stack: int
+
+    @property
+    def num_info_sets(self) -> int:
+        return len(self.observations)
+
+    def ids(self, cards, community_cards, pots):
+        """Info-set ids for arrays of own cards, community cards (-1 before the flop) and pots"""
+        return self.lookup[np.asarray(community_cards) + 1, pots, cards]
+
+    def observation_ids(self, observations) -> np.ndarray:
+        """Info-set ids of [..., 14] observation vectors as produced by the environments"""
+        observations = np.asarray(observations)
+        num_cards = self.lookup.shape[2]
+        cards = observations[..., :num_cards].argmax(-1)
+        community_cards = np.where(
+            observations[..., -1] > 0, observations[..., num_cards:2 * num_cards].argmax(-1), -1
+        )
+        pots = np.rint(observations[..., -2] * self.starting_stack * 2).astype(int)
+        return self.ids(cards, community_cards, pots)
+
+@lru_cache(maxsize=None)
+def build_info_sets(max_raises: Optional[int] = 2) -> InfoSetIndex:
+    """Index every observation reachable in the game tree, ordered by (community card, pot, card)"""
+    tree = build_tree(max_raises)
+    num_cards = tree.outcomes.shape[1]
+
+    # Decision and terminal nodes are the states the environment can return
+    nodes = np.flatnonzero(tree.player != CHANCE)
+    public = np.unique(np.stack([tree.community_card[nodes], tree.pot[nodes]], axis=1), axis=0)
+    community = np.repeat(public[:, 0], num_cards)
+    pot = np.repeat(public[:, 1], num_cards)
+    card = np.tile(np.arange(num_cards), len(public))
+    possible = card != community
+    community, pot, card = community[possible], pot[possible], card[possible]
+
+    lookup = np.full((num_cards + 1, tree.pot.max() + 1, num_cards), -1)
+    lookup[community + 1, pot, card] = np.arange(len(card))
+
+    observations = np.zeros((len(card), 14), dtype=np.float32)
+    rows = np.arange(len(card))
+    observations[rows, card] = 1
+    dealt = community >= 0
+    observations[rows[dealt], 6 + community[dealt]] = 1
+    observations[:, 12] = pot / (tree.starting_stack * 2)
+    observations[:, 13] = dealt
+    observations.setflags(write=False)
+
+    return InfoSetIndex(lookup=lookup, observations=observations, starting_stack=tree.starting_stack)
@@ -0,0 +1,137 @@
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+from dataclasses import dataclass
+from typing import Any, List, Tuple, Dict, Optional
+from .hand_evaluator import load_evaluator
+from .leduc_poker import shuffled_decks
+
+# Community cards showing in each stage: pre-flop, flop, turn, river
+BOARD_SIZES = (0, 3, 4, 5)
+
+@dataclass
+class HoldemState:
+    current_player: int
+    player_hands: List[List[int]]
+    board: List[int]
+    contributions: List[int]  # chips each player has put in the pot
+    stage: int  # 0: pre-flop, 1: flop, 2: turn, 3: river
+    actions: int = 0  # actions taken in the current betting round
+    raises: int = 0  # raises made in the current betting round
+
+    @property
+    def pot(self) -> int:
+        return sum(self.contributions)
+
+class LimitHoldem(gym.Env):
+    """Heads-up Limit Texas Hold'em with the interface and reward signs of `LeducPoker`.
+
+    Player 0 posts the small blind and acts first in every round. Bets are
+    fixed: one big blind before the turn and two from the turn on, so every
+    raise action (2+) is the same raise. A fold is scored for the folding
+    player, a showdown for player 0, as in `LeducPoker`. Unlike there, a
+    fold costs exactly the chips the folding player has put in, not half
+    the pot, so folding to a raise does not count the raise as lost.
+    """
+
+    def __init__(self, max_raises: Optional[int] = 4, table_dir: Optional[str] = None):
+        super().__init__()
+
+        # Game parameters
+        self.max_raises = max_raises  # raises per round; further raises count as calls
+        self.num_players = 2
+        self.num_cards = 52
+        self.small_blind = 1
+        self.big_blind = 2
+        self.starting_stack = 100
+
+        self.evaluator = load_evaluator(table_dir)
+
+        # Action space: fold (0), call (1), raise (2+)
+        self.action_space = spaces.Discrete(5)
+
+        # Observation space: hole cards (52), board cards (52), pot (1), stage (1)
+        self.observation_space = spaces.Box(
+            low=0,
+            high=1,
+            shape=(106,),
+            dtype=np.float32
+        )
+
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, Dict]:
+        """Reset the environment to initial state; `seed` reseeds `self.np_random` as in gymnasium"""
+        super().reset(seed=seed)
+        self.deck = shuffled_decks(self.np_random, 1, self.num_cards)[0].tolist()
+
+        # Hole cards first, then the five community cards, all dealt from the end
+        player_hands = [[self.deck.pop(), self.deck.pop()] for _ in range(self.num_players)]
+        self.community_cards = [self.deck.pop() for _ in range(BOARD_SIZES[-1])]
+        self.state = HoldemState(
+            current_player=0,
+            player_hands=player_hands,
+            board=[],
+            contributions=[self.small_blind, self.big_blind],
+            stage=0
+        )
+
+        return self._get_observation(), {}
+
+    def step(self, action) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        """Execute one step in the environment; hands always end by fold or showdown, so never truncate"""
+        state = self.state
+        player = state.current_player
+
+        if action == 0:  # fold
+            return self._get_observation(), -state.contributions[player], True, False, {}
+
+        if action >= 2 and self.max_raises is not None and state.raises >= self.max_raises:
+            action = 1  # raise cap reached
+
+        # Call matches the opponent; a raise adds one fixed bet on top
+        contributions = state.contributions
+        contributions[player] = max(contributions)
+        if action >= 2:
+            contributions[player] += self.big_blind * (2 if state.stage >= 2 else 1)
+            state.raises += 1
+        state.actions += 1
+        state.current_player = 1 - player
+
+        # The round ends once both players have acted and the bets are matched
+        if state.actions >= 2 and contributions[0] == contributions[1]:
+            if state.stage == len(BOARD_SIZES) - 1:
+                return self._get_observation(), self._get_reward(state), True, False, {}
+            state.stage += 1
+            state.board = self.community_cards[:BOARD_SIZES[state.stage]]
+            state.current_player = 0
+            state.actions = 0
+            state.raises = 0
+
+        return self._get_observation(), 0, False, False, {}
+
+    def _get_reward(self, state: HoldemState) -> float:
+        """Calculate reward at showdown"""
+        player_0_rank = self.evaluator.evaluate(state.player_hands[0] + state.board)
+        player_1_rank = self.evaluator.evaluate(state.player_hands[1] + state.board)
+
+        if player_0_rank > player_1_rank:
+            return state.pot / 2
+        elif player_0_rank < player_1_rank:
+            return -state.pot / 2
+        else:
+            return 0
+
+    def _get_observation(self) -> np.ndarray:
+        """Convert game state to observation vector"""
+        obs = np.zeros(106, dtype=np.float32)
+
+        # Encode player hand and board
+        obs[self.state.player_hands[self.state.current_player]] = 1
+        obs[[52 + card for card in self.state.board]] = 1
+
+        # Encode pot and stage
+        obs[104] = self.state.pot / (self.starting_stack * 2)
+        obs[105] = self.state.stage / 3
+
+        return obs
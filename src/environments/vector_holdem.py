@@ -0,0 +1,157 @@
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from typing import Any, Dict, Optional, Tuple
+from .hand_evaluator import load_evaluator
+from .leduc_poker import shuffled_decks
+from .limit_holdem import BOARD_SIZES
+
+class VectorLimitHoldem(VectorEnv):
+    """Many Limit Hold'em hands stepped at once, kept in struct-of-arrays form.
+
+    Follows the rules of `LimitHoldem` exactly, including its deal order, and
+    resets finished games in the same step like `VectorLeducPoker`,
+    returning their terminal observations in `info["final_obs"]`. All
+    showdowns of a step are scored with one batched evaluator call.
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs: int, max_raises: Optional[int] = 4, table_dir: Optional[str] = None,
+                 seed: Optional[int] = None):
+        self.num_envs = num_envs
+
+        # Game parameters
+        self.max_raises = max_raises  # raises per round; further raises count as calls
+        self.num_players = 2
+        self.num_cards = 52
+        self.small_blind = 1
+        self.big_blind = 2
+        self.starting_stack = 100
+
+        self.evaluator = load_evaluator(table_dir)
+
+        self.single_action_space = spaces.Discrete(5)
+        self.single_observation_space = spaces.Box(low=0, high=1, shape=(106,), dtype=np.float32)
+        self.action_space = spaces.MultiDiscrete([5] * num_envs)
+        self.observation_space = spaces.Box(low=0, high=1, shape=(num_envs, 106), dtype=np.float32)
+
+        # Per-game state
+        self.decks = np.zeros((num_envs, self.num_cards), dtype=np.int64)
+        self.player_hands = np.zeros((num_envs, self.num_players, 2), dtype=np.int64)
+        self.community_cards = np.zeros((num_envs, BOARD_SIZES[-1]), dtype=np.int64)
+        self.contributions = np.zeros((num_envs, self.num_players), dtype=np.int64)
+        self.stage = np.zeros(num_envs, dtype=np.int64)
+        self.actions = np.zeros(num_envs, dtype=np.int64)
+        self.raises = np.zeros(num_envs, dtype=np.int64)
+        self.current_player = np.zeros(num_envs, dtype=np.int64)
+        self._rows = np.arange(num_envs)
+        self._board_sizes = np.array(BOARD_SIZES)
+        # Hands always end by fold or showdown; one shared read-only array serves every step
+        self._truncations = np.zeros(num_envs, dtype=bool)
+        self._truncations.flags.writeable = False
+
+        self.reset(seed=seed)
+
+    @property
+    def pot(self) -> np.ndarray:
+        return self.contributions.sum(axis=1)
+
+    def reset(self, *, seed: Optional[int] = None,
+              options: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, Dict]:
+        """Reset every game; `seed` reseeds `self.np_random` and `options["decks"]` deals given [num_envs, 52] decks"""
+        super().reset(seed=seed)
+        self._reset_games(self._rows, None if options is None else options.get("decks"))
+        return self._get_observation(), {}
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """Apply one action per game; finished games are reset before returning"""
+        actions = np.asarray(actions, dtype=np.int64)
+        if self.max_raises is not None:
+            # Raise cap reached: raises count as calls
+            actions = np.where((actions >= 2) & (self.raises >= self.max_raises), 1, actions)
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        player = self.current_player.copy()
+
+        # Fold: acting player loses their contribution to the pot
+        fold = actions == 0
+        rewards[fold] = -self.contributions[self._rows, player][fold]
+
+        # Call matches the opponent; a raise adds one fixed bet on top
+        bet = ~fold
+        raised = bet & (actions >= 2)
+        bet_size = np.where(self.stage >= 2, 2 * self.big_blind, self.big_blind)
+        matched = self.contributions.max(axis=1)
+        self.contributions[self._rows[bet], player[bet]] = matched[bet] + np.where(raised, bet_size, 0)[bet]
+        self.raises[raised] += 1
+        self.actions[bet] += 1
+        self.current_player[bet] = 1 - player[bet]
+
+        # The round ends once both players have acted and the bets are matched
+        round_over = bet & (self.actions >= 2) & (self.contributions[:, 0] == self.contributions[:, 1])
+        showdown = round_over & (self.stage == len(BOARD_SIZES) - 1)
+        advance = round_over & ~showdown
+        self.stage[advance] += 1
+        self.current_player[advance] = 0
+        self.actions[advance] = 0
+        self.raises[advance] = 0
+
+        rewards[showdown] = self._get_reward(showdown)
+
+        dones = fold | showdown
+        finished = np.flatnonzero(dones)
+        info = {"player": player, "_final_obs": dones}
+
+        observations = self._get_observation()
+        info["final_obs"] = observations.copy()
+        if len(finished):
+            self._reset_games(finished)
+            observations[finished] = self._get_observation(finished)
+
+        return observations, rewards, dones, self._truncations, info
+
+    def _reset_games(self, games: np.ndarray, decks: Optional[np.ndarray] = None):
+        """Deal fresh hands to `games`, drawing their decks in index order unless `decks` is given"""
+        self.decks[games] = shuffled_decks(self.np_random, len(games), self.num_cards) if decks is None else decks
+        # Same order as `LimitHoldem.reset`: each player's two cards, then the board
+        dealt = self.decks[games, ::-1]
+        self.player_hands[games] = dealt[:, :4].reshape(-1, self.num_players, 2)
+        self.community_cards[games] = dealt[:, 4:4 + BOARD_SIZES[-1]]
+        self.contributions[games] = [self.small_blind, self.big_blind]
+        self.stage[games] = 0
+        self.actions[games] = 0
+        self.raises[games] = 0
+        self.current_player[games] = 0
+
+    def _get_reward(self, games: np.ndarray) -> np.ndarray:
+        """Player 0's showdown reward for the games selected by mask `games`"""
+        board = self.community_cards[games]
+        hands = self.player_hands[games]
+        strengths = self.evaluator.evaluate_batch(np.concatenate([
+            np.concatenate([hands[:, 0], board], axis=1),
+            np.concatenate([hands[:, 1], board], axis=1)
+        ])).astype(np.int64)
+        player_0_rank, player_1_rank = np.split(strengths, 2)
+        return np.sign(player_0_rank - player_1_rank) * self.pot[games] / 2
+
+    def _get_observation(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """Convert the state of `games` (default: every game) to observation vectors"""
+        games = self._rows if games is None else games
+        rows = np.arange(len(games))
+        obs = np.zeros((len(games), 106), dtype=np.float32)
+
+        # Encode player hands
+        hands = self.player_hands[games, self.current_player[games]]
+        obs[rows[:, None], hands] = 1
+
+        # Encode the board cards showing in each game's stage
+        stage = self.stage[games]
+        showing = np.arange(BOARD_SIZES[-1]) < self._board_sizes[stage][:, None]
+        board_rows, slots = np.nonzero(showing)
+        obs[board_rows, 52 + self.community_cards[games[board_rows], slots]] = 1
+
+        # Encode pot and stage
+        obs[:, 104] = self.contributions[games].sum(axis=1) / (self.starting_stack * 2)
+        obs[:, 105] = stage / 3
+
+        return obs
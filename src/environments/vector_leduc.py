@@ -0,0 +1,183 @@
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from typing import Any, Dict, Optional, Tuple
+from .leduc_poker import shuffled_decks
+from .leduc_tree import build_info_sets
+
+class VectorLeducPoker(VectorEnv):
+    """Many Leduc hands stepped at once, kept in struct-of-arrays form.
+
+    Follows the rules of `LeducPoker` exactly: under the same seed, game `i`
+    sees the same deals, observations, rewards and terminations as a
+    sequence of scalar hands. Finished games are reset in the same step
+    (gymnasium's same-step autoreset), in index order, and their terminal
+    observations are returned in `info["final_obs"]`, masked by
+    `info["_final_obs"]`. With a raise cap, `info` also carries the
+    canonical info-set ids of the returned and terminal observations as
+    `"info_set"` and `"final_info_set"`, which index
+    `self.info_sets.observations`.
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs: int, max_raises: Optional[int] = 2, seed: Optional[int] = None):
+        self.num_envs = num_envs
+
+        # Game parameters
+        self.max_raises = max_raises  # raises per round; further raises count as calls
+        self.num_players = 2
+        self.num_cards = 6  # 2 sets of K, Q, J
+        self.small_blind = 1
+        self.big_blind = 2
+        self.starting_stack = 100
+
+        # With a raise cap every observation is a row of a precomputed table
+        self.info_sets = build_info_sets(max_raises) if max_raises is not None else None
+
+        self.single_action_space = spaces.Discrete(5)
+        self.single_observation_space = spaces.Box(low=0, high=1, shape=(14,), dtype=np.float32)
+        self.action_space = spaces.MultiDiscrete([5] * num_envs)
+        self.observation_space = spaces.Box(low=0, high=1, shape=(num_envs, 14), dtype=np.float32)
+
+        # Per-game state; -1 stands for None in the scalar environment
+        self.decks = np.zeros((num_envs, self.num_cards), dtype=np.int64)
+        self.player_hands = np.zeros((num_envs, self.num_players), dtype=np.int64)
+        self.community_card = np.full(num_envs, -1, dtype=np.int64)
+        self.pot = np.zeros(num_envs, dtype=np.int64)
+        self.stage = np.zeros(num_envs, dtype=np.int64)
+        self.last_action = np.full(num_envs, -1, dtype=np.int64)
+        self.last_raise = np.zeros(num_envs, dtype=np.int64)
+        self.raises = np.zeros(num_envs, dtype=np.int64)
+        self.current_player = np.zeros(num_envs, dtype=np.int64)
+        self._rows = np.arange(num_envs)
+        # Hands always end by fold or showdown; one shared read-only array serves every step
+        self._truncations = np.zeros(num_envs, dtype=bool)
+        self._truncations.flags.writeable = False
+
+        self.reset(seed=seed)
+
+    def reset(self, *, seed: Optional[int] = None,
+              options: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, Dict]:
+        """Reset every game; `seed` reseeds `self.np_random` and `options["decks"]` deals given [num_envs, num_cards] decks"""
+        super().reset(seed=seed)
+        self._reset_games(self._rows, None if options is None else options.get("decks"))
+        info = {} if self.info_sets is None else {"info_set": self.info_set_ids()}
+        return self._get_observation(), info
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """Apply one action per game; finished games are reset before returning"""
+        actions = np.asarray(actions, dtype=np.int64)
+        if self.max_raises is not None:
+            # Raise cap reached: raises count as calls
+            actions = np.where((actions >= 2) & (self.raises >= self.max_raises), 1, actions)
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        player = self.current_player.copy()
+
+        # Fold: acting player loses their contribution to the pot
+        fold = actions == 0
+        rewards[fold] = -self.pot[fold] / 2
+
+        # Call or raise
+        bet = ~fold
+        call = bet & (actions == 1)
+        raised = bet & (actions >= 2)
+        raise_amount = (actions - 1) * self.big_blind
+        self.pot[call] += self.last_raise[call]
+        self.pot[raised] += raise_amount[raised]
+        self.last_raise[raised] = raise_amount[raised]
+        self.raises[raised] += 1
+        self.last_action[bet] = actions[bet]
+        self.current_player[bet] = (self.current_player[bet] + 1) % self.num_players
+
+        # The betting round ends when player 1 calls
+        round_over = call & (self.current_player == 0)
+        deal = round_over & (self.stage == 0)
+        showdown = round_over & (self.stage == 1)
+
+        self.community_card[deal] = self.decks[deal, -3]
+        self.stage[deal] = 1
+        self.current_player[deal] = 0
+        self.last_action[deal] = -1
+        self.raises[deal] = 0
+
+        rewards[showdown] = self._get_reward(showdown)
+
+        dones = fold | showdown
+        finished = np.flatnonzero(dones)
+        info = {"player": player, "_final_obs": dones}
+
+        if self.info_sets is not None:
+            info["final_info_set"] = self.info_set_ids()
+            info_sets = info["final_info_set"].copy()
+            if len(finished):
+                self._reset_games(finished)
+                info_sets[finished] = self.info_set_ids()[finished]
+            info["info_set"] = info_sets
+            info["final_obs"] = self.info_sets.observations[info["final_info_set"]]
+            return self.info_sets.observations[info_sets], rewards, dones, self._truncations, info
+
+        observations = self._get_observation()
+        info["final_obs"] = observations.copy()
+        if len(finished):
+            self._reset_games(finished)
+            observations[finished] = self._get_observation()[finished]
+
+        return observations, rewards, dones, self._truncations, info
+
+    def _reset_games(self, games: np.ndarray, decks: Optional[np.ndarray] = None):
+        """Deal fresh hands to `games`, drawing their decks in index order unless `decks` is given"""
+        self.decks[games] = shuffled_decks(self.np_random, len(games), self.num_cards) if decks is None else decks
+        self.player_hands[games, 0] = self.decks[games, -1]
+        self.player_hands[games, 1] = self.decks[games, -2]
+        self.community_card[games] = -1
+        self.pot[games] = self.small_blind + self.big_blind
+        self.stage[games] = 0
+        self.last_action[games] = -1
+        self.last_raise[games] = self.big_blind
+        self.raises[games] = 0
+        self.current_player[games] = 0
+
+    def _get_reward(self, games: np.ndarray) -> np.ndarray:
+        """Player 0's showdown reward for the games selected by mask `games`"""
+        community = self.community_card[games]
+        player_0_rank = self._get_hand_rank(self.player_hands[games, 0], community)
+        player_1_rank = self._get_hand_rank(self.player_hands[games, 1], community)
+        return np.sign(player_0_rank - player_1_rank) * self.pot[games] / 2
+
+    @staticmethod
+    def _get_hand_rank(player_cards: np.ndarray, community_cards: np.ndarray) -> np.ndarray:
+        """Vectorized `LeducPoker._get_hand_rank`; -1 marks a missing community card"""
+        player_rank = player_cards % 3
+        community_rank = community_cards % 3
+        ranks = np.where(
+            player_rank == community_rank,
+            10 + player_rank,  # Pair
+            np.maximum(player_rank, community_rank)  # High card
+        )
+        return np.where(community_cards < 0, player_cards, ranks)
+
+    def info_set_ids(self) -> np.ndarray:
+        """Canonical integer id of each game's current observation (requires a raise cap)"""
+        cards = self.player_hands[self._rows, self.current_player]
+        return self.info_sets.ids(cards, self.community_card, self.pot)
+
+    def _get_observation(self) -> np.ndarray:
+        """Convert every game state to its observation vector"""
+        if self.info_sets is not None:
+            return self.info_sets.observations[self.info_set_ids()]
+
+        obs = np.zeros((self.num_envs, 14), dtype=np.float32)
+
+        # Encode player hands
+        obs[self._rows, self.player_hands[self._rows, self.current_player]] = 1
+
+        # Encode community cards
+        dealt = self.community_card >= 0
+        obs[self._rows[dealt], 6 + self.community_card[dealt]] = 1
+
+        # Encode pot and stage
+        obs[:, 12] = self.pot / (self.starting_stack * 2)
+        obs[:, 13] = self.stage
+
+        return obs
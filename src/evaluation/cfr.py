@@ -0,0 +1,234 @@
+import argparse
+import time
+import numpy as np
+import yaml
+from dataclasses import dataclass
+from typing import List, Optional
+from .exploitability import ExploitabilityEvaluator
+
+@dataclass
+class CFRProgress:
+    iteration: int
+    seconds: float  # solver time, evaluation excluded
+    exploitability: float  # of the average strategy on the game tree
+    table_exploitability: float  # of the same strategy exported per info-set id
+
+class CFRSolver:
+    """CFR+ over the flattened Leduc tree, one vectorized sweep per tree depth.
+
+    With `abstraction="tree"` strategies are kept per (decision node,
+    private card), the game's true information sets. With "observation"
+    they are kept per info-set id, i.e. per observation the environment
+    hands the agent; this merges betting histories that end in the same
+    pot, so it solves the game as the `PolicyNetwork` sees it (an
+    imperfect-recall abstraction without CFR's convergence guarantee), and
+    a capped raise plays as the call it turns into.
+
+    Each iteration updates the players in turn: reach probabilities flow
+    down the tree as in `ExploitabilityEvaluator`, counterfactual values
+    flow back up, regrets are floored at zero and the average strategy is
+    weighted by iteration.
+    """
+
+    def __init__(self, max_raises: Optional[int] = 2, abstraction: str = "tree"):
+        if abstraction not in ("tree", "observation"):
+            raise ValueError(f"Unknown abstraction {abstraction!r}")
+        self.abstraction = abstraction
+        self.evaluator = ExploitabilityEvaluator(max_raises)
+        tree = self.evaluator.tree
+        self.tree = tree
+        num_cards = tree.outcomes.shape[1]
+
+        # Per-player decision nodes, their rows in the decision-node arrays and their
+        # positions among the player's own nodes
+        decision_nodes = tree.decision_nodes
+        self.player_nodes = [decision_nodes[tree.player[decision_nodes] == player] for player in (0, 1)]
+        self.rows = np.full(tree.num_nodes, -1)
+        self.rows[decision_nodes] = np.arange(len(decision_nodes))
+        self.positions = np.full(tree.num_nodes, -1)
+        for nodes in self.player_nodes:
+            self.positions[nodes] = np.arange(len(nodes))
+
+        if abstraction == "tree":
+            # Capped raises duplicate the call and are never played
+            self.legal = np.repeat(tree.distinct[decision_nodes][:, None, :], num_cards, axis=1)
+            shape = (len(decision_nodes), num_cards, 5)
+        else:
+            shape = (self.evaluator.info_sets.num_info_sets, 5)
+        self.regrets = np.zeros(shape)
+        self.strategy_sum = np.zeros(shape)
+        self.iteration = 0
+
+        self.own_card_onehot = [np.eye(num_cards)[tree.deals[:, player]] for player in (0, 1)]
+
+    def current_strategy(self) -> np.ndarray:
+        """Regret matching over the tree: positive regrets normalized, uniform when none are positive"""
+        return self._tree_policy(np.maximum(self.regrets, 0))
+
+    def average_strategy(self) -> np.ndarray:
+        """[num_nodes, num_cards, 5] average strategy, the policy CFR converges with"""
+        return self._tree_policy(self.strategy_sum)
+
+    def _tree_policy(self, weights: np.ndarray) -> np.ndarray:
+        if self.abstraction == "observation":
+            return self.evaluator.info_set_policy(self._normalize(weights, np.ones(5, dtype=bool)))
+        policy = np.zeros((self.tree.num_nodes,) + weights.shape[1:])
+        policy[self.tree.decision_nodes] = self._normalize(weights, self.legal)
+        return policy
+
+    @staticmethod
+    def _normalize(weights: np.ndarray, legal: np.ndarray) -> np.ndarray:
+        totals = weights.sum(axis=-1, keepdims=True)
+        uniform = legal / legal.sum(axis=-1, keepdims=True)
+        return np.where(totals > 0, weights / np.where(totals > 0, totals, 1), uniform)
+
+    def iterate(self, iterations: int = 1):
+        """Run CFR+ iterations, updating player 0 then player 1 in each"""
+        strategy = self.current_strategy()
+        for _ in range(iterations):
+            self.iteration += 1
+            for player in (0, 1):
+                reach = self.evaluator.reach_probabilities(strategy)
+                regrets = self._instant_regrets(strategy, reach, player)
+
+                # Later iterations weigh more in the average (linear averaging)
+                nodes = self.player_nodes[player]
+                contribution = self.iteration * reach[player, nodes][:, :, None] * strategy[nodes]
+                self._accumulate(self.strategy_sum, nodes, contribution)
+                self._accumulate(self.regrets, nodes, regrets)
+                np.maximum(self.regrets, 0, out=self.regrets)
+
+                # Only the updated player's strategy changes, unless info-set ids span both players
+                if self.abstraction == "tree":
+                    rows = self.rows[nodes]
+                    strategy[nodes] = self._normalize(self.regrets[rows], self.legal[rows])
+                else:
+                    strategy = self.current_strategy()
+
+    def _accumulate(self, target: np.ndarray, nodes: np.ndarray, values: np.ndarray):
+        """Add per (node, card) `values` into `target`, merging info-set ids under the observation abstraction"""
+        rows = self.rows[nodes]
+        if self.abstraction == "tree":
+            target[rows] += values
+        else:
+            np.add.at(target, self.evaluator.observation_index[rows].reshape(-1), values.reshape(-1, 5))
+
+    def _instant_regrets(self, strategy: np.ndarray, reach: np.ndarray, player: int) -> np.ndarray:
+        """[player's decision nodes, cards, actions] counterfactual regrets of `strategy` this iteration"""
+        tree = self.tree
+        evaluator = self.evaluator
+        other_cards = tree.deals[:, 1 - player]
+        own_cards = tree.deals[:, player]
+        own_card_onehot = self.own_card_onehot[player]
+        positions = self.positions
+        regrets = np.empty((len(self.player_nodes[player]),) + strategy.shape[1:])
+
+        # Counterfactual values per deal; leaves carry the chance and opponent reach weights
+        values = np.zeros(tree.utility.shape)
+        utility = tree.utility if player == 0 else -tree.utility
+        terminals = evaluator.terminals
+        values[terminals] = (
+            utility[terminals] * tree.chance_reach[terminals] * reach[1 - player, terminals][:, other_cards]
+        )
+
+        for level in reversed(evaluator.levels):
+            # Opponent nodes: sum over distinct children
+            nodes = level[1 - player]
+            if len(nodes):
+                children = values[tree.children[nodes]]
+                values[nodes] = (children * tree.distinct[nodes][:, :, None]).sum(axis=1)
+
+            # Own nodes: expected value under the current strategy, regret per action
+            nodes = level[player]
+            if len(nodes):
+                children = values[tree.children[nodes]]  # [nodes, actions, deals]
+                probs = strategy[nodes][:, own_cards, :].transpose(0, 2, 1)  # [nodes, actions, deals]
+                values[nodes] = (children * probs).sum(axis=1)
+
+                # Sum deals into the acting player's private card
+                action_values = children @ own_card_onehot  # [nodes, actions, cards]
+                node_values = values[nodes] @ own_card_onehot  # [nodes, cards]
+                regrets[positions[nodes]] = (action_values - node_values[:, None, :]).transpose(0, 2, 1)
+
+            chance = level[2]
+            if len(chance):
+                values[chance] = values[tree.outcomes[chance]].sum(axis=1)
+
+        if self.abstraction == "tree":
+            regrets *= self.legal[self.rows[self.player_nodes[player]]]
+        return regrets
+
+    def policy_table(self, policy: Optional[np.ndarray] = None) -> np.ndarray:
+        """[num_info_sets, 5] table of `policy` (default: the average strategy) per info-set id.
+
+        Info-set ids only see the player's card, the community card and the
+        pot, so tree information sets sharing an id are merged, weighted by
+        how often the strategy itself reaches them. This is the form the
+        `PolicyNetwork` and `PolicyCache` tables use.
+        """
+        if policy is None and self.abstraction == "observation":
+            return self._normalize(self.strategy_sum, np.ones(5, dtype=bool))
+
+        tree = self.tree
+        evaluator = self.evaluator
+        policy = self.average_strategy() if policy is None else policy
+        reach = evaluator.reach_probabilities(policy)
+        nodes = evaluator.decision_nodes
+        num_cards = tree.outcomes.shape[1]
+
+        # Probability of reaching each (node, card) for its acting player, opponent and chance included
+        weights = np.zeros((len(nodes), num_cards))
+        for player in (0, 1):
+            acting = tree.player[nodes] == player
+            at = nodes[acting]
+            opponent = reach[1 - player, at][:, tree.deals[:, 1 - player]] * tree.chance_reach[at]
+            weights[acting] = reach[player, at] * (opponent @ self.own_card_onehot[player])
+
+        table = np.zeros((evaluator.info_sets.num_info_sets, 5))
+        np.add.at(table, evaluator.observation_index.reshape(-1),
+                  (weights[:, :, None] * policy[nodes]).reshape(-1, 5))
+        return self._normalize(table, np.ones(5, dtype=bool))
+
+    def solve(self, iterations: int, eval_every: int = 100) -> List[CFRProgress]:
+        """Run `iterations` iterations, measuring exploitability every `eval_every`"""
+        progress = []
+        seconds = 0.0
+        while self.iteration < iterations:
+            start = time.perf_counter()
+            self.iterate(min(eval_every, iterations - self.iteration))
+            seconds += time.perf_counter() - start
+
+            evaluator = self.evaluator
+            table = self.policy_table()
+            progress.append(CFRProgress(
+                iteration=self.iteration,
+                seconds=seconds,
+                exploitability=evaluator.evaluate(self.average_strategy()).exploitability,
+                table_exploitability=evaluator.evaluate(evaluator.info_set_policy(table)).exploitability
+            ))
+        return progress
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve Leduc with vectorized CFR+ and export the average strategy")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--eval-every", type=int, default=100)
+    parser.add_argument("--abstraction", choices=["tree", "observation"], default="tree",
+                        help="solve per true information set, or per observation the agent sees")
+    parser.add_argument("--output", help="save the [num_info_sets, 5] policy table as .npy")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+
+    solver = CFRSolver(config["game"]["max_raises"], args.abstraction)
+    print(f"{'iteration':>9} {'seconds':>8} {'it/s':>7} {'exploitability':>14} {'table expl.':>11}")
+    for row in solver.solve(args.iterations, args.eval_every):
+        print(f"{row.iteration:>9} {row.seconds:>8.2f} {row.iteration / row.seconds:>7.1f} "
+              f"{row.exploitability:>14.5f} {row.table_exploitability:>11.5f}")
+
+    if args.output:
+        np.save(args.output, solver.policy_table())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import numpy as np
+import yaml
+from ..agents.batch_explainer import BatchExplainer, ExplanationCache, describe_info_sets
+from ..agents.explainer import make_backend, round_probabilities
+from ..environments.leduc_tree import build_info_sets
+from .head_to_head import policy_table
+
+def checkpoint_key(spec: str, table: np.ndarray) -> str:
+    """Cache key of a policy: its name plus a digest of its table, so retrained weights never hit stale answers"""
+    name = os.path.basename(os.path.normpath(spec)).replace(".npy", "")
+    return f"{name}-{hashlib.sha256(table.tobytes()).hexdigest()[:12]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Explain a policy at every info-set with batched, cached LLM requests")
+    parser.add_argument("policy", help="checkpoint directory (or a directory of them), .npy table or baseline name")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--info-sets", type=int, nargs="+", help="info-set ids to explain; default: all")
+    parser.add_argument("--output", help="write {info-set: situation, probabilities, explanation} as JSON")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    llm_config = config["llm"]
+
+    info_sets = build_info_sets(config["game"]["max_raises"])
+    table = policy_table(args.policy, config)
+    descriptions = describe_info_sets(info_sets.observations, info_sets.starting_stack)
+    cache = ExplanationCache(llm_config["analysis_cache"], checkpoint_key(args.policy, table))
+
+    # The explainer retries with its own backoff, so the client does not
+    explainer = BatchExplainer.from_config(make_backend(llm_config, client_retries=0), llm_config)
+    explanations, stats = asyncio.run(explainer.analyse(table, descriptions, cache, args.info_sets))
+
+    latency = f", median latency {np.median(stats.latencies):.2f} s" if stats.latencies else ""
+    print(f"{len(explanations)}/{stats.info_sets} info-sets explained in {stats.seconds:.1f} s "
+          f"({stats.cached} cached, {stats.distinct} distinct distributions sent)")
+    print(f"{stats.requests} requests, {stats.retries} retries, {stats.failed_requests} failed, "
+          f"{stats.missing} unanswered items, ~{stats.prompt_tokens} prompt tokens{latency}")
+    print(f"Cache: {cache.path}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                str(info_set): {
+                    "situation": descriptions[info_set],
+                    "probabilities": round_probabilities(table[info_set]),
+                    "explanation": explanation
+                }
+                for info_set, explanation in sorted(explanations.items())
+            }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
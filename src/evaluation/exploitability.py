@@ -0,0 +1,141 @@
+import time
+import numpy as np
+import torch
+import torch.nn as nn
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from ..environments.leduc_tree import CHANCE, TERMINAL, build_info_sets, build_tree
+
+@dataclass
+class ExploitabilityResult:
+    exploitability: float  # chips per hand, averaged over both seats
+    best_response_values: Tuple[float, float]
+    seconds: float
+
+class ExploitabilityEvaluator:
+    """Exact best-response exploitability of Leduc policies.
+
+    The game tree, its per-depth node layout and the info-set observation
+    table are built once; each evaluation is one batched forward
+    pass plus a few vectorized sweeps over the tree.
+    """
+
+    def __init__(self, max_raises: Optional[int] = 2):
+        self.tree = build_tree(max_raises)
+        tree = self.tree
+
+        # Node groups per depth, for the top-down and bottom-up sweeps
+        self.levels = []
+        for depth in range(tree.depth.max() + 1):
+            at_depth = tree.depth == depth
+            self.levels.append((
+                np.flatnonzero(at_depth & (tree.player == 0)),
+                np.flatnonzero(at_depth & (tree.player == 1)),
+                np.flatnonzero(at_depth & (tree.player == CHANCE))
+            ))
+        self.terminals = np.flatnonzero(tree.player == TERMINAL)
+
+        # Every (decision node, private card) pair maps onto one info-set; pairs where
+        # the card is the community card never occur and borrow info-set 0
+        self.decision_nodes = tree.decision_nodes
+        self.info_sets = build_info_sets(max_raises)
+        self.observations = torch.tensor(self.info_sets.observations)
+        num_cards = tree.outcomes.shape[1]
+        nodes = self.decision_nodes[:, None]
+        self.observation_index = np.maximum(
+            self.info_sets.ids(np.arange(num_cards), tree.community_card[nodes], tree.pot[nodes]), 0
+        )
+
+    def __call__(self, network: nn.Module) -> ExploitabilityResult:
+        """Exploitability of the softmax policy of `network`, e.g. the agent's sl_network"""
+        start = time.perf_counter()
+        return self.evaluate(self.network_policy(network), start)
+
+    def network_policy(self, network: nn.Module) -> np.ndarray:
+        """Tabulate `network`'s action probabilities as a [num_nodes, num_cards, 5] policy"""
+        was_training = network.training
+        network.eval()
+        with torch.no_grad():
+            probs = torch.softmax(network(self.observations), dim=1).double().numpy()
+        network.train(was_training)
+        return self.info_set_policy(probs)
+
+    def info_set_policy(self, probs: np.ndarray) -> np.ndarray:
+        """Spread [num_info_sets, 5] action probabilities, e.g. a `PolicyCache` table, over the tree"""
+        policy = np.zeros(self.tree.children.shape[:1] + self.observation_index.shape[1:] + (5,))
+        policy[self.decision_nodes] = probs[self.observation_index]
+        return policy
+
+    def evaluate(self, policy: np.ndarray, start: Optional[float] = None) -> ExploitabilityResult:
+        """Exploitability of a tabular policy given per (node, private card)"""
+        start = time.perf_counter() if start is None else start
+        reach = self.reach_probabilities(policy)
+        values = (self.best_response_value(reach, 0), self.best_response_value(reach, 1))
+        return ExploitabilityResult(
+            exploitability=sum(values) / 2,
+            best_response_values=values,
+            seconds=time.perf_counter() - start
+        )
+
+    def reach_probabilities(self, policy: np.ndarray) -> np.ndarray:
+        """Each player's own contribution to reaching every node, per private card [2, N, C]"""
+        tree = self.tree
+        num_cards = policy.shape[1]
+        reach = np.zeros((2, tree.num_nodes, num_cards))
+        reach[:, 0] = 1
+
+        for level in self.levels:
+            for player in (0, 1):
+                nodes = level[player]
+                if not len(nodes):
+                    continue
+                children = tree.children[nodes]
+
+                # The acting player's reach splits over actions; capped raises add onto the call child
+                contribution = reach[player, nodes][:, None, :] * policy[nodes].transpose(0, 2, 1)
+                np.add.at(reach[player], children.reshape(-1), contribution.reshape(-1, num_cards))
+
+                # The other player's reach passes through unchanged
+                other = reach[1 - player, nodes]
+                reach[1 - player, children] = other[:, None, :]
+
+            chance = level[2]
+            if len(chance):
+                reach[:, tree.outcomes[chance]] = reach[:, chance][:, :, None, :]
+
+        return reach
+
+    def best_response_value(self, reach: np.ndarray, player: int) -> float:
+        """Expected payoff of a best response for `player` against the policy behind `reach`"""
+        tree = self.tree
+        own_cards = tree.deals[:, player]
+        other_cards = tree.deals[:, 1 - player]
+        own_card_onehot = np.eye(reach.shape[2])[own_cards]
+
+        # Leaf values already carry the chance and opponent reach weights
+        values = np.zeros(tree.utility.shape)
+        utility = tree.utility if player == 0 else -tree.utility
+        terminals = self.terminals
+        values[terminals] = (
+            utility[terminals] * tree.chance_reach[terminals] * reach[1 - player, terminals][:, other_cards]
+        )
+
+        for level in reversed(self.levels):
+            # Opponent nodes: sum over distinct children
+            nodes = level[1 - player]
+            if len(nodes):
+                children = values[tree.children[nodes]]
+                values[nodes] = (children * tree.distinct[nodes][:, :, None]).sum(axis=1)
+
+            # Best-response nodes: pick the best action per private card
+            nodes = level[player]
+            if len(nodes):
+                children = values[tree.children[nodes]]
+                best = (children @ own_card_onehot).argmax(axis=1)
+                values[nodes] = np.take_along_axis(children, best[:, None, own_cards], axis=1)[:, 0]
+
+            chance = level[2]
+            if len(chance):
+                values[chance] = values[tree.outcomes[chance]].sum(axis=1)
+
+        return float(values[0].sum())
@@ -0,0 +1,150 @@
+import argparse
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+import torch
+import yaml
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+from ..agents.nfsp_agent import build_networks
+from ..agents.policy_cache import PolicyCache
+from ..checkpoint import CheckpointManager
+from ..environments.leduc_poker import shuffled_decks
+from ..environments.leduc_tree import build_info_sets
+from ..environments.vector_leduc import VectorLeducPoker
+
+# Fixed opponents, as action distributions over fold, call and the raises
+BASELINES = {
+    "random": np.full(5, 0.2),
+    "call": np.eye(5)[1],
+    "raise": np.eye(5)[4]  # raises until the cap, then calls
+}
+
+@dataclass
+class HeadToHeadResult:
+    mean: float  # chips per hand won by the first policy
+    ci95: float  # half-width of the 95% confidence interval of `mean`
+    hands: int
+    seconds: float
+
+    @property
+    def hands_per_s(self) -> float:
+        return self.hands / self.seconds
+
+def policy_table(spec: str, config: Dict) -> np.ndarray:
+    """[num_info_sets, 5] action probabilities for a baseline name, a checkpoint path or a saved table.
+
+    A directory of checkpoints resolves to its latest one; checkpoints are
+    played with their average-strategy (SL) network. A `.npy` file holds a
+    table as saved by `python -m src.evaluation.cfr --output`.
+    """
+    info_sets = build_info_sets(config["game"]["max_raises"])
+    if spec in BASELINES:
+        return np.tile(BASELINES[spec], (info_sets.num_info_sets, 1))
+    if spec.endswith(".npy"):
+        return np.load(spec)
+
+    path = spec
+    if not os.path.exists(os.path.join(path, "agent.pt")):
+        path = CheckpointManager.find_latest(spec)
+        if path is None:
+            raise ValueError(f"No checkpoint or baseline named {spec!r}")
+    _, sl_network = build_networks(config)
+    state = torch.load(os.path.join(path, "agent.pt"), map_location="cpu")
+    sl_network.load_state_dict(state["sl_network"])
+    return PolicyCache(sl_network, torch.tensor(info_sets.observations)).table()
+
+def play_mirrored(table_a: np.ndarray, table_b: np.ndarray, num_deals: int, seed: Union[int, np.random.SeedSequence],
+                  max_raises: Optional[int] = 2) -> Tuple[float, float, int]:
+    """Play each of `num_deals` deals twice with seats swapped and the same private cards.
+
+    Returns the sum and sum of squares over deals of the first policy's mean
+    chips per hand in the pair, and the number of deals.
+    """
+    rng = np.random.default_rng(seed)
+    env = VectorLeducPoker(2 * num_deals, max_raises=max_raises)
+
+    # The mirrored game swaps the two hole cards, so each policy holds the same
+    # card in both seats; the community card is shared
+    decks = shuffled_decks(rng, num_deals, env.num_cards)
+    mirrored = decks.copy()
+    mirrored[:, [-1, -2]] = decks[:, [-2, -1]]
+    _, info = env.reset(options={"decks": np.concatenate([decks, mirrored])})
+    info_sets = info["info_set"]
+
+    # Policy A sits in seat 0 in the first half and seat 1 in the second
+    seat_a = np.repeat([0, 1], num_deals)
+    payoff_a = np.zeros(env.num_envs)
+    active = np.ones(env.num_envs, dtype=bool)
+    while active.any():
+        a_acts = env.current_player == seat_a
+        probs = np.where(a_acts[:, None], table_a[info_sets], table_b[info_sets])
+        draws = rng.random(env.num_envs)[:, None]
+        actions = np.minimum((probs.cumsum(axis=1) < draws).sum(axis=1), 4)
+
+        _, rewards, dones, _, info = env.step(actions)
+        # Folds are scored for the folding player, showdowns for player 0
+        player_0 = np.where((actions == 0) & (info["player"] == 1), -rewards, rewards)
+        finished = active & dones
+        payoff_a[finished] = np.where(seat_a[finished] == 0, player_0[finished], -player_0[finished])
+        active &= ~dones
+        # Finished games have been re-dealt; they keep stepping but are ignored
+        info_sets = info["info_set"]
+
+    pairs = (payoff_a[:num_deals] + payoff_a[num_deals:]) / 2
+    return float(pairs.sum()), float((pairs ** 2).sum()), num_deals
+
+def head_to_head(table_a: np.ndarray, table_b: np.ndarray, num_hands: int, num_workers: int = 0,
+                 batch_deals: int = 50000, seed: int = 0, max_raises: Optional[int] = 2) -> HeadToHeadResult:
+    """Play `num_hands` hands (half as many mirrored deal pairs) across `num_workers` processes"""
+    start = time.perf_counter()
+    num_deals = max(num_hands // 2, 1)
+    offsets = range(0, num_deals, batch_deals)
+    # Each batch plays from its own independent stream of `seed`
+    streams = np.random.SeedSequence(seed).spawn(len(offsets))
+    jobs = [
+        (table_a, table_b, min(batch_deals, num_deals - offset), stream, max_raises)
+        for offset, stream in zip(offsets, streams)
+    ]
+
+    if num_workers > 0:
+        with mp.get_context("spawn").Pool(num_workers) as pool:
+            results = pool.starmap(play_mirrored, jobs)
+    else:
+        results = [play_mirrored(*job) for job in jobs]
+
+    total, total_squares, deals = (sum(column) for column in zip(*results))
+    mean = total / deals
+    variance = max(total_squares / deals - mean ** 2, 0.0) * deals / max(deals - 1, 1)
+    return HeadToHeadResult(
+        mean=mean,
+        ci95=1.96 * np.sqrt(variance / deals),
+        hands=2 * deals,
+        seconds=time.perf_counter() - start
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Head-to-head chips/hand between checkpoints and baselines")
+    parser.add_argument("policy", help="checkpoint directory (or a directory of them), .npy table or baseline name")
+    parser.add_argument("opponents", nargs="*", default=list(BASELINES),
+                        help=f"checkpoints or baselines ({', '.join(BASELINES)}); defaults to every baseline")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--hands", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    max_raises = config["game"]["max_raises"]
+
+    table = policy_table(args.policy, config)
+    print(f"{'opponent':<30} {'chips/hand':>11} {'95% CI':>9} {'hands/s':>12}")
+    for opponent in args.opponents:
+        result = head_to_head(table, policy_table(opponent, config), args.hands,
+                              args.workers, seed=args.seed, max_raises=max_raises)
+        print(f"{opponent:<30} {result.mean:>+11.4f} {result.ci95:>9.4f} {result.hands_per_s:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import os
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+class MetricsLogger:
+    """Averages training metrics per period and appends them to a JSONL file.
+
+    Each run starts with a {"start": timestamp, "episode": start_episode}
+    record so readers can tell a new run (episode 0) from one resumed from a
+    checkpoint; every `flush` then appends one record holding the episode
+    number, the mean of each value added since the previous flush and any
+    extra fields.
+    """
+
+    def __init__(self, path: str, start_episode: int = 0):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a")
+        self._write({"start": time.time(), "episode": start_episode})
+        self._sums: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    def add(self, **values: float):
+        for key, value in values.items():
+            self._sums[key] = self._sums.get(key, 0.0) + value
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def flush(self, episode: int, **extra: float):
+        record = {"episode": episode, "time": time.time()}
+        record.update({key: self._sums[key] / self._counts[key] for key in self._sums})
+        record.update(extra)
+        self._write(record)
+        self._sums.clear()
+        self._counts.clear()
+
+    def _write(self, record: Dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class MetricsReader:
+    """Tails a metrics JSONL file, returning only records appended since the last read"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+
+    def read(self) -> List[Dict]:
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return []
+        if size < self.offset:
+            # The file was replaced; start over
+            self.offset = 0
+        if size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        # A trailing partial line is left for the next read
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        return [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+
+def _merge(records: List[Dict]) -> Dict:
+    """One point from consecutive records: the last episode and the mean of each field"""
+    merged = {"episode": records[-1]["episode"]}
+    keys = {key for record in records for key in record if key != "episode"}
+    for key in keys:
+        merged[key] = float(np.mean([record[key] for record in records if key in record]))
+    return merged
+
+class MetricsHistory:
+    """Metric series kept to at most `max_points` points.
+
+    Whenever the series fills up, adjacent points are averaged pairwise and
+    later records are merged twice as many per point, so the whole run
+    stays visible at a resolution that never exceeds the budget.
+    """
+
+    def __init__(self, max_points: int):
+        self.max_points = max_points
+        self._full = max(max_points - max_points % 2, 2)  # even, so points always merge in pairs
+        self.stride = 1  # records per point
+        self.points: List[Dict] = []
+        self._pending: List[Dict] = []
+        self.started: Optional[float] = None
+
+    def extend(self, records: List[Dict]):
+        for record in records:
+            if "start" in record:
+                if record.get("episode", 0) > 0:
+                    # A resumed run: keep the history up to its checkpoint and drop what came after
+                    self._rewind(record["episode"])
+                    continue
+                # A new training run: drop the previous one
+                self.__init__(self.max_points)
+                self.started = record["start"]
+                continue
+
+            self._pending.append(record)
+            if len(self._pending) < self.stride:
+                continue
+            self.points.append(_merge(self._pending))
+            self._pending = []
+
+            if len(self.points) >= self._full:
+                self.points = [_merge(self.points[i:i + 2]) for i in range(0, len(self.points), 2)]
+                self.stride *= 2
+
+    def _rewind(self, episode: int):
+        self.points = [point for point in self.points if point["episode"] <= episode]
+        self._pending = [record for record in self._pending if record["episode"] <= episode]
+
+    def series(self, key: str) -> Tuple[List[int], List[float]]:
+        """Episodes and values of `key`, including records not yet merged into a point"""
+        points = self.points + ([_merge(self._pending)] if self._pending else [])
+        rows = [(point["episode"], point[key]) for point in points if key in point]
+        return [episode for episode, _ in rows], [value for _, value in rows]
+
+    @property
+    def latest(self) -> Dict:
+        if self._pending:
+            return self._pending[-1]
+        return self.points[-1] if self.points else {}
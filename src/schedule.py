@@ -0,0 +1,60 @@
+import time
+from typing import Dict, Tuple
+
+class UpdateSchedule:
+    """Decides how many gradient steps the learner owes as environment steps come in.
+
+    The learner runs every `learn_every` env steps and takes
+    `updates_per_learn` gradient steps, unless `replay_ratio` (sampled
+    transitions per env step) is set, in which case it takes however many
+    steps keep the measured ratio on target.
+    """
+
+    def __init__(self, config: Dict):
+        training = config["training"]
+        self.batch_size = training["batch_size"]
+        self.learn_every = training["learn_every"]
+        self.updates_per_learn = training["updates_per_learn"]
+        self.replay_ratio = training["replay_ratio"]
+
+        self.env_steps = 0
+        self.grad_steps = 0
+        self.learning_steps = 0  # env steps since the buffers could fill a batch
+        self.next_learn = self.learn_every
+        self.start = time.perf_counter()
+
+    def record_env_steps(self, count: int, ready: bool = True) -> int:
+        """Count `count` new env steps and return the gradient steps now due"""
+        self.env_steps += count
+        if not ready:
+            return 0
+
+        self.learning_steps += count
+        if self.learning_steps < self.next_learn:
+            return 0
+        # A chunk of steps can cross several learn_every boundaries at once
+        intervals = self.learning_steps // self.learn_every - (self.next_learn // self.learn_every - 1)
+        self.next_learn = (self.learning_steps // self.learn_every + 1) * self.learn_every
+
+        if self.replay_ratio is None:
+            return self.updates_per_learn * intervals
+        target = int(self.learning_steps * self.replay_ratio / self.batch_size)
+        return max(target - self.grad_steps, 0)
+
+    def record_grad_steps(self, count: int):
+        self.grad_steps += count
+
+    def rates(self) -> Tuple[float, float]:
+        """Measured env steps/s and gradient steps/s since the schedule started"""
+        elapsed = time.perf_counter() - self.start
+        return self.env_steps / elapsed, self.grad_steps / elapsed
+
+    @property
+    def target_replay_ratio(self) -> float:
+        if self.replay_ratio is None:
+            return self.updates_per_learn * self.batch_size / self.learn_every
+        return self.replay_ratio
+
+    @property
+    def measured_replay_ratio(self) -> float:
+        return self.grad_steps * self.batch_size / max(self.learning_steps, 1)
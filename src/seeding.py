@@ -0,0 +1,28 @@
+import numpy as np
+from typing import Optional
+
+# Every component draws from its own stream of the run seed, addressed by a
+# fixed key, so adding a component or a worker never shifts the others
+STREAMS = {
+    "env": 0,
+    "agent": 1,  # sub-keys: see NFSPAgent
+    "learner": 2,  # global torch RNG of the learner process (dropout)
+    "actors": 3,  # sub-key: actor index
+    "evaluation": 4,
+    "opponents": 5  # opponent-pool draws of the learner process
+}
+
+def resolve_seed(seed: Optional[int]) -> int:
+    """`seed`, or fresh OS entropy when it is None; log the result to reproduce the run"""
+    return np.random.SeedSequence(seed).entropy
+
+def seed_sequence(seed: Optional[int], stream: str, *key: int) -> np.random.SeedSequence:
+    """The independent `SeedSequence` of one component (and optional sub-keys) of a run"""
+    return np.random.SeedSequence(seed, spawn_key=(STREAMS[stream],) + key)
+
+def generator(seed: Optional[int], stream: str, *key: int) -> np.random.Generator:
+    return np.random.default_rng(seed_sequence(seed, stream, *key))
+
+def int_seed(seed: Optional[int], stream: str, *key: int) -> int:
+    """A 63-bit integer seed for APIs that take one, e.g. `torch.manual_seed` or `env.reset(seed=...)`"""
+    return int(seed_sequence(seed, stream, *key).generate_state(1, np.uint64)[0] >> np.uint64(1))
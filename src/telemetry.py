@@ -0,0 +1,156 @@
+import cProfile
+import json
+import logging
+import os
+import time
+import numpy as np
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict
+
+_DISABLED = nullcontext()
+
+class _PhaseTimer:
+    __slots__ = ("telemetry", "name", "start")
+
+    def __init__(self, telemetry: "Telemetry", name: str):
+        self.telemetry = telemetry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.telemetry.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class Telemetry:
+    """Wall-clock timers for named phases of the training hot paths.
+
+    `phase(name)` returns a context manager; while disabled it is a shared
+    no-op, so instrumented code pays one attribute check per phase. Counts
+    and totals accumulate since the last `reset`, and the most recent
+    `window` durations per phase are kept for percentiles.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 10000):
+        self.enabled = enabled
+        self.window = window
+        self._counts: Dict[str, int] = {}
+        self._totals: Dict[str, float] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def configure(self, telemetry_config: Dict):
+        self.enabled = telemetry_config["enabled"]
+        self.window = telemetry_config["window"]
+        self.reset()
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _DISABLED
+        return _PhaseTimer(self, name)
+
+    def record(self, name: str, seconds: float):
+        if name not in self._counts:
+            self._counts[name] = 0
+            self._totals[name] = 0.0
+            self._samples[name] = deque(maxlen=self.window)
+        self._counts[name] += 1
+        self._totals[name] += seconds
+        self._samples[name].append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-phase count, total seconds, and mean and percentile milliseconds, slowest total first"""
+        summary = {}
+        for name in sorted(self._totals, key=self._totals.get, reverse=True):
+            samples = np.fromiter(self._samples[name], dtype=np.float64) * 1000
+            p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+            summary[name] = {
+                "count": self._counts[name],
+                "total_s": self._totals[name],
+                "mean_ms": self._totals[name] * 1000 / self._counts[name],
+                "p50_ms": p50,
+                "p90_ms": p90,
+                "p99_ms": p99
+            }
+        return summary
+
+    def reset(self):
+        self._counts.clear()
+        self._totals.clear()
+        self._samples.clear()
+
+# Shared by every instrumented module; enabled from config by the training entry point
+telemetry = Telemetry()
+
+def write_summary(path: str, episode: int, summary: Dict):
+    """Append one timing summary as a JSON line"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps({"episode": episode, "time": time.time(), "phases": summary}) + "\n")
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    lines = [f"{'phase':<22} {'count':>9} {'total s':>9} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}"]
+    for name, stats in summary.items():
+        lines.append(
+            f"{name:<22} {stats['count']:>9} {stats['total_s']:>9.2f} {stats['mean_ms']:>9.3f} "
+            f"{stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+class ProfileWindow:
+    """Captures a cProfile or torch.profiler trace over a configured range of episodes"""
+
+    def __init__(self, telemetry_config: Dict):
+        self.tool = telemetry_config["profiler"]
+        self.start = telemetry_config["profile_start"]
+        self.stop = self.start + telemetry_config["profile_episodes"]
+        self.path = telemetry_config["profile_path"]
+        self._profiler = None
+        self.done = self.tool is None
+
+    def step(self, episode: int):
+        """Start or finish the capture as `episode` enters or leaves the window"""
+        if self.done:
+            return
+        if self._profiler is None and episode >= self.start:
+            self._begin()
+        elif self._profiler is not None and episode >= self.stop:
+            self._finish()
+
+    def _begin(self):
+        if self.tool == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.tool == "torch":
+            import torch.profiler
+
+            self._profiler = torch.profiler.profile(
+                activities=[torch.profiler.ProfilerActivity.CPU],
+                record_shapes=True
+            )
+            self._profiler.start()
+        else:
+            raise ValueError(f"Unknown profiler: {self.tool}")
+
+    def _finish(self):
+        logger = logging.getLogger(__name__)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if self.tool == "cprofile":
+            self._profiler.disable()
+            output = self.path + ".prof"
+            self._profiler.dump_stats(output)
+        else:
+            self._profiler.stop()
+            output = self.path + ".json"
+            self._profiler.export_chrome_trace(output)
+            logger.info(self._profiler.key_averages().table(sort_by="cpu_time_total", row_limit=15))
+        logger.info(f"Profile of episodes {self.start}-{self.stop} written to {output}")
+        self._profiler = None
+        self.done = True
+
+    def close(self):
+        """Finish a capture that the run ended inside of"""
+        if self._profiler is not None:
+            self._finish()
@@ -1,36 +1,87 @@
 import asyncio
+import functools
 from tqdm import tqdm
 import numpy as np
 import torch
-import random
 import logging
 import yaml
+from .actor_learner import train_parallel
 from .agents.nfsp_agent import NFSPAgent
+from .agents.snapshot_pool import SnapshotPool
+from .checkpoint import CheckpointManager
 from .environments.leduc_poker import LeducPoker
+from .evaluation.exploitability import ExploitabilityEvaluator
+from .evaluation.head_to_head import BASELINES, head_to_head
+from .metrics import MetricsLogger
+from .schedule import UpdateSchedule
+from .seeding import generator, int_seed, resolve_seed
+from .telemetry import ProfileWindow, format_summary, telemetry, write_summary
 
-async def train_episode(agent, env, epsilon=0.1):
-    state = env.reset()
+def own_reward(reward, action, player, seat):
+    """`reward` of a step from `seat`'s side; folds are scored for the folding player, showdowns for player 0"""
+    player_0 = -reward if action == 0 and player == 1 else reward
+    return player_0 if seat == 0 else -player_0
+
+async def train_episode(agent, env, schedule, epsilon=0.1, metrics=None, opponent=None, opponent_seat=1):
+    """Play one hand, storing transitions and learning as `schedule` dictates.
+    
+    In self-play the agent plays both seats. With an `opponent` (states ->
+    actions) in `opponent_seat`, only the agent's decisions are stored, each
+    completed with the agent's own reward once it is to act again or the
+    hand ends.
+    """
+    state, info = env.reset()
     total_reward = 0
     done = False
     
+    # Buffers store info-set ids when the game has an observation table
+    use_ids = agent.info_sets is not None
+    key = info["info_set"] if use_ids else state
+    
+    # Anticipatory dynamics: the policy mode is fixed for the whole episode
+    best_response = agent.sample_policy_modes(1)
+    pending = None  # the agent's last (key, action) against an opponent
+    
     while not done:
-        # Epsilon-greedy exploration
-        if random.random() < epsilon:
-            action = env.action_space.sample()
-        else:
-            action = await agent.get_action(state)
+        player = env.state.current_player
+        with telemetry.phase("agent.act"):
+            if opponent is not None and player == opponent_seat:
+                action = int(opponent(state[None])[0])
+            # Epsilon-greedy exploration
+            elif agent.rng.random() < epsilon:
+                action = int(agent.rng.integers(env.action_space.n))
+            elif use_ids:
+                action = int(agent.act_info_sets(np.array([key]), best_response)[0])
+            else:
+                action = int(agent.act(state[None], best_response)[0])
         
-        next_state, reward, done, info = env.step(action)
-        agent.rl_buffer.add((state, action, reward, next_state, done))
-        agent.sl_buffer.add((state, action))
+        with telemetry.phase("env.step"):
+            next_state, reward, terminated, truncated, info = env.step(action)
+            done = terminated or truncated
+            next_key = info["info_set"] if use_ids else next_state
+        if opponent is None:
+            agent.rl_buffer.add((key, action, reward, next_key, done))
+            agent.sl_buffer.add((key, action))
+        else:
+            reward = own_reward(reward, action, player, 1 - opponent_seat)
+            if player != opponent_seat:
+                pending = (key, action)
+            if pending is not None and (done or env.state.current_player != opponent_seat):
+                agent.rl_buffer.add(pending + (reward, next_key, done))
+                agent.sl_buffer.add(pending)
+                pending = None
         
-        state = next_state
+        state, key = next_state, next_key
         total_reward += reward
         
-        if len(agent.rl_buffer.data) >= agent.config["training"]["batch_size"]:
-            batch_rl = random.sample(agent.rl_buffer.data, agent.config["training"]["batch_size"])
-            batch_sl = random.sample(agent.sl_buffer.data, agent.config["training"]["batch_size"])
-            loss_info = await agent.update(batch_rl, batch_sl)
+        ready = len(agent.rl_buffer) >= agent.config["training"]["batch_size"]
+        num_updates = schedule.record_env_steps(1, ready)
+        if num_updates:
+            with telemetry.phase("learn"):
+                loss_info = agent.learn(num_updates)
+            schedule.record_grad_steps(num_updates)
+            if metrics is not None:
+                metrics.add(**loss_info)
             
     return total_reward
 
@@ -43,31 +94,151 @@ async def main():
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
     
+    # One seed fixes every random stream of the run
+    seed = resolve_seed(config["training"]["seed"])
+    config["training"]["seed"] = seed
+    logger.info(f"Seed {seed}")
+    torch.manual_seed(int_seed(seed, "learner"))
+    
+    # Phase timers and the optional profiler capture
+    telemetry.configure(config["telemetry"])
+    profile_window = ProfileWindow(config["telemetry"])
+    
     # Initialize environment and agent
-    env = LeducPoker()
+    env = LeducPoker(max_raises=config["game"]["max_raises"])
+    env.reset(seed=int_seed(seed, "env"))
     agent = NFSPAgent(config)
     
+    # Frozen average-policy snapshots to play some hands against, in shared memory for the actors
+    pool_config = config["opponent_pool"]
+    pool = SnapshotPool.from_config(pool_config, agent.sl_network) if pool_config["enabled"] else None
+    if pool is not None:
+        logger.info(
+            f"Opponent pool: up to {pool.capacity} snapshots of {pool.snapshot_nbytes / 1024:.1f} KB "
+            f"every {pool_config['snapshot_interval']} episodes"
+        )
+    
+    # Exact exploitability needs the finite game tree, which only exists with a raise cap
+    evaluator = None
+    if config["game"]["max_raises"] is not None:
+        evaluator = ExploitabilityEvaluator(config["game"]["max_raises"])
+    else:
+        logger.info("No raise cap: exploitability and win-rate evaluation are off")
+    exploitability_interval = config["evaluation"]["exploitability_interval"]
+    win_rate_hands = config["evaluation"]["win_rate_hands"]
+    
+    # Checkpoints are written in the background and pruned by the retention policy
+    checkpoints = CheckpointManager.from_config(config["checkpoint"])
+    checkpoint_interval = config["checkpoint"]["interval"]
+    
+    # Append-only metrics feed for the dashboard
+    metrics = MetricsLogger(config["dashboard"]["metrics_path"], agent.start_episode)
+    
+    def log_explanation(future):
+        if future.exception() is None:
+            logger.info(f"Current strategy explanation: {future.result()}")
+        else:
+            logger.warning(f"Strategy explanation failed: {future.exception()}")
+    
+    def on_episode(episode):
+        profile_window.step(episode)
+        
+        if pool is not None and episode % pool_config["snapshot_interval"] == 0 and episode > agent.start_episode:
+            with telemetry.phase("opponent.snapshot"):
+                pool.add(agent.sl_network, episode)
+        
+        # Save model checkpoints
+        if episode % checkpoint_interval == 0 and episode > agent.start_episode:
+            checkpoints.save(agent, episode)
+        
+        if telemetry.enabled and episode % config["telemetry"]["summary_interval"] == 0:
+            summary = telemetry.summary()
+            if summary:
+                logger.info(f"Phase timings up to episode {episode}:\n{format_summary(summary)}")
+                write_summary(config["telemetry"]["jsonl_path"], episode, summary)
+            telemetry.reset()
+        
+        extra = {}
+        if evaluator is not None and episode % exploitability_interval == 0:
+            table = agent.policy_cache.table()
+            result = evaluator.evaluate(evaluator.info_set_policy(table))
+            logger.info(
+                f"Episode {episode}: exploitability {result.exploitability:.4f} "
+                f"({result.seconds * 1000:.0f} ms)"
+            )
+            extra["exploitability"] = result.exploitability
+            
+            # Chips/hand of the current average strategy against a uniformly random opponent
+            if win_rate_hands:
+                random_table = np.tile(BASELINES["random"], (len(table), 1))
+                match = head_to_head(table, random_table, win_rate_hands,
+                                     seed=int_seed(seed, "evaluation", episode),
+                                     max_raises=config["game"]["max_raises"])
+                extra["win_rate"] = match.mean
+        metrics.flush(episode, **extra)
+    
     # Training loop
     num_episodes = config["training"]["num_episodes"]
     epsilon = config["training"]["epsilon"]
     
+    if agent.start_episode >= num_episodes:
+        # Saving the resumed state as episode_<num_episodes> could prune the real latest checkpoint
+        logger.info(f"Resumed at episode {agent.start_episode}, at or past num_episodes; nothing to train")
+        checkpoints.close()
+        profile_window.close()
+        metrics.close()
+        return
+    
     logger.info("Starting training...")
-    progress_bar = tqdm(range(num_episodes))
+    
+    if config["parallel"]["num_actors"] > 0:
+        # Actor processes generate self-play data; this process only learns
+        stats = train_parallel(agent, config, on_episode=on_episode, metrics=metrics, pool=pool)
+        checkpoints.save(agent, stats["episodes"])
+        checkpoints.close()
+        profile_window.close()
+        metrics.close()
+        logger.info(
+            f"Trained {stats['episodes']} episodes with {stats['num_actors']} actors: "
+            f"{stats['episodes_per_s']:.0f} episodes/s, {stats['updates_per_s']:.0f} updates/s, "
+            f"replay ratio {stats['replay_ratio']:.2f} (target {stats['target_replay_ratio']:.2f})"
+        )
+        return
+    
+    progress_bar = tqdm(range(agent.start_episode, num_episodes), initial=agent.start_episode, total=num_episodes)
+    schedule = UpdateSchedule(config)
+    opponent_rng = generator(seed, "opponents")
     
     for episode in progress_bar:
-        total_reward = await train_episode(agent, env, epsilon)
+        # Each hand is self-play, or against a snapshot in a random seat
+        opponent, opponent_seat = None, 1
+        if pool is not None and len(pool) and opponent_rng.random() < pool.probability:
+            with telemetry.phase("opponent.swap"):
+                slot = int(pool.sample(opponent_rng)[0])
+                opponent = functools.partial(pool.act, slot, generator=agent.torch_generator)
+            opponent_seat = int(opponent_rng.integers(2))
+        total_reward = await train_episode(agent, env, schedule, epsilon, metrics, opponent, opponent_seat)
+        metrics.add(reward=total_reward)
         
         if episode % 100 == 0:
-            logger.info(f"Episode {episode}/{num_episodes}, Total Reward: {total_reward}")
-            
-            # Save model checkpoints
-            torch.save(agent.rl_network.state_dict(), f"checkpoints/rl_network_{episode}.pt")
-            torch.save(agent.sl_network.state_dict(), f"checkpoints/sl_network_{episode}.pt")
+            env_rate, grad_rate = schedule.rates()
+            logger.info(
+                f"Episode {episode}/{num_episodes}, Total Reward: {total_reward}, "
+                f"{env_rate:.0f} env steps/s, {grad_rate:.0f} grad steps/s, "
+                f"replay ratio {schedule.measured_replay_ratio:.1f}"
+            )
+            on_episode(episode)
             
-            # Get strategy explanation
-            state = env.reset()
-            explanation = await agent.explain_strategy(state)
-            logger.info(f"Current strategy explanation: {explanation}")
+            # Get strategy explanation in the background; training never waits on the LLM
+            state, _ = env.reset()
+            explanation = agent.request_explanation(state)
+            if explanation is not None:
+                explanation.add_done_callback(log_explanation)
+    
+    checkpoints.save(agent, num_episodes)
+    checkpoints.close()
+    profile_window.close()
+    metrics.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
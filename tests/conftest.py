@@ -0,0 +1,14 @@
+import os
+import pytest
+import yaml
+
+@pytest.fixture(scope="session")
+def table_dir(tmp_path_factory) -> str:
+    """Hold'em lookup tables built once per test session, away from the user cache"""
+    return str(tmp_path_factory.mktemp("hand_ranks"))
+
+@pytest.fixture
+def config() -> dict:
+    """A fresh copy of the repository's config.yaml"""
+    with open(os.path.join(os.path.dirname(__file__), "..", "config.yaml"), "r") as f:
+        return yaml.safe_load(f)
@@ -0,0 +1,29 @@
+import pytest
+from src.actor_learner import train_parallel
+from src.agents.nfsp_agent import NFSPAgent
+
+def parallel_config(config: dict, directory, num_episodes: int) -> dict:
+    config["parallel"]["num_actors"] = 2
+    config["training"]["num_episodes"] = num_episodes
+    config["llm"]["enabled"] = False
+    config["checkpoint"]["resume"] = False
+    config["checkpoint"]["directory"] = str(directory)
+    return config
+
+def test_learner_stops_at_num_episodes(config, tmp_path):
+    # Far fewer hands than one chunk of 64 games x 16 steps
+    config = parallel_config(config, tmp_path, 150)
+    config["training"].update(rl_buffer_size=10000, sl_buffer_size=10000)
+    agent = NFSPAgent(config)
+    stats = train_parallel(agent, config)
+    assert stats["episodes"] == 150
+    # Without an opponent pool every hand ships its final transition, and only those of the needed hands are kept
+    assert agent.rl_buffer.columns["dones"][:len(agent.rl_buffer)].sum() == 150
+
+def test_learner_raises_when_actors_die(config, tmp_path):
+    config = parallel_config(config, tmp_path, 100)
+    agent = NFSPAgent(config)
+    # Only the actors build the inference policy, so only they fail
+    config["inference"]["mode"] = "unknown"
+    with pytest.raises(RuntimeError, match="exited with code 1"):
+        train_parallel(agent, config)
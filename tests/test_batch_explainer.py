@@ -0,0 +1,131 @@
+import asyncio
+import numpy as np
+from src.agents.batch_explainer import (
+    AnalysisItem, BatchExplainer, ExplanationCache, estimate_tokens, pack, parse_batch_response,
+    render_batch_prompt
+)
+from src.agents.explainer import SYSTEM_PROMPT, StubBackend
+from src.evaluation.explain import checkpoint_key
+
+def random_table(rows: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).dirichlet(np.ones(5), size=rows)
+
+def items(count: int, padding: int = 0):
+    return [
+        AnalysisItem(probabilities, [n], [f"K, board Q, pot {n}" + " " * padding])
+        for n, probabilities in enumerate(random_table(count))
+    ]
+
+class PartialBackend:
+    """Answers only the odd-numbered items of each prompt"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, system: str, prompt: str) -> str:
+        self.calls += 1
+        numbers = range(1, prompt.count("Item ") + 1)
+        return "\n".join(f"Item {n}: answer {n}" for n in numbers if n % 2)
+
+class FlakyBackend(StubBackend):
+    """Fails the first `failures` requests"""
+
+    def __init__(self, failures: int):
+        super().__init__(latency=0)
+        self.failures = failures
+
+    async def generate(self, system: str, prompt: str) -> str:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("unavailable")
+        return await super().generate(system, prompt)
+
+def test_pack_keeps_every_item_in_order_within_budget():
+    batch_items = items(40)
+    batches = pack(batch_items, token_budget=500, answer_tokens=40)
+    assert len(batches) > 1
+    assert [item for batch in batches for item in batch] == batch_items
+    for batch in batches:
+        assert estimate_tokens(SYSTEM_PROMPT + render_batch_prompt(batch)) + 40 * len(batch) <= 500
+
+def test_pack_gives_an_oversized_item_its_own_prompt():
+    small, large = items(1)[0], items(1, padding=2000)[0]
+    batches = pack([small, large, small], token_budget=300, answer_tokens=40)
+    assert batches == [[small], [large], [small]]
+
+def test_render_parse_round_trip():
+    batch = items(5)
+    prompt = render_batch_prompt(batch)
+    response = asyncio.run(StubBackend(latency=0).generate(SYSTEM_PROMPT, prompt))
+    answers = parse_batch_response(response, len(batch))
+    assert sorted(answers) == [1, 2, 3, 4, 5]
+    for number, answer in answers.items():
+        assert "Item" not in answer and f"pot {number - 1}" in answer
+
+def test_parse_tolerates_markdown_and_drops_stray_text():
+    text = "Sure, here you go.\n**Item 2**: second\nItem 1: first\n continued\nItem 9: out of range\nItem 2: repeat"
+    assert parse_batch_response(text, 3) == {1: "first\n continued", 2: "second"}
+
+def test_missing_items_are_counted_and_retried_on_the_next_run(tmp_path):
+    table = random_table(12)
+    descriptions = [f"situation {n}" for n in range(len(table))]
+    cache = ExplanationCache(str(tmp_path), "policy")
+    explainer = BatchExplainer(PartialBackend(), token_budget=10**6, tolerance=0)
+
+    explanations, stats = asyncio.run(explainer.analyse(table, descriptions, cache))
+    assert stats.requests == 1 and stats.distinct == 12
+    assert stats.missing == 6
+    assert sorted(explanations) == list(range(0, 12, 2))
+
+    backend = StubBackend(latency=0)
+    explainer.backend = backend
+    explanations, stats = asyncio.run(explainer.analyse(table, descriptions, cache))
+    assert stats.cached == 6 and stats.distinct == 6 and stats.missing == 0
+    assert sorted(explanations) == list(range(12))
+    assert backend.calls == 1
+
+def test_cache_hits_by_policy_digest(tmp_path):
+    table = random_table(20)
+    descriptions = [f"situation {n}" for n in range(len(table))]
+    backend = StubBackend(latency=0)
+    explainer = BatchExplainer(backend, token_budget=600, answer_tokens=40, tolerance=0)
+
+    def analyse(table):
+        cache = ExplanationCache(str(tmp_path), checkpoint_key("checkpoints/episode_1000", table))
+        return asyncio.run(explainer.analyse(table, descriptions, cache))
+
+    explanations, stats = analyse(table)
+    assert stats.cached == 0 and len(explanations) == 20
+    calls = backend.calls
+    assert calls > 1
+
+    # A fresh cache object on the same policy reads the answers back from disk
+    cached, stats = analyse(table.copy())
+    assert stats.cached == 20 and stats.requests == 0 and backend.calls == calls
+    assert cached == explanations
+
+    # Retrained weights under the same checkpoint name miss
+    _, stats = analyse(random_table(20, seed=1))
+    assert stats.cached == 0 and backend.calls > calls
+
+def test_cache_skips_a_truncated_last_line(tmp_path):
+    cache = ExplanationCache(str(tmp_path), "policy")
+    cache.add({3: "three", 4: "four"})
+    with open(cache.path, "a") as f:
+        f.write('{"info_set": 5, "expla')
+    reloaded = ExplanationCache(str(tmp_path), "policy")
+    assert reloaded.explanations == {3: "three", 4: "four"}
+    assert 3 in reloaded and 5 not in reloaded
+
+def test_failed_requests_are_retried(tmp_path):
+    table = random_table(4)
+    descriptions = [f"situation {n}" for n in range(len(table))]
+    explainer = BatchExplainer(FlakyBackend(failures=2), retries=3, backoff=0, tolerance=0)
+    explanations, stats = asyncio.run(explainer.analyse(table, descriptions, ExplanationCache(str(tmp_path), "a")))
+    assert len(explanations) == 4
+    assert stats.requests == 3 and stats.retries == 2 and stats.failed_requests == 0
+
+    explainer = BatchExplainer(FlakyBackend(failures=5), retries=1, backoff=0, tolerance=0)
+    explanations, stats = asyncio.run(explainer.analyse(table, descriptions, ExplanationCache(str(tmp_path), "b")))
+    assert explanations == {}
+    assert stats.requests == 2 and stats.failed_requests == 1
@@ -0,0 +1,19 @@
+import numpy as np
+from src.evaluation.cfr import CFRSolver
+
+def test_observation_abstraction_converges():
+    solver = CFRSolver(2, "observation")
+    start = solver.evaluator.evaluate(solver.average_strategy()).exploitability
+    progress = solver.solve(100, eval_every=50)
+    # Uniform play starts at about 5.6 chips/hand; the abstraction levels off near 1.2
+    assert start > 5
+    assert progress[-1].iteration == 100
+    assert progress[-1].exploitability < 1.4
+    assert progress[-1].table_exploitability < 1.4
+
+def test_policy_table_rows_are_distributions():
+    solver = CFRSolver(2, "tree")
+    solver.iterate(5)
+    table = solver.policy_table()
+    assert table.shape == (solver.evaluator.info_sets.num_info_sets, 5)
+    assert np.all(table >= 0) and np.allclose(table.sum(axis=1), 1)
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import numpy as np
+import torch
+import yaml
+from src.agents.nfsp_agent import NFSPAgent
+from src.checkpoint import CheckpointManager
+from src.train import main
+
+def small_config(config, directory: str, resume: bool) -> dict:
+    config["training"]["rl_buffer_size"] = 500
+    config["training"]["sl_buffer_size"] = 500
+    config["training"]["batch_size"] = 32
+    config["llm"]["enabled"] = False
+    config["checkpoint"]["directory"] = directory
+    config["checkpoint"]["resume"] = resume
+    return config
+
+def fill(agent: NFSPAgent, num: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(agent.info_sets.num_info_sets, size=(2, num))
+    actions = rng.integers(5, size=num)
+    agent.rl_buffer.add_batch(ids[0], actions, rng.standard_normal(num).astype(np.float32), ids[1], rng.random(num) < 0.3)
+    agent.sl_buffer.add_batch(ids[0], actions)
+
+def test_save_resume_round_trip(config, tmp_path):
+    directory = str(tmp_path / "checkpoints")
+    agent = NFSPAgent(small_config(config, directory, resume=False))
+    fill(agent, 800)  # past capacity, so the reservoir counters differ from the sizes
+    agent.learn(3)
+    checkpoints = CheckpointManager(directory)
+    checkpoints.save(agent, 700)
+    checkpoints.close()
+
+    resumed = NFSPAgent(small_config(config, directory, resume=True))
+    assert resumed.start_episode == 700
+    assert resumed.rl_updates == agent.rl_updates
+    for name, tensor in agent.state_dict()["sl_network"].items():
+        assert torch.equal(resumed.state_dict()["sl_network"][name], tensor)
+    for name, tensor in agent.state_dict()["rl_network"].items():
+        assert torch.equal(resumed.state_dict()["rl_network"][name], tensor)
+    for before, after in ((agent.rl_buffer, resumed.rl_buffer), (agent.sl_buffer, resumed.sl_buffer)):
+        assert (after.size, after.count) == (before.size, before.count) == (500, 800)
+        for column, array in before.columns.items():
+            assert np.array_equal(after.columns[column], array)
+
+def test_resume_past_num_episodes_keeps_latest_checkpoint(config, tmp_path, monkeypatch):
+    directory = str(tmp_path / "checkpoints")
+    checkpoints = CheckpointManager(directory)
+    checkpoints.save(NFSPAgent(small_config(config, directory, resume=False)), 1200)
+    checkpoints.close()
+
+    config = small_config(config, directory, resume=True)
+    config["training"]["num_episodes"] = 600
+    config["dashboard"]["metrics_path"] = str(tmp_path / "metrics.jsonl")
+    with open(tmp_path / "config.yaml", "w") as f:
+        yaml.safe_dump(config, f)
+    monkeypatch.chdir(tmp_path)
+    asyncio.run(main())
+    assert os.listdir(directory) == ["episode_1200"]
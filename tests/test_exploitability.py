@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from src.environments.vector_leduc import VectorLeducPoker
+from src.evaluation.cfr import CFRSolver
+from src.evaluation.exploitability import ExploitabilityEvaluator
+
+@pytest.fixture(scope="module")
+def evaluator() -> ExploitabilityEvaluator:
+    return ExploitabilityEvaluator(2)
+
+@pytest.fixture(scope="module")
+def cfr_solution() -> CFRSolver:
+    solver = CFRSolver(2, "tree")
+    solver.iterate(100)
+    return solver
+
+def uniform_policy(evaluator: ExploitabilityEvaluator) -> np.ndarray:
+    return np.full((evaluator.tree.num_nodes, evaluator.tree.outcomes.shape[1], 5), 0.2)
+
+def self_play_value(evaluator: ExploitabilityEvaluator, policy: np.ndarray) -> float:
+    """Player 0's expected payoff when both seats play `policy`"""
+    tree = evaluator.tree
+    reach = evaluator.reach_probabilities(policy)
+    terminals = evaluator.terminals
+    return float((
+        tree.utility[terminals] * tree.chance_reach[terminals]
+        * reach[0, terminals][:, tree.deals[:, 0]] * reach[1, terminals][:, tree.deals[:, 1]]
+    ).sum())
+
+def assert_brackets_self_play(evaluator: ExploitabilityEvaluator, policy: np.ndarray):
+    # A best response in either seat does at least as well as the policy itself
+    best_0, best_1 = evaluator.evaluate(policy).best_response_values
+    value = self_play_value(evaluator, policy)
+    assert -best_1 - 1e-9 <= value <= best_0 + 1e-9
+
+def test_uniform_random_policy(evaluator):
+    policy = uniform_policy(evaluator)
+    result = evaluator.evaluate(policy)
+    assert result.exploitability == pytest.approx(5.5682784, abs=1e-6)
+    assert_brackets_self_play(evaluator, policy)
+
+    # The tree's value of uniform self-play matches simulated hands (fold rewards are the folder's)
+    env = VectorLeducPoker(10000, max_raises=2, seed=0)
+    rng = np.random.default_rng(0)
+    payoffs = []
+    for _ in range(200):
+        actions = rng.integers(5, size=env.num_envs)
+        _, rewards, dones, _, info = env.step(actions)
+        player_0 = np.where((actions == 0) & (info["player"] == 1), -rewards, rewards)
+        payoffs.append(player_0[dones])
+    payoffs = np.concatenate(payoffs)
+    error = 4 * payoffs.std() / np.sqrt(len(payoffs))
+    assert self_play_value(evaluator, policy) == pytest.approx(payoffs.mean(), abs=error)
+
+def test_cfr_solution_is_nearly_unexploitable(evaluator, cfr_solution):
+    policy = cfr_solution.average_strategy()
+    result = evaluator.evaluate(policy)
+    assert 0 <= result.exploitability < 0.05
+    assert_brackets_self_play(evaluator, policy)
+
+def test_seat_values_are_symmetric_at_equilibrium(evaluator, cfr_solution):
+    # Near equilibrium each seat's best response earns the game value: player 0's value, and minus it for player 1
+    best_0, best_1 = evaluator.evaluate(cfr_solution.average_strategy()).best_response_values
+    value = self_play_value(evaluator, cfr_solution.average_strategy())
+    assert best_0 == pytest.approx(value, abs=0.1)
+    assert best_1 == pytest.approx(-value, abs=0.1)
+    assert abs(best_0 + best_1) < 0.1
@@ -0,0 +1,50 @@
+from itertools import combinations
+import numpy as np
+import pytest
+from src.environments.hand_evaluator import _hand_key, load_evaluator
+
+def brute_force_key(cards) -> tuple:
+    """Best five-card hand among `cards`, by trying every five-card subset"""
+    return max(
+        _hand_key([card >> 2 for card in subset], len({card & 3 for card in subset}) == 1)
+        for subset in combinations(cards, 5)
+    )
+
+def assert_orders_like_brute_force(evaluator, hands: np.ndarray):
+    strengths = evaluator.evaluate_batch(hands).astype(np.int64)
+    keys = [brute_force_key(hand.tolist()) for hand in hands]
+    assert [evaluator.evaluate(hand.tolist()) for hand in hands] == strengths.tolist()
+    # Strength is a strictly increasing function of the brute-force key: equal keys tie, larger keys win
+    strengths_by_key = {}
+    for key, strength in zip(keys, strengths.tolist()):
+        strengths_by_key.setdefault(key, set()).add(strength)
+    assert all(len(group) == 1 for group in strengths_by_key.values())
+    ordered = [strengths_by_key[key].pop() for key in sorted(strengths_by_key)]
+    assert all(a < b for a, b in zip(ordered, ordered[1:]))
+
+@pytest.mark.parametrize("num_cards", [5, 6, 7])
+def test_random_hands_match_brute_force(table_dir, num_cards):
+    rng = np.random.default_rng(num_cards)
+    hands = rng.random((2000, 52)).argsort(axis=1)[:, :num_cards]
+    assert_orders_like_brute_force(load_evaluator(table_dir), hands)
+
+def test_flush_heavy_hands_match_brute_force(table_dir):
+    # Seven cards with at least five of one suit, mixed with pairs of the other suits
+    rng = np.random.default_rng(0)
+    hands = []
+    for _ in range(1000):
+        suit = rng.integers(4)
+        suited = rng.choice(np.arange(suit, 52, 4), rng.integers(5, 8), replace=False)
+        others = rng.choice(np.setdiff1d(np.arange(52), np.arange(suit, 52, 4)), 7 - len(suited), replace=False)
+        hands.append(np.concatenate([suited, others]))
+    assert_orders_like_brute_force(load_evaluator(table_dir), np.array(hands))
+
+def test_categories(table_dir):
+    evaluator = load_evaluator(table_dir)
+    ace, king, queen, jack, ten, five, four, three, deuce = 12, 11, 10, 9, 8, 3, 2, 1, 0
+    card = lambda rank, suit: 4 * rank + suit
+    royal = [card(rank, 0) for rank in (ace, king, queen, jack, ten)]
+    wheel = [card(ace, 0), card(deuce, 1), card(three, 2), card(four, 3), card(five, 0)]
+    assert evaluator.category(evaluator.evaluate(royal)) == "straight flush"
+    assert evaluator.category(evaluator.evaluate(wheel)) == "straight"
+    assert evaluator.evaluate(royal) == 7461
@@ -0,0 +1,85 @@
+import json
+import pytest
+from src.metrics import MetricsHistory, MetricsLogger, MetricsReader
+
+def records(episodes, **fields):
+    return [dict({"episode": episode}, **{key: value(episode) for key, value in fields.items()}) for episode in episodes]
+
+def test_reader_leaves_partial_lines_for_the_next_read(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    reader = MetricsReader(str(path))
+    assert reader.read() == []
+
+    first, second = json.dumps({"episode": 1}), json.dumps({"episode": 2})
+    with open(path, "w") as f:
+        f.write(first + "\n" + second[:5])
+        f.flush()
+        assert reader.read() == [{"episode": 1}]
+        assert reader.read() == []
+        f.write(second[5:])
+        f.flush()
+        assert reader.read() == []
+        f.write("\n")
+        f.flush()
+        assert reader.read() == [{"episode": 2}]
+
+def test_reader_starts_over_when_the_file_is_replaced(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    path.write_text("".join(json.dumps({"episode": episode}) + "\n" for episode in range(3)))
+    reader = MetricsReader(str(path))
+    assert len(reader.read()) == 3
+    path.write_text(json.dumps({"episode": 7}) + "\n")
+    assert reader.read() == [{"episode": 7}]
+
+def test_history_downsamples_to_the_point_budget():
+    history = MetricsHistory(max_points=4)
+    history.extend(records(range(1, 7), loss=float))
+    # A full series halves and doubles the stride
+    assert history.stride == 2
+    assert history.series("loss") == ([2, 4, 6], [1.5, 3.5, 5.5])
+
+    history.extend(records([7], loss=float))
+    # An unfilled stride still shows as a pending point
+    assert history.series("loss") == ([2, 4, 6, 7], [1.5, 3.5, 5.5, 7.0])
+    assert history.latest == {"episode": 7, "loss": 7}
+
+    for episode in range(8, 200):
+        history.extend(records([episode], loss=float))
+        assert len(history.points) <= history.max_points
+        # Every point is the mean of the `stride` records it ends, however often the series was halved
+        episodes, values = history.series("loss")
+        assert values[:len(history.points)] == [end - (history.stride - 1) / 2 for end in episodes[:len(history.points)]]
+
+@pytest.mark.parametrize("max_points", [1, 2, 3, 5, 10])
+def test_history_respects_odd_and_tiny_budgets(max_points):
+    history = MetricsHistory(max_points)
+    history.extend(records(range(1, 101), loss=float))
+    assert 1 <= len(history.points) <= max(max_points, 1)
+    episodes, values = history.series("loss")
+    assert values[:len(history.points)] == [end - (history.stride - 1) / 2 for end in episodes[:len(history.points)]]
+
+def test_history_series_skips_points_without_the_key():
+    history = MetricsHistory(max_points=10)
+    history.extend(records(range(1, 4), loss=float) + [{"episode": 4, "exploitability": 0.5}])
+    assert history.series("exploitability") == ([4], [0.5])
+    assert history.series("loss") == ([1, 2, 3], [1.0, 2.0, 3.0])
+
+def test_history_resets_on_new_runs_and_keeps_resumed_ones(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    reader, history = MetricsReader(path), MetricsHistory(max_points=100)
+
+    def run(start_episode, episodes):
+        logger = MetricsLogger(path, start_episode)
+        for episode in episodes:
+            logger.add(loss=episode)
+            logger.flush(episode)
+        logger.close()
+        history.extend(reader.read())
+
+    run(0, [100, 200, 300])
+    # Resuming from the episode-200 checkpoint replaces what the first run logged after it
+    run(200, [300, 400])
+    assert history.series("loss") == ([100, 200, 300, 400], [100.0, 200.0, 300.0, 400.0])
+
+    run(0, [100])
+    assert history.series("loss") == ([100], [100.0])
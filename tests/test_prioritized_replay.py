@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from src.agents.replay_buffer import PrioritizedReplayBuffer
+
+def filled_buffer(size: int, capacity: int = None, **kwargs) -> PrioritizedReplayBuffer:
+    buffer = PrioritizedReplayBuffer(capacity or size, rng=np.random.default_rng(0), **kwargs)
+    rng = np.random.default_rng(1)
+    buffer.add_batch(rng.random((size, 14), dtype=np.float32), rng.integers(5, size=size),
+                     rng.standard_normal(size).astype(np.float32), rng.random((size, 14), dtype=np.float32),
+                     rng.random(size) < 0.3)
+    return buffer
+
+def slot_frequencies(buffer: PrioritizedReplayBuffer, draws: int = 20000) -> np.ndarray:
+    indices = buffer.sample(draws)[-1].numpy()
+    return np.bincount(indices, minlength=buffer.capacity) / draws
+
+def test_importance_weights():
+    buffer = filled_buffer(8, beta=0.5)
+    priorities = np.array([1.0, 2.0, 0.5, 4.0, 1.0, 1.0, 3.0, 0.25])
+    buffer.tree.update(np.arange(8), priorities)
+    indices = np.array([0, 3, 7, 7, 2])
+
+    weights = buffer.sample(len(indices), indices=indices)[5].numpy()
+    expected = (8 * priorities[indices] / priorities.sum()) ** -0.5
+    # Normalized by the largest weight of the call, however many gradient steps it feeds
+    assert np.allclose(weights, expected / expected.max())
+    assert weights.max() == pytest.approx(1.0)
+
+def test_update_priorities_shifts_sampling():
+    buffer = filled_buffer(4, alpha=1.0)
+    assert np.allclose(slot_frequencies(buffer), 0.25, atol=0.02)
+
+    buffer.update_priorities(np.arange(4), [3.0, 1.0, 0.0, 0.0])
+    frequencies = slot_frequencies(buffer)
+    assert frequencies[0] == pytest.approx(0.75, abs=0.02)
+    assert frequencies[1] == pytest.approx(0.25, abs=0.02)
+    assert frequencies[2:].sum() < 0.001
+    # New experiences enter at the largest priority seen so far
+    assert buffer.max_priority == pytest.approx(3.0 + buffer.epsilon)
+
+def test_load_state_dict_resets_priorities():
+    buffer = filled_buffer(6, capacity=10)
+    buffer.update_priorities(np.arange(6), [5.0, 0.1, 0.0, 2.0, 0.3, 1.0])
+    restored = PrioritizedReplayBuffer(10, rng=np.random.default_rng(0))
+    restored.load_state_dict(buffer.state_dict())
+    assert restored.size == 6
+    assert np.allclose(restored.tree[np.arange(6)], restored.max_priority ** restored.alpha)
+    assert np.all(restored.tree[np.arange(6, 10)] == 0)
+    assert np.allclose(slot_frequencies(restored)[:6], 1 / 6, atol=0.02)
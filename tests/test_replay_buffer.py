@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from src.agents.replay_buffer import ReplayBuffer
+
+def experiences(num: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.random((num, 14), dtype=np.float32),
+        rng.integers(5, size=num),
+        rng.standard_normal(num).astype(np.float32),
+        rng.random((num, 14), dtype=np.float32),
+        rng.random(num) < 0.3
+    )
+
+def assert_same_buffers(a: ReplayBuffer, b: ReplayBuffer):
+    assert (a.size, a.count) == (b.size, b.count)
+    for name, column in a.columns.items():
+        assert np.array_equal(column, b.columns[name]), name
+
+@pytest.mark.parametrize("transitions", [True, False])
+@pytest.mark.parametrize("capacity, chunks", [(50, [30, 40, 1, 100, 129]), (5, [3, 200]), (1000, [300])])
+def test_add_batch_matches_sequential_adds(transitions, capacity, chunks):
+    columns = experiences(sum(chunks))
+    if not transitions:
+        columns = columns[:2]
+    sequential = ReplayBuffer(capacity, transitions=transitions, rng=np.random.default_rng(7))
+    batched = ReplayBuffer(capacity, transitions=transitions, rng=np.random.default_rng(7))
+
+    for experience in zip(*columns):
+        sequential.add(experience)
+    start = 0
+    for size in chunks:
+        # Overflowing chunks draw several replacements of the same slot; the last one must win
+        batched.add_batch(*(column[start:start + size] for column in columns))
+        start += size
+    assert_same_buffers(sequential, batched)
+    assert batched.size == min(capacity, sum(chunks)) and batched.count == sum(chunks)
+
+def test_unwritten_slots_stay_empty():
+    buffer = ReplayBuffer(10, rng=np.random.default_rng(0))
+    buffer.add_batch(*experiences(4))
+    assert buffer.size == 4
+    assert not buffer.states[4:].any() and not buffer.rewards[4:].any()
+
+def test_memmap_state_round_trip(tmp_path):
+    source = ReplayBuffer(64, path=str(tmp_path / "source.mmap"), rng=np.random.default_rng(0))
+    source.add_batch(*experiences(100))
+    state = source.state_dict()
+
+    # Checkpoints load columns as read-only memory maps
+    for name in source.columns:
+        np.save(tmp_path / f"{name}.npy", state[name])
+    loaded = {name: np.load(tmp_path / f"{name}.npy", mmap_mode="r") for name in source.columns}
+    loaded.update(size=state["size"], count=state["count"])
+
+    restored = ReplayBuffer(64, path=str(tmp_path / "restored.mmap"), rng=np.random.default_rng(0))
+    restored.load_state_dict(loaded)
+    assert_same_buffers(source, restored)
+    assert isinstance(restored.states, np.memmap)
+    batch = restored.sample(16, indices=np.arange(16))
+    assert np.array_equal(batch[0].numpy(), source.states[:16])
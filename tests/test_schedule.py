@@ -0,0 +1,37 @@
+import pytest
+from src.schedule import UpdateSchedule
+
+def make_schedule(learn_every=16, updates_per_learn=2, replay_ratio=None) -> UpdateSchedule:
+    return UpdateSchedule({"training": {
+        "batch_size": 128,
+        "learn_every": learn_every,
+        "updates_per_learn": updates_per_learn,
+        "replay_ratio": replay_ratio
+    }})
+
+def feed(schedule: UpdateSchedule, chunks) -> int:
+    total = 0
+    for count in chunks:
+        num_updates = schedule.record_env_steps(count)
+        schedule.record_grad_steps(num_updates)
+        total += num_updates
+    return total
+
+@pytest.mark.parametrize("replay_ratio", [None, 4.0])
+@pytest.mark.parametrize("chunk", [1, 7, 16, 1024, 10240])
+def test_chunked_steps_owe_the_same_updates(chunk, replay_ratio):
+    steps = 10240 // chunk * chunk
+    serial = feed(make_schedule(replay_ratio=replay_ratio), [1] * steps)
+    chunked = feed(make_schedule(replay_ratio=replay_ratio), [chunk] * (steps // chunk))
+    assert chunked == serial
+
+def test_fixed_schedule_counts_every_interval():
+    schedule = make_schedule(learn_every=16, updates_per_learn=2)
+    assert feed(schedule, [1024] * 10) == 10240 // 16 * 2
+    assert schedule.measured_replay_ratio == pytest.approx(2 * 128 / 16)
+
+def test_steps_before_ready_are_not_owed():
+    schedule = make_schedule(learn_every=16, updates_per_learn=2)
+    assert schedule.record_env_steps(100, ready=False) == 0
+    assert schedule.record_env_steps(15) == 0
+    assert schedule.record_env_steps(1) == 2
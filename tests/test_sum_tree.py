@@ -0,0 +1,36 @@
+import numpy as np
+from src.agents.sum_tree import SumTree
+
+def test_sums_track_updates():
+    rng = np.random.default_rng(0)
+    tree = SumTree(100)
+    priorities = np.zeros(100)
+    for _ in range(50):
+        indices = rng.integers(100, size=8)
+        values = rng.random(8)
+        tree.update(indices, values)
+        # With repeated indices the last priority wins
+        for index, value in zip(indices, values):
+            priorities[index] = value
+        assert np.isclose(tree.total, priorities.sum())
+        assert np.array_equal(tree[np.arange(100)], priorities)
+
+def test_find_follows_prefix_sums():
+    tree = SumTree(5)
+    tree.update(np.arange(5), [1.0, 0.0, 2.0, 0.5, 0.5])
+    assert tree.find(np.array([0.0, 0.99, 1.0, 2.99, 3.0, 3.49, 3.5, 3.99])).tolist() == [0, 0, 2, 2, 3, 3, 4, 4]
+
+def test_sampling_is_proportional():
+    rng = np.random.default_rng(0)
+    capacity = 37  # not a power of two: padding leaves must never be drawn
+    priorities = rng.random(capacity) ** 3
+    priorities[[3, 20]] = 0.0
+    tree = SumTree(capacity)
+    tree.update(np.arange(capacity), priorities)
+
+    draws = np.concatenate([tree.sample(256, rng) for _ in range(2000)])
+    counts = np.bincount(draws, minlength=capacity)
+    assert len(counts) == capacity and counts[[3, 20]].sum() == 0
+    expected = priorities / priorities.sum() * len(draws)
+    # Stratified draws are at least as tight as multinomial ones; allow 4 standard deviations
+    assert np.all(np.abs(counts - expected) <= 4 * np.sqrt(expected) + 1)
@@ -0,0 +1,18 @@
+from src.bench.trajectory import first_divergence, record
+
+def small_config(config: dict) -> dict:
+    config["training"].update(batch_size=32, rl_buffer_size=5000, sl_buffer_size=5000)
+    return config
+
+def test_fixed_seed_reproduces_serial_training(config):
+    config = small_config(config)
+    first = record(config, 300, seed=5)
+    second = record(config, 300, seed=5)
+    assert first_divergence(first, second) == []
+    assert first == second
+    # The run trained: weights moved between fingerprints
+    assert len({checkpoint["weights"] for checkpoint in first["checkpoints"]}) == len(first["checkpoints"])
+
+def test_other_seeds_diverge(config):
+    config = small_config(config)
+    assert first_divergence(record(config, 100, seed=5), record(config, 100, seed=6))
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from gymnasium.utils import seeding
+from src.environments.leduc_poker import LeducPoker
+from src.environments.limit_holdem import LimitHoldem
+from src.environments.vector_holdem import VectorLimitHoldem
+from src.environments.vector_leduc import VectorLeducPoker
+
+def random_actions(num_steps: int, num_envs: int, seed: int = 1) -> np.ndarray:
+    # Folds end hands early, so keep them rare enough to reach showdowns
+    return np.random.default_rng(seed).choice(5, size=(num_steps, num_envs), p=[0.1, 0.5, 0.2, 0.1, 0.1])
+
+def share_stream(envs: list, seed: int):
+    """Make scalar envs draw their decks from one stream in index order, as the vector env does"""
+    rng, _ = seeding.np_random(seed)
+    for env in envs:
+        env.np_random = rng
+
+def assert_matches_scalar(vector, envs: list, actions: np.ndarray, seed: int = 3):
+    observations, _ = vector.reset(seed=seed)
+    share_stream(envs, seed)
+    for env, observation in zip(envs, observations):
+        assert env.reset()[0].tobytes() == observation.tobytes()
+
+    finished_hands = 0
+    for step_actions in actions:
+        observations, rewards, dones, truncations, info = vector.step(step_actions)
+        assert not truncations.any()
+        for i, env in enumerate(envs):
+            observation, reward, done, truncated, _ = env.step(int(step_actions[i]))
+            assert observation.tobytes() == info["final_obs"][i].tobytes()
+            assert done == dones[i] and not truncated
+            assert np.float32(reward) == rewards[i]
+        # The vector env deals finished games their next hand in index order
+        for i in np.flatnonzero(dones):
+            assert envs[i].reset()[0].tobytes() == observations[i].tobytes()
+        finished_hands += int(dones.sum())
+    assert finished_hands > 0
+
+@pytest.mark.parametrize("max_raises", [2, None])
+@pytest.mark.parametrize("num_envs", [1, 16])
+def test_vector_leduc_matches_scalar(num_envs, max_raises):
+    vector = VectorLeducPoker(num_envs, max_raises=max_raises)
+    envs = [LeducPoker(max_raises=max_raises) for _ in range(num_envs)]
+    assert_matches_scalar(vector, envs, random_actions(2000, num_envs))
+
+def test_vector_leduc_info_sets_index_observations():
+    vector = VectorLeducPoker(64, max_raises=2, seed=0)
+    for step_actions in random_actions(200, 64):
+        observations, _, _, _, info = vector.step(step_actions)
+        assert np.array_equal(vector.info_sets.observations[info["info_set"]], observations)
+        assert np.array_equal(vector.info_sets.observations[info["final_info_set"]], info["final_obs"])
+
+@pytest.mark.parametrize("num_envs", [1, 8])
+def test_vector_holdem_matches_scalar(table_dir, num_envs):
+    vector = VectorLimitHoldem(num_envs, table_dir=table_dir)
+    envs = [LimitHoldem(table_dir=table_dir) for _ in range(num_envs)]
+    assert_matches_scalar(vector, envs, random_actions(1000, num_envs))
+
+def test_holdem_fold_costs_the_folders_contribution(table_dir):
+    # Player 0 raises to 4 over the big blind of 2; player 1 folds and loses its 2, not half the pot of 6
+    env = LimitHoldem(table_dir=table_dir)
+    env.reset(seed=0)
+    env.step(2)
+    _, reward, done, _, _ = env.step(0)
+    assert done and reward == -2
+
+    vector = VectorLimitHoldem(2, table_dir=table_dir, seed=0)
+    vector.step([2, 0])
+    _, rewards, dones, _, info = vector.step([0, 1])
+    assert dones[0] and rewards[0] == -2 and info["player"][0] == 1